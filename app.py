@@ -1,31 +1,51 @@
+import sys
+
 import streamlit as st
 from streamlit.components.v1 import iframe
-import chatbot_app as chatbot 
-import pandas as pd
-import plotly.express as px
-from neo4j import GraphDatabase
-from pyvis.network import Network
 import streamlit.components.v1 as components
 
-# Neo4j Connection for Dashboard
-NEO4J_URI = st.secrets["NEO4J_URI"]
-NEO4J_USER = st.secrets["NEO4J_USER"]
-NEO4J_PASS = st.secrets["NEO4J_PASS"]
-
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
-
-def run_query(cypher, params=None):
-    with driver.session() as session:
-        result = session.run(cypher, params or {})
-        return [r.data() for r in result]
+# Heavy modules (pandas, plotly, pyvis, neo4j, openai, numpy) are imported by the page that
+# needs them, so a cold start on Home or the quiz doesn't pay for the dashboard or Cook-E.
+# Python keeps them in sys.modules, so each one is only imported once per process.
 
 st.set_page_config(page_title="Map of Flavors", page_icon="🍳", layout="wide")
 
+def show_cache_stats():
+    # Process-wide counters: cache hits and requests that piggy-backed on an identical in-flight one.
+    # Reads only modules a page already loaded, so the sidebar never triggers an import or a connection.
+    graph_store, chatbot = sys.modules.get("graph_store"), sys.modules.get("chatbot_app")
+    with st.sidebar.expander("⚡ Cache stats"):
+        if graph_store is None:
+            st.caption("Nothing cooked yet — open the dashboard or Cook-E")
+            return
+        cache, flights = graph_store.result_cache.stats(), graph_store.query_flight.stats()
+        st.caption(f"Query cache: {cache['hits']} hits · {cache['misses']} misses · {cache['entries']} entries")
+        # create=False: only a disk cache something already opened, the sidebar doesn't open one
+        shared_cache = graph_store.get_shared_cache(create=False)
+        if shared_cache is not None:
+            shared = shared_cache.stats()
+            st.caption(f"Disk cache: {shared['hits']} hits · {shared['misses']} misses · {shared['entries']} entries · "
+                       f"{shared['bytes'] / 1e6:.1f} MB ({shared['evicted']} evicted)")
+        st.caption(f"Neo4j: {flights['executions']} runs · {flights['coalesced']} coalesced")
+        if chatbot is not None:
+            st.caption(f"Cook-E LLM: {chatbot.llm_flight.executions} calls · {chatbot.llm_flight.coalesced} coalesced")
+        network_render = sys.modules.get("network_render")
+        for name, s in (network_render.network_stats() if network_render is not None else {}).items():
+            st.caption(f"{name}: {s['builds']} builds · avg {s['avg_build_ms']} ms (max {s['max_build_ms']}) · "
+                       f"{s['static']} static ({s['timeouts']} timed out)")
+        prefetcher = sys.modules.get("prefetcher")
+        prefetch = prefetcher.prefetch_stats() if prefetcher is not None else None
+        if prefetch:
+            st.caption(f"Cuisine prefetch: {prefetch['hits']} hits · {prefetch['late']} still loading · "
+                       f"{prefetch['misses']} misses · {prefetch['wasted_jobs']} wasted queries "
+                       f"({prefetch['wasted_seconds']}s)")
+
 # Sidebar Navigation
 page = st.sidebar.radio(
     "🍽️ Choose a section",
     ["🏠 Home", "🎯 What Cuisine Are You? Personality Quiz", "📊 Map of Flavors Dashboard", "🤖 Chatbot (Cook-E)"]
 )
+show_cache_stats()
 
 # PAGE 1: HOME
 if page == "🏠 Home":
@@ -57,12 +77,101 @@ elif page == "🎯 What Cuisine Are You? Personality Quiz":
     st.markdown("""
     ⚡Discover which international cuisine best fits your study style and what meals can boost your energy, focus, and memory by taking this little quiz! 🧠🍱
     """)
-    iframe("https://forms.fillout.com/t/pDTHqQYcZrus", height=800, scrolling=True)
+
+    import pandas as pd
+    import plotly.express as px
+    from quiz import get_quiz_log, load_quiz
+    from tp_locations import load_index as load_tp_index
+
+    quiz = load_quiz()
+    with st.form("cuisine_quiz"):
+        picks = {
+            q["id"]: st.radio(q["text"], range(len(q["options"])), index=None,
+                              format_func=lambda i, q=q: q["options"][i]["label"])
+            for q in quiz.questions
+        }
+        submitted = st.form_submit_button("🍽️ Reveal my cuisine!")
+
+    if submitted:
+        if any(choice is None for choice in picks.values()):
+            st.warning("Answer every question first leh 😅")
+        else:
+            # Scored right here, then appended to the response log
+            cuisine, points = quiz.score(picks)
+            get_quiz_log().append(picks, cuisine)
+            st.session_state["quiz_result"] = (cuisine, points)
+
+    if "quiz_result" in st.session_state:
+        cuisine, points = st.session_state["quiz_result"]
+        st.success(f"🎉 You are... **{cuisine.title()}**!\n\n{quiz.results[cuisine]}")
+        stalls = load_tp_index().locations_for(cuisine)
+        if stalls:
+            st.caption("🍜 Find it at TP: " + " · ".join(stalls))
+
+    # Live results from everyone (counters kept up to date from new log lines only)
+    @st.fragment(run_every="15s")
+    def show_quiz_stats():
+        stats = get_quiz_log().snapshot()
+        st.subheader(f"📊 Live Quiz Results ({stats['responses']} responses)")
+        if not stats["responses"]:
+            st.info("No responses yet — be the first!")
+            return
+
+        df_cui = pd.DataFrame(
+            sorted(stats["cuisines"].items(), key=lambda kv: -kv[1]), columns=["Cuisine", "People"]
+        )
+        df_cui["Cuisine"] = df_cui["Cuisine"].str.title()
+        fig = px.pie(df_cui, names="Cuisine", values="People", hole=0.4,
+                     color_discrete_sequence=px.colors.qualitative.Bold)
+        fig.update_layout(margin=dict(t=10, b=10, l=10, r=10))
+        st.plotly_chart(fig, use_container_width=True)
+
+        texts = {q["text"]: q for q in quiz.questions}
+        q = texts[st.selectbox("See how everyone answered:", list(texts))]
+        counts = stats["answers"].get(q["id"], {})
+        df_ans = pd.DataFrame({
+            "Answer": [o["label"] for o in q["options"]],
+            "People": [counts.get(i, 0) for i in range(len(q["options"]))],
+        })
+        fig = px.bar(df_ans, x="People", y="Answer", orientation="h", color="Answer",
+                     color_discrete_sequence=px.colors.qualitative.Vivid)
+        fig.update_layout(showlegend=False, margin=dict(t=10, b=10, l=10, r=10), yaxis_title="")
+        st.plotly_chart(fig, use_container_width=True)
+
+    show_quiz_stats()
 
 # PAGE 3: DASHBOARD
 elif page == "📊 Map of Flavors Dashboard":
     st.title("📊 Map of Flavors Dashboard")
 
+    import plotly.express as px
+
+    # Neo4j Connection for Dashboard (shared driver + cached columnar fetch)
+    from graph_store import run_query_df
+    from flavor_queries import (
+        ing_list_q, q_ing_summary, q_ing_cui, q_net,
+        cuisine_list_q, q_cui_kpi, q_cui_ing, q_cui_net, q_dishes, q_reco,
+    )
+    from cache_warmer import start_cache_warmer
+    from tp_locations import load_index as load_tp_index
+    from brand_index import get_brand_index
+    from dish_similarity import load_similarity
+    from ingredient_lsh import load_lsh
+    from ingredient_pairs import load_pairs
+    from dashboard_snapshot import build_snapshot, load_snapshot, render_top_panels
+    from prefetcher import get_prefetcher
+    from network_render import render_network, start_network_pool
+    from graph_schema import missing_name_keys
+
+    # Keep dashboard + Cook-E preset results warm in the background (starts once per process)
+    start_cache_warmer()
+    start_network_pool()
+
+    # The cuisine / ingredient queries match on name_key, which only exists after a migration
+    if missing_name_keys():
+        st.warning("⚠️ This graph hasn't been migrated yet, so some panels will be empty — "
+                   "run `python graph_schema.py` once against it.")
+
     view_mode = st.radio(
         "Choose how to view the dashboard:",
         ["📱 Mobile-friendly dashboard", "🧠 Full NeoDash dashboard"],
@@ -71,174 +180,9 @@ elif page == "📊 Map of Flavors Dashboard":
 
     # SIMPLE STREAMLIT DASHBOARD (MOBILE-FRIENDLY)
     if view_mode == "📱 Mobile-friendly dashboard":
-        # 🌍 Global Dataset Summary
-        st.subheader("🌍 Global Dataset Summary")
-
-        kpi_query = """
-        MATCH (c:Cuisine)
-        WITH count(c) AS cuisines
-        MATCH (d:Dish)
-        WITH cuisines, count(d) AS dishes
-        MATCH (i:Ingredient)
-        WITH cuisines, dishes, count(i) AS ingredients
-        MATCH (i2:Ingredient)
-        WHERE i2.study_food = true
-        RETURN cuisines, dishes, ingredients, count(i2) AS study_ingredients
-        """
-        kpi_res = run_query(kpi_query)
-        if kpi_res:
-            kpi = kpi_res[0]
-            col1, col2, col3, col4 = st.columns(4)
-
-            col1.metric("Total Cuisines", f"🌎 {kpi['cuisines']}")
-            col2.metric("Total Dishes", f"🍽️ {kpi['dishes']}")
-            col3.metric("Total Ingredients", f"🥦 {kpi['ingredients']}")
-
-            percent_study = round(kpi["study_ingredients"] * 100.0 / kpi["ingredients"], 1)
-
-            col4.metric("Study-Food Ingredients", f"🧠 {kpi['study_ingredients']} ({percent_study}%)")
-
-        st.markdown("---")
-
-        # Top 10 Ingredients, Regions, Cuisines, Dishes
-        st.subheader("🧠🍳Top 10 Ingredients That Help You Study Better")
-
-        q_ingredients = """
-        MATCH (i:Ingredient)
-        WHERE i.study_food = true
-        MATCH (:Dish)-[:USES]->(i)
-        RETURN i.name AS Ingredient, COUNT(*) AS Uses
-        ORDER BY Uses DESC
-        LIMIT 10
-        """
-        df_ing = pd.DataFrame(run_query(q_ingredients))
-        if not df_ing.empty:
-            bar_colors = px.colors.qualitative.Vivid + px.colors.qualitative.Pastel + px.colors.qualitative.Bold
-        
-            #Bar chart with unique colors per bar
-            fig = px.bar(
-                df_ing,
-                x="Ingredient",
-                y="Uses",
-                title="Top 10 Brain-Boosting Ingredients",
-                color="Ingredient",  # color by ingredient
-                color_discrete_sequence=bar_colors[:len(df_ing)]
-            )
-        
-            #Match NeoDash dark theme + hide legend
-            fig.update_layout(
-                margin=dict(t=10, b=50, l=50, r=20),
-                plot_bgcolor="#0e1117",
-                paper_bgcolor="#0e1117",
-                font_color="white",
-                xaxis_title="Ingredient",
-                yaxis_title="Uses",
-                showlegend=False,
-                title=""
-            )
-        
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No study ingredients found in the data.")
-
-        # Regions with most study ingredients
-        st.subheader("🗺️🥬 Regions Full of Focus-Enhancing Dishes!")
-        q_regions = """
-        MATCH (r:Region)-[:HAS_CUISINE]->(c:Cuisine)-[:HAS_DISH]->(:Dish)-[:USES]->(i:Ingredient)
-        WHERE i.study_food = true
-        RETURN r.name AS Region, COUNT(DISTINCT i.name) AS TotalStudyFoods
-        ORDER BY TotalStudyFoods DESC
-        """
-        df_reg = pd.DataFrame(run_query(q_regions))
-        if not df_reg.empty:
-            fig = px.pie(
-                df_reg,
-                names="Region",
-                values="TotalStudyFoods",
-                title="Regions Full of Focus-Enhancing Foods",
-                color_discrete_sequence=px.colors.qualitative.Vivid
-            )
-        
-            # Improve label sharpness + font clarity
-            fig.update_traces(
-                textinfo="percent+label",
-                textfont_size=18,       
-                textfont_color="white",   
-                pull=[0.03] * len(df_reg)  
-            )
-        
-            # Match NeoDash dark theme
-            fig.update_layout(
-                margin=dict(t=10, b=50, l=50, r=20),
-                plot_bgcolor="#0e1117",
-                paper_bgcolor="#0e1117",
-                font_color="white",
-                showlegend=True,
-                legend_font_size=16,   
-                legend_title_text="",      
-                title_font_size=22,
-                title=""
-            )
-        
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No region data found.")
-
-        # Cuisines packed with study foods
-        st.subheader("🍱🌍 Cuisines Packed With Brain-Boosting Foods!")
-        q_cuisines = """
-        MATCH (c:Cuisine)-[:HAS_DISH]->(:Dish)-[:USES]->(i:Ingredient)
-        WHERE i.study_food = true
-        RETURN c.name AS Cuisine, COUNT(DISTINCT i.name) AS StudyFoods
-        ORDER BY StudyFoods DESC
-        LIMIT 10
-        """
-        df_cui = pd.DataFrame(run_query(q_cuisines))
-        if not df_cui.empty:
-            # Custom color palette
-            bar_colors = px.colors.qualitative.Vivid + px.colors.qualitative.Pastel + px.colors.qualitative.Bold
-        
-            # Colorful bar chart with no legend
-            fig = px.bar(
-                df_cui,
-                x="Cuisine",
-                y="StudyFoods",
-                title="Cuisines Packed with Focus-Boosting Ingredients",
-                color="Cuisine",
-                color_discrete_sequence=bar_colors[:len(df_cui)]
-            )
-        
-            # Dark theme + clean layout
-            fig.update_layout(
-                margin=dict(t=10, b=50, l=50, r=20),
-                plot_bgcolor="#0e1117",
-                paper_bgcolor="#0e1117",
-                font_color="white",
-                xaxis_title="Cuisine",
-                yaxis_title="Number of Study Ingredients",
-                showlegend=False,
-                title=""
-            )
-        
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No cuisine data found.")
-
-        # Top dishes packed with study ingredients
-        st.subheader("🧠🥗 Top Dishes Packed With Study-Boosting Ingredients")
-        q_dishes = """
-        MATCH (d:Dish)-[:USES]->(i:Ingredient {study_food: true})
-        WITH d, COUNT(DISTINCT i) AS StudyFriendlyIngredients
-        MATCH (d)<-[:HAS_DISH]-(c:Cuisine)
-        RETURN d.name AS Dish, c.name AS Cuisine, StudyFriendlyIngredients
-        ORDER BY StudyFriendlyIngredients DESC, Dish ASC
-        LIMIT 10
-        """
-        df_dish = pd.DataFrame(run_query(q_dishes))
-        if not df_dish.empty:
-            st.table(df_dish)
-        else:
-            st.info("No dish data found.")
+        # Top half is the same for every visitor: serve the pre-rendered snapshot for this
+        # graph version if there is one, otherwise build it live from the cached queries
+        render_top_panels(load_snapshot() or build_snapshot())
 
         st.markdown("---")
         
@@ -298,12 +242,7 @@ elif page == "📊 Map of Flavors Dashboard":
         st.caption("Choose your favourite ingredients:")
 
         # Ingredient list
-        ing_list_q = """
-        MATCH (i:Ingredient)
-        RETURN DISTINCT i.name AS Ingredient
-        ORDER BY Ingredient
-        """
-        df_ing_list = pd.DataFrame(run_query(ing_list_q))
+        df_ing_list = run_query_df(ing_list_q)
         ing_options = df_ing_list["Ingredient"].tolist() if not df_ing_list.empty else []
 
         selected_ingredients = st.multiselect(
@@ -319,40 +258,7 @@ elif page == "📊 Map of Flavors Dashboard":
             # Ingredient Summary Dashboard
             st.subheader("⭐📊 Ingredient Summary Dashboard")
 
-            q_ing_summary = """
-            WITH $ingredients AS selectedIngredients
-
-            // Step 1: Get ingredient nodes
-            MATCH (i:Ingredient)
-            WHERE i.name IN selectedIngredients
-            WITH collect(i) AS ing_list, selectedIngredients AS ing_names
-
-            // Step 2: Count cuisines using these ingredients
-            MATCH (c:Cuisine)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
-            WHERE i IN ing_list
-            WITH ing_list, ing_names, count(DISTINCT c) AS total_cuisines
-
-            // Step 3: Count dishes using ingredients
-            MATCH (d:Dish)-[:USES]->(i:Ingredient)
-            WHERE i IN ing_list
-            WITH ing_list, ing_names, total_cuisines,
-                 count(DISTINCT d) AS total_dishes
-
-            // Step 4: Percent study ingredients
-            WITH ing_list, ing_names, total_cuisines, total_dishes,
-                 size(ing_list) AS total_selected,
-                 size([x IN ing_list WHERE x.study_food = true]) AS total_study_foods
-
-            RETURN
-              ing_names AS Selected_Ingredients,
-              total_cuisines AS Total_Cuisines,
-              total_dishes AS Total_Dishes,
-              CASE WHEN total_selected = 0
-                   THEN 0.0
-                   ELSE ROUND((total_study_foods * 100.0 / total_selected), 1)
-              END AS Percent_Study_Ingredients
-            """
-            df_ing_stats = pd.DataFrame(run_query(q_ing_summary, {"ingredients": selected_ingredients}))
+            df_ing_stats = run_query_df(q_ing_summary, {"ingredients": selected_ingredients})
             if not df_ing_stats.empty:
                 row = df_ing_stats.iloc[0]
 
@@ -379,18 +285,7 @@ elif page == "📊 Map of Flavors Dashboard":
 
             # Which Cuisines Love Your Ingredients?
             st.subheader("😋🔥 Which Cuisines Love Your Ingredients?")
-            q_ing_cui = """
-            WITH $ingredients AS ingredients
-
-            MATCH (i:Ingredient)
-            WHERE i.name IN ingredients
-
-            MATCH (c:Cuisine)-[:HAS_DISH]->(d:Dish)-[:USES]->(i)
-            RETURN c.name AS Cuisine,
-                   COUNT(*) AS ingredient_usage
-            ORDER BY ingredient_usage DESC
-            """
-            df_ing_cui = pd.DataFrame(run_query(q_ing_cui, {"ingredients": selected_ingredients}))
+            df_ing_cui = run_query_df(q_ing_cui, {"ingredients": selected_ingredients})
             if not df_ing_cui.empty:
                 bar_colors = px.colors.qualitative.Vivid + px.colors.qualitative.Pastel + px.colors.qualitative.Bold
             
@@ -415,46 +310,54 @@ elif page == "📊 Map of Flavors Dashboard":
                 )
             
                 st.plotly_chart(fig, use_container_width=True)
+
+                # Visitors usually pick one of these top cuisines next: load their panels now
+                prediction = st.session_state.get("cuisine_prefetch")
+                if prediction is None or prediction.ingredients != selected_ingredients:
+                    prefetcher = get_prefetcher()
+                    prefetcher.resolve(prediction)
+                    st.session_state["cuisine_prefetch"] = prefetcher.predict(
+                        selected_ingredients, df_ing_cui["Cuisine"].tolist(),
+                        current=st.session_state.get("dash_cuisine"),
+                    )
             else:
                 st.info("No cuisine data found for your selected ingredients.")
 
+            # Closest dishes by ingredient overlap (MinHash/LSH candidates, exact Jaccard re-score)
+            lsh = load_lsh()
+            if lsh is not None:
+                df_overlap = lsh.query(selected_ingredients, k=10)
+                if not df_overlap.empty:
+                    st.caption("🎯 Dishes whose ingredient sets overlap most with your picks")
+                    st.dataframe(df_overlap, use_container_width=True, hide_index=True)
+
+            # Pairs well with (offline PMI co-occurrence rows, no traversal)
+            st.subheader("🤝 Pairs Well With Your Picks")
+            pairs = load_pairs()
+            if pairs is None:
+                st.info("Pairing index not built yet (or older than the graph) — run `python ingredient_pairs.py`.")
+            else:
+                df_pairs = pairs.pairings(selected_ingredients, k=5)
+                if not df_pairs.empty:
+                    st.caption("Lift = how much more often they share a dish than chance would give")
+                    st.dataframe(df_pairs, use_container_width=True, hide_index=True)
+                else:
+                    st.info("No standout pairings found for your selected ingredients.")
+
             # Ingredient Spider-Web (network graph)
             st.subheader("🕸️🍽️ Ingredient Spider-Web of Tasty Connections")
 
-            q_net = """
-            MATCH (i:Ingredient)<-[:USES]-(d:Dish)<-[:HAS_DISH]-(c:Cuisine)
-            WHERE i.name IN $ingredients
-            WITH i, d, c
-            ORDER BY rand()
-            LIMIT 80
-            RETURN i.name AS Ingredient, d.name AS Dish, c.name AS Cuisine
-            """
-            df_net = pd.DataFrame(run_query(q_net, {"ingredients": selected_ingredients}))
+            # A fresh random sample each run, so never served from the query cache
+            df_net = run_query_df(q_net, {"ingredients": selected_ingredients}, ttl=0)
 
             if not df_net.empty:
-                net = Network(
-                    height="600px",
-                    width="100%",
-                    bgcolor="#0e1117",
-                    font_color="white"
+                # Built in the network process pool (static drawing if it's busy)
+                html_graph, is_static = render_network(
+                    "Ingredient Spider-Web", df_net, ["Ingredient", "Dish", "Cuisine"],
+                    ["#80ffdb", "#5e60ce", "#64dfdf"]
                 )
-                net.force_atlas_2based()
-
-                for _, row in df_net.iterrows():
-                    ing = row["Ingredient"]
-                    dish = row["Dish"]
-                    cui = row["Cuisine"]
-
-                    net.add_node(ing, label=ing, color="#80ffdb", shape="dot")
-                    net.add_node(dish, label=dish, color="#5e60ce", shape="dot")
-                    net.add_node(cui, label=cui, color="#64dfdf", shape="dot")
-
-                    net.add_edge(ing, dish)
-                    net.add_edge(dish, cui)
-
-                net.save_graph("ingredient_network.html")
-                with open("ingredient_network.html", "r", encoding="utf-8") as f:
-                    html_graph = f.read()
+                if is_static:
+                    st.caption("⏳ Lots of hungry visitors right now — here's a quick static view of the web.")
                 components.html(html_graph, height=600, scrolling=True)
             else:
                 st.info("No network connections found for the selected ingredients.")
@@ -464,45 +367,25 @@ elif page == "📊 Map of Flavors Dashboard":
         # CUISINE SECTION (matches NeoDash order)
         st.subheader("Where Shall We Eat Today? 😋")
 
-        cuisine_list_q = """
-        MATCH (c:Cuisine)
-        RETURN DISTINCT c.name AS cuisine
-        ORDER BY cuisine
-        """
-        df_c_list = pd.DataFrame(run_query(cuisine_list_q))
+        df_c_list = run_query_df(cuisine_list_q)
         cuisine_options = df_c_list["cuisine"].tolist() if not df_c_list.empty else []
 
         selected_cuisine = st.selectbox(
             "Choose a cuisine to explore:",
-            ["(pick a cuisine)"] + cuisine_options
+            ["(pick a cuisine)"] + cuisine_options,
+            key="dash_cuisine"
         )
 
         if selected_cuisine != "(pick a cuisine)":
+            # Score the prefetch guess made from the ingredient picks (hit / still loading / miss)
+            prediction = st.session_state.get("cuisine_prefetch")
+            if (prediction is not None and prediction.ingredients == selected_ingredients
+                    and selected_cuisine != prediction.current):
+                get_prefetcher().resolve(prediction, selected_cuisine)
+
             # Cuisine Summary Dashboard
             st.subheader("🍽️ Cuisine Summary Dashboard")
-            q_cui_kpi = """
-            MATCH (c:Cuisine)
-            WHERE toLower(c.name) = toLower($cuisine)
-
-            // Get all ingredients in the cuisine
-            OPTIONAL MATCH (c)-[:HAS_DISH]->(:Dish)-[:USES]->(i_all:Ingredient)
-            WITH c, COLLECT(DISTINCT i_all) AS all_ingredients
-
-            // Get all study ingredients
-            OPTIONAL MATCH (c)-[:HAS_DISH]->(:Dish)-[:USES]->(i_study:Ingredient)
-            WHERE i_study.study_food = true
-            WITH c, all_ingredients, COLLECT(DISTINCT i_study) AS study_ingredients
-
-            RETURN
-              c.name AS Cuisine,
-              SIZE(study_ingredients) AS Total_Study_Ingredients,
-              SIZE(all_ingredients) AS Total_Ingredients,
-              CASE WHEN SIZE(all_ingredients) = 0
-                   THEN 0.0
-                   ELSE ROUND((SIZE(study_ingredients) * 100.0 / SIZE(all_ingredients)), 1)
-              END AS Percent_Study_Ingredients
-            """
-            df_cui_kpi = pd.DataFrame(run_query(q_cui_kpi, {"cuisine": selected_cuisine}))
+            df_cui_kpi = run_query_df(q_cui_kpi, {"cuisine": selected_cuisine})
             if not df_cui_kpi.empty:
                 row = df_cui_kpi.iloc[0]
                 k1, k2, k3 = st.columns(3)
@@ -527,16 +410,7 @@ elif page == "📊 Map of Flavors Dashboard":
 
             # Signature Flavors of Selected Cuisine
             st.subheader("⭐ Signature Flavors of Selected Cuisine")
-            q_cui_ing = """
-            MATCH (c:Cuisine)
-            WHERE toLower(c.name) = toLower($cuisine)
-            MATCH (c)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
-            WHERE i.study_food = true
-            RETURN i.name AS Ingredient, COUNT(DISTINCT d) AS Frequency
-            ORDER BY Frequency DESC
-            LIMIT 15
-            """
-            df_cui_ing = pd.DataFrame(run_query(q_cui_ing, {"cuisine": selected_cuisine}))
+            df_cui_ing = run_query_df(q_cui_ing, {"cuisine": selected_cuisine})
             if not df_cui_ing.empty:
                 bar_colors = px.colors.qualitative.Vivid + px.colors.qualitative.Pastel + px.colors.qualitative.Bold
             
@@ -568,45 +442,14 @@ elif page == "📊 Map of Flavors Dashboard":
             # Flavor Network - Click to explore! (Cuisine network)
             st.subheader("🧬 Flavor Network - Click to explore!")
 
-            q_cui_net = """
-            MATCH (c:Cuisine)
-            WHERE toLower(c.name) = toLower($cuisine)
-
-            OPTIONAL MATCH (c)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
-            WHERE i.study_food = true
-            WITH c, d, i
-            WHERE d IS NOT NULL AND i IS NOT NULL
-            WITH c, d, i
-            ORDER BY rand()
-            LIMIT 25
-
-            RETURN c.name AS Cuisine, d.name AS Dish, i.name AS Ingredient
-            """
-            df_cui_net = pd.DataFrame(run_query(q_cui_net, {"cuisine": selected_cuisine}))
+            df_cui_net = run_query_df(q_cui_net, {"cuisine": selected_cuisine}, ttl=0)
             if not df_cui_net.empty:
-                net2 = Network(
-                    height="600px",
-                    width="100%",
-                    bgcolor="#0e1117",
-                    font_color="white"
+                html_graph2, is_static = render_network(
+                    "Flavor Network", df_cui_net, ["Cuisine", "Dish", "Ingredient"],
+                    ["#ffd166", "#5e60ce", "#80ffdb"]
                 )
-                net2.force_atlas_2based()
-
-                for _, row in df_cui_net.iterrows():
-                    cui = row["Cuisine"]
-                    dish = row["Dish"]
-                    ing = row["Ingredient"]
-
-                    net2.add_node(cui, label=cui, color="#ffd166", shape="dot")
-                    net2.add_node(dish, label=dish, color="#5e60ce", shape="dot")
-                    net2.add_node(ing, label=ing, color="#80ffdb", shape="dot")
-
-                    net2.add_edge(cui, dish)
-                    net2.add_edge(dish, ing)
-
-                net2.save_graph("cuisine_network.html")
-                with open("cuisine_network.html", "r", encoding="utf-8") as f:
-                    html_graph2 = f.read()
+                if is_static:
+                    st.caption("⏳ Lots of hungry visitors right now — here's a quick static view of the network.")
                 components.html(html_graph2, height=600, scrolling=True)
             else:
                 st.info("No network connections found for this cuisine.")
@@ -615,166 +458,82 @@ elif page == "📊 Map of Flavors Dashboard":
             # Top Study-Boosting Dishes in Selected Cuisine
             st.subheader("🍱 Top Study-Boosting Dishes in Selected Cuisine")
             
-            q_dishes = """
-            MATCH (c:Cuisine)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
-            WHERE i.study_food = true 
-              AND toLower(c.name) = toLower($cuisine)
-            WITH d, COUNT(DISTINCT i) AS StudyFriendlyIngredients
-            RETURN d.name AS Dish, StudyFriendlyIngredients
-            ORDER BY StudyFriendlyIngredients DESC
-            LIMIT 10
-            """
             
-            df_dish = pd.DataFrame(run_query(q_dishes, {"cuisine": selected_cuisine}))
+            df_dish = run_query_df(q_dishes, {"cuisine": selected_cuisine})
             
             if not df_dish.empty:
                 st.table(df_dish)
             else:
                 st.info("No dish data found.")
 
+            # Dishes like this one (offline embeddings, answered in-process)
+            st.subheader("🔁 Dishes Like This One")
+            similarity = load_similarity()
+            if similarity is None:
+                st.info("Similar-dish index not built yet (or older than the graph) — run `python dish_similarity.py`.")
+            else:
+                similar_options = similarity.dishes_in(selected_cuisine)
+                picked_dish = st.selectbox(
+                    "Pick a dish to find its closest matches across all cuisines:",
+                    ["(pick a dish)"] + similar_options
+                )
+                if picked_dish != "(pick a dish)":
+                    df_similar = similarity.similar(picked_dish, k=8, cuisine=selected_cuisine)
+                    if not df_similar.empty:
+                        st.table(df_similar)
+                    else:
+                        st.info("No similar dishes found.")
+
             # Where to find this cuisine at TP
             st.subheader("🍜 Hungry? Find This Cuisine at TP")
             
             c = selected_cuisine.lower()
             
-            tp_locations = {
-                "japanese": [
-                    "🍱 Japanese Rice Bowl — The Flavours (BLK 4, IIT, Level 2)",
-                    "🍣 Japanese — The Designer Pad (BLK 28, Design, Level 1)",
-                ],
-                "chinese": [
-                    "🍗 Chicken Rice — The Flavours (BLK 4, IIT, Level 2)",
-                    "🍜 Ban Mian & Fish Soup — The Flavours (BLK 4, IIT, Level 2)",
-                    "🥘 A Tangerine Wok — Sprout Canteen (BLK 1A, HSS, Level 2)",
-                    "🍗 Chicken Rice — The Business Park (BLK 26, Business, Level 1)",
-                    "🍳 Mini Wok — The Business Park (BLK 26, Business, Level 1)",
-                    "🍜 Koka Noodles — The Business Park (BLK 26, Business, Level 1)",
-                    "🦆 Roasted Delight — Short Circuit (BLK 17, Engineering, Level 1)",
-                    "🌶️ Mala Hot Pot — Short Circuit (BLK 17, Engineering, Level 1)",
-                    "🍚 Mixed Veg Rice & Bee Hoon — Breadboard (BLK 25, Engineering, Level 1)",
-                    "🍗 Chicken Rice — Breadboard (BLK 25, Engineering, Level 1)",
-                ],
-                "indian": [
-                    "🍛 Indian Muslim — The Business Park (BLK 26, Business, Level 1)",
-                    "🥘 Indian Cuisine — Breadboard (BLK 25, Engineering, Level 1)",
-                ],
-                "korean": [
-                    "🍗 Fried Chicken — The Business Park (BLK 26, Business, Level 1)",
-                    "🍲 Korean — Short Circuit (BLK 17, Engineering, Level 1)",
-                    "🥟 Korean Cuisine — Breadboard (BLK 25, Engineering, Level 1)",
-                ],
-                "thai": [
-                    "🍲 Thai — The Business Park (BLK 26, Business, Level 1)",
-                    "🍜 Thai Cuisine — Breadboard (BLK 25, Engineering, Level 1)",
-                ],
-                "italian": [
-                    "🍝 Italian Cuisine — The Flavours (BLK 4, IIT, Level 2)",
-                ],
-            }
+            tp_stalls = load_tp_index().locations_for(c)
             
-            if c in tp_locations:
-                for loc in tp_locations[c]:
+            if tp_stalls:
+                for loc in tp_stalls:
                     st.markdown(f"- {loc}")
             else:
                 st.info("ℹ️ This cuisine is not currently available in TP canteens.")
 
+            # Brand share within the selected cuisine
+            st.subheader("🏷️ Brands in This Cuisine")
+            df_brand_share = get_brand_index().brand_share(selected_cuisine)
+            if not df_brand_share.empty:
+                fig = px.pie(
+                    df_brand_share,
+                    names="Brand",
+                    values="Dishes",
+                    title=f"Brand Share in {selected_cuisine}",
+                    color_discrete_sequence=px.colors.qualitative.Vivid
+                )
+
+                fig.update_traces(textinfo="percent+label")
+
+                fig.update_layout(
+                    margin=dict(t=10, b=50, l=50, r=20),
+                    plot_bgcolor="#0e1117",
+                    paper_bgcolor="#0e1117",
+                    font_color="white",
+                    legend_title_text="",
+                    title=""
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No brand data found for this cuisine.")
+
             # Smart dish recommendation (Cuisine + picked ingredients)
             st.subheader("🍛 Recommendations Based on Your Selected Cuisine & Ingredients")
             st.caption("Tip: Pick 1–3 ingredients above, then choose a cuisine to get better matches.")
             
-            q_reco = """
-            WITH toLower($cuisine) AS cuisine,
-                 coalesce($ingredients, []) AS ingParam
-            
-            // Normalize picked ingredients
-            WITH cuisine,
-                 [x IN ingParam | toLower(toString(x))] AS picked,
-                 size(ingParam) AS pickedCount
-            
-            // Get dishes for the selected cuisine
-            OPTIONAL MATCH (c:Cuisine)
-            WHERE toLower(c.name) = cuisine
-            OPTIONAL MATCH (c)-[:HAS_DISH]->(d:Dish)
-            
-            // Collect dish ingredients
-            OPTIONAL MATCH (d)-[:USES]->(i:Ingredient)
-            WITH cuisine, picked, pickedCount, d,
-                 collect(DISTINCT toLower(i.name)) AS dishIngs
-            
-            // Compute ingredient match score
-            WITH cuisine, picked, pickedCount, d,
-                 [x IN picked WHERE x IN dishIngs] AS matched,
-                 size([x IN picked WHERE x IN dishIngs]) AS matchScore
-            
-            // Study-boosting score
-            OPTIONAL MATCH (d)-[:USES]->(sf:Ingredient {study_food:true})
-            WITH cuisine, picked, pickedCount, d, matched, matchScore,
-                 count(DISTINCT sf) AS studyBoost,
-                 (matchScore * 10 + count(DISTINCT sf)) AS rankScore
-            
-            // Collect ALL rows first (important for fallback logic)
-            WITH cuisine, picked, pickedCount,
-                 collect({
-                   dish: coalesce(d.name, "NO_DISH"),
-                   matchScore: matchScore,
-                   matched: matched,
-                   studyBoost: studyBoost,
-                   rankScore: rankScore
-                 }) AS rows
-            
-            // Decide what to show
-            UNWIND
-            CASE
-              // 🟦 No ingredients picked
-              WHEN pickedCount = 0 THEN
-                [{
-                  dish: "💡 Pick 1–3 ingredients to get a personalised recommendation",
-                  matchScore: 0,
-                  matched: ["Try: garlic, egg, ginger, chicken broth"],
-                  studyBoost: 0,
-                  rankScore: 0
-                }]
-            
-              // ❌ Ingredients selected but NOTHING matches
-              WHEN pickedCount > 0
-               AND size([r IN rows WHERE r.matchScore > 0]) = 0
-              THEN
-                [{
-                  dish: "⚠️ No matching dishes found",
-                  matchScore: 0,
-                  matched: ["Please change or add ingredients — none match " + cuisine + " dishes in our dataset."],
-                  studyBoost: 0,
-                  rankScore: 0
-                }]
-            
-              // ✅ Normal case: matched dishes
-              ELSE
-                [r IN rows WHERE r.matchScore > 0]
-            END AS r
-            
-            // Final output
-            RETURN
-            r.dish AS RecommendedDish,
-            r.matchScore AS MatchedPickedIngredients,
-            reduce(
-              s = "",
-              x IN r.matched |
-              s + CASE WHEN s = "" THEN "" ELSE ", " END + x
-            ) AS MatchedIngredients,
-            r.studyBoost AS StudyFriendlyIngredientCount,
-            CASE
-              WHEN r.dish STARTS WITH "⚠️" OR r.dish STARTS WITH "💡" THEN "ℹ️"
-              ELSE "✅"
-            END AS Note
-            ORDER BY r.rankScore DESC
-            LIMIT 5
-            """
 
             #  Run only when cuisine is chosen (ingredients can be empty or not)
-            df_reco = pd.DataFrame(run_query(q_reco, {
+            df_reco = run_query_df(q_reco, {
                 "cuisine": selected_cuisine,
                 "ingredients": selected_ingredients
-            }))
+            })
             
             if not df_reco.empty:
                 df_reco = df_reco[["Note", "RecommendedDish", "MatchedPickedIngredients", "MatchedIngredients", "StudyFriendlyIngredientCount"]]
@@ -782,6 +541,13 @@ elif page == "📊 Map of Flavors Dashboard":
             else:
                 st.info("No recommendation data found.")
 
+            lsh = load_lsh()
+            if lsh is not None and selected_ingredients:
+                df_close = lsh.query(selected_ingredients, k=5, cuisine=selected_cuisine)
+                if not df_close.empty:
+                    st.caption(f"🎯 Closest ingredient overlap in {selected_cuisine.title()}")
+                    st.table(df_close[["Dish", "Matched", "Jaccard"]])
+
             st.info("This view is optimised for mobile phones. Use the NeoDash view for full graph visuals on desktop. 💻")
 
     # FULL NEODASH DASHBOARD (DESKTOP)
@@ -803,6 +569,10 @@ elif page == "📊 Map of Flavors Dashboard":
 
 # PAGE 4: CHATBOT
 elif page == "🤖 Chatbot (Cook-E)":
+    import chatbot_app as chatbot
+    from cache_warmer import start_cache_warmer
+
+    start_cache_warmer()
     chatbot.main()
 
 
@@ -0,0 +1,76 @@
+"""Figure build + serialisation cost of the old chart code vs chart_render, by row count.
+
+    python benchmarks/bench_chart_render.py --rows 10 100 1000 10000
+
+Streamlit ships each figure to the browser as JSON, so trace count and JSON size are
+a fair proxy for browser render cost; build_ms covers plotly + to_json on the server.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import chart_render  # noqa: E402
+
+
+def legacy(df, chart_type):
+    # What the chatbot did before: one px call, colour per category
+    x, y = df.columns[0], df.columns[1]
+    if chart_type == "bar":
+        return px.bar(df, x=x, y=y, color=x, color_discrete_sequence=px.colors.qualitative.Vivid)
+    if chart_type == "pie":
+        return px.pie(df, names=x, values=y, color_discrete_sequence=px.colors.qualitative.Bold)
+    return px.line(df, x=x, y=y, markers=True)
+
+
+def fast(df, chart_type):
+    fig, _ = chart_render.build_figure(df, chart_type)
+    return fig
+
+
+def measure(fn, df, chart_type, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = fn(df, chart_type).to_json()
+        best = min(best, time.perf_counter() - start)
+    fig = fn(df, chart_type)
+    return best * 1000, len(fig.data), len(payload)
+
+
+def synthetic(rows, chart_type, seed=0):
+    rng = np.random.default_rng(seed)
+    if chart_type == "line":
+        return pd.DataFrame({"Step": np.arange(rows), "Value": rng.normal(size=rows).cumsum()})
+    return pd.DataFrame({"Ingredient": [f"ingredient {i}" for i in range(rows)],
+                         "Uses": rng.zipf(1.6, rows).astype(np.int64)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--charts", nargs="+", default=["bar", "pie", "line"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'chart':>5} {'rows':>7} | {'old ms':>8} {'traces':>6} {'json KB':>8} | "
+          f"{'new ms':>8} {'traces':>6} {'json KB':>8}")
+    for chart_type in args.charts:
+        for rows in args.rows:
+            df = synthetic(rows, chart_type)
+            old = measure(legacy, df, chart_type, args.repeat)
+            new = measure(fast, df, chart_type, args.repeat)
+            print(f"{chart_type:>5} {rows:>7,} | {old[0]:>8.1f} {old[1]:>6,} {old[2] / 1024:>8.1f} | "
+                  f"{new[0]:>8.1f} {new[1]:>6,} {new[2] / 1024:>8.1f}")
+
+    print(f"\nTables: results over {chart_render.MAX_STATIC_ROWS} rows use st.dataframe, which only "
+          "draws the visible rows; st.table puts every row in the page.")
+
+
+if __name__ == "__main__":
+    main()
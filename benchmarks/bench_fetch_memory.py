@@ -0,0 +1,90 @@
+"""Peak memory / time of the old list-of-dicts fetch vs the columnar fetch.
+
+Runs on synthetic records by default (no database needed):
+    python benchmarks/bench_fetch_memory.py --rows 200000
+Or against the real graph (uses NEO4J_* from secrets / .env):
+    python benchmarks/bench_fetch_memory.py --cypher "MATCH (i:Ingredient) RETURN i.name AS Ingredient"
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+from neo4j import Record
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import graph_store  # noqa: E402
+
+
+class SyntheticResult:
+    # Just enough of neo4j.Result for both fetch paths
+    def __init__(self, rows):
+        self._keys = ("Dish", "Cuisine", "StudyFriendlyIngredients", "Score")
+        self._rows = rows
+        self._pos = 0
+
+    def keys(self):
+        return self._keys
+
+    def _record(self, i):
+        return Record(zip(self._keys, (f"dish {i}", f"cuisine {i % 40}", i % 12, i / 7.0)))
+
+    def __iter__(self):
+        while self._pos < self._rows:
+            self._pos += 1
+            yield self._record(self._pos - 1)
+
+    def fetch(self, n):
+        end = min(self._pos + n, self._rows)
+        batch = [self._record(i) for i in range(self._pos, end)]
+        self._pos = end
+        return batch
+
+    def consume(self):
+        self._pos = self._rows
+
+
+def legacy_path(result):
+    return pd.DataFrame([r.data() for r in result])
+
+
+def columnar_path(result, max_rows=None):
+    return graph_store.result_to_df(result, max_rows=max_rows)
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} rows={len(df):>9,}  peak={peak / 2**20:8.1f} MiB  time={elapsed:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--cap", type=int, default=10_000, help="row cap for the capped run")
+    parser.add_argument("--cypher", help="benchmark a real query instead of synthetic rows")
+    args = parser.parse_args()
+
+    if args.cypher:
+        def live(fn):
+            with graph_store.get_driver().session(fetch_size=graph_store.FETCH_BATCH_SIZE) as session:
+                return fn(session.run(args.cypher))
+
+        measure("list-of-dicts", lambda: live(legacy_path))
+        measure("columnar", lambda: live(columnar_path))
+        measure(f"columnar cap={args.cap}", lambda: live(lambda r: columnar_path(r, args.cap)))
+        return
+
+    measure("list-of-dicts", lambda: legacy_path(SyntheticResult(args.rows)))
+    measure("columnar", lambda: columnar_path(SyntheticResult(args.rows)))
+    measure(f"columnar cap={args.cap}", lambda: columnar_path(SyntheticResult(args.rows), args.cap))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Scaling of the MinHash/LSH ingredient-overlap lookup vs a full scan.
+
+Synthetic dishes with Zipf-like ingredient popularity (no database needed):
+    python benchmarks/bench_ingredient_lsh.py --sizes 10000 100000 1000000
+
+For each size: index build time, mean query time for the full scan (exact Jaccard
+against every dish, vectorised) and for LSH candidates + exact re-score, the average
+candidate count, and recall@10 of the LSH result against the full scan.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from ingredient_lsh import IngredientLSH  # noqa: E402
+
+
+def synthetic_sets(n_dishes, n_ingredients, mean_size, seed=0):
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, n_ingredients + 1) ** 1.1
+    popularity /= popularity.sum()
+
+    sizes = np.clip(rng.poisson(mean_size, n_dishes), 2, None)
+    draws = rng.choice(n_ingredients, size=sizes.sum(), p=popularity)
+    dish_ids = np.repeat(np.arange(n_dishes), sizes)
+    # Drop repeats within a dish, keep CSR order
+    pairs = np.unique(dish_ids * n_ingredients + draws)
+    dish_ids, indices = pairs // n_ingredients, pairs % n_ingredients
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(dish_ids, minlength=n_dishes))])
+    return indptr, indices.astype(np.int64)
+
+
+def full_scan(indptr, indices, codes, k=10):
+    # The O(dishes × ingredients) baseline: intersection size for every dish
+    hits = np.isin(indices, codes).astype(np.int64)
+    sizes = np.diff(indptr)
+    inter = np.add.reduceat(hits, indptr[:-1]) * (sizes > 0)
+    jaccard = inter / (sizes + len(codes) - inter)
+    top = np.argpartition(-jaccard, k)[:k]
+    return np.sort(jaccard[top][jaccard[top] > 0])[::-1]
+
+
+def run(n_dishes, n_ingredients, mean_size, queries, seed):
+    indptr, indices = synthetic_sets(n_dishes, n_ingredients, mean_size, seed)
+    names = [f"ing {i}" for i in range(n_ingredients)]
+
+    start = time.perf_counter()
+    index = IngredientLSH(indptr, indices, [f"dish {i}" for i in range(n_dishes)], [""] * n_dishes, names)
+    build = time.perf_counter() - start
+
+    rng = np.random.default_rng(seed + 1)
+    scan_t = lsh_t = cand = recall = 0.0
+    for _ in range(queries):
+        # Picks look like the app's: 1–3 ingredients taken from a real dish
+        d = rng.integers(n_dishes)
+        row = indices[indptr[d]:indptr[d + 1]]
+        codes = np.sort(rng.choice(row, size=min(len(row), rng.integers(1, 4)), replace=False))
+
+        t = time.perf_counter()
+        exact = full_scan(indptr, indices, codes)
+        scan_t += time.perf_counter() - t
+
+        t = time.perf_counter()
+        found = index.query([names[c] for c in codes], k=10)
+        lsh_t += time.perf_counter() - t
+
+        cand += len(index.candidates(codes))
+        # Many dishes tie on Jaccard, so count LSH hits that reach the exact k-th best score
+        if len(exact):
+            recall += min((found["Jaccard"].to_numpy() >= round(exact[-1], 3)).sum(), len(exact)) / len(exact)
+        else:
+            recall += 1.0
+
+    return {
+        "dishes": n_dishes,
+        "build_s": build,
+        "scan_ms": scan_t * 1000 / queries,
+        "lsh_ms": lsh_t * 1000 / queries,
+        "candidates": cand / queries,
+        "recall@10": recall / queries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ingredients", type=int, default=5000)
+    parser.add_argument("--mean-size", type=float, default=9.0, help="mean ingredients per dish")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'dishes':>10} {'build s':>8} {'scan ms':>8} {'lsh ms':>8} {'candidates':>11} {'recall@10':>10}")
+    for n in args.sizes:
+        r = run(n, args.ingredients, args.mean_size, args.queries, args.seed)
+        print(f"{r['dishes']:>10,} {r['build_s']:>8.1f} {r['scan_ms']:>8.1f} {r['lsh_ms']:>8.1f} "
+              f"{r['candidates']:>11,.0f} {r['recall@10']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
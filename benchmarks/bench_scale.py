@@ -0,0 +1,80 @@
+"""Dashboard query and cache latency across synthetic graph sizes (local Neo4j only).
+
+    python benchmarks/bench_scale.py --scales 1 10 100       # wipes NEO4J_* between scales
+    python benchmarks/bench_scale.py --scales 10 --no-load    # graph already loaded by synth_graph.py
+
+For each scale the graph is wiped, regenerated by synth_graph.py and bulk loaded, then
+every named query runs cold (straight from Neo4j) and warm (result cache hit).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import graph_store  # noqa: E402
+from graph_schema import apply_schema, bump_graph_version  # noqa: E402
+from ingest import load_rows  # noqa: E402
+from plan_regressions import PARAMS, is_local, named_queries, wipe_graph  # noqa: E402
+from synth_graph import generate_rows, make_config  # noqa: E402
+
+# Offline job inputs (full dish/ingredient dumps) aren't on the page path
+SKIP = {"q_dish_ingredients", "q_brand_edges", "q_brand_cuisine_usage"}
+
+
+def load_scale(driver, scale):
+    with driver.session() as session:
+        wipe_graph(session)
+    apply_schema(driver)
+    start = time.perf_counter()
+    stats = load_rows(driver, generate_rows(make_config(scale)))
+    graph_store.publish_graph_version(bump_graph_version(driver))
+    return stats["rows"], time.perf_counter() - start
+
+
+def time_queries(repeat):
+    out = {}
+    for name, cypher in named_queries().items():
+        if name in SKIP:
+            continue
+        cold = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            graph_store.fetch_df(cypher, PARAMS)
+            cold.append(time.perf_counter() - start)
+        graph_store.run_query_df(cypher, PARAMS)
+        start = time.perf_counter()
+        graph_store.run_query_df(cypher, PARAMS)
+        out[name] = (statistics.median(cold) * 1000, (time.perf_counter() - start) * 1000)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=3, help="cold runs per query (median reported)")
+    parser.add_argument("--no-load", action="store_true", help="time the graph as it is")
+    args = parser.parse_args()
+
+    uri = graph_store.get_secret("NEO4J_URI")
+    if not args.no_load and not is_local(uri):
+        sys.exit(f"Refusing to wipe {uri}: point NEO4J_URI at a local Neo4j")
+    driver = graph_store.get_driver()
+
+    results = {}
+    for scale in ([None] if args.no_load else args.scales):
+        if scale is not None:
+            rows, seconds = load_scale(driver, scale)
+            print(f"scale {scale:g}: loaded {rows:,} rows in {seconds:.1f}s ({rows / seconds:,.0f} rows/s)")
+        results[scale] = time_queries(args.repeat)
+
+    print(f"\n{'query':<34}" + "".join(f"{f'x{s:g}' if s else 'now':>22}" for s in results))
+    print(f"{'':<34}" + f"{'cold ms / warm ms':>22}" * len(results))
+    for name in next(iter(results.values())):
+        cells = "".join(f"{cold:>13.1f} /{warm:>7.2f}" for cold, warm in (r[name] for r in results.values()))
+        print(f"{name:<34}{cells}")
+
+
+if __name__ == "__main__":
+    main()
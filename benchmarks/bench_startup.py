@@ -0,0 +1,104 @@
+"""Cold-start cost of app.py: import time per module and time-to-first-render per page.
+
+    python benchmarks/bench_startup.py             # needs NEO4J_* / OPENAI_API_KEY for the dashboard
+    python benchmarks/bench_startup.py --offline   # graph queries return empty results, no warmer
+
+Every measurement runs in a fresh interpreter so nothing is already in sys.modules.
+Pages are rendered with Streamlit's AppTest: a cold Home run, then a switch to the page.
+With --offline the page timings include importing pandas/neo4j (patched in after Home)
+but not any network time.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+MODULES = [
+    "pandas", "numpy", "plotly.express", "pyvis.network", "neo4j", "openai",
+    "graph_store", "quiz", "chatbot_app",
+]
+HEAVY = ["pandas", "plotly", "pyvis", "neo4j", "openai", "numpy", "chatbot_app", "graph_store"]
+
+PAGES = [
+    "🏠 Home",
+    "🎯 What Cuisine Are You? Personality Quiz",
+    "📊 Map of Flavors Dashboard",
+    "🤖 Chatbot (Cook-E)",
+]
+
+RENDER_SCRIPT = r"""
+import json, os, sys, time
+sys.path.insert(0, {root!r}); os.chdir({root!r})
+page, offline, heavy = {page!r}, {offline!r}, {heavy!r}
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(os.path.join({root!r}, "app.py"), default_timeout=120)
+at.secrets.update({{k: os.environ.get(k, "x") for k in ("NEO4J_URI", "NEO4J_USER", "NEO4J_PASS", "OPENAI_API_KEY")}})
+start = time.perf_counter()
+at.run()
+home = time.perf_counter() - start
+loaded_home = sorted({{n.split(".")[0] for n in sys.modules if n.split(".")[0] in heavy}})
+if offline:
+    # Patched after Home so the module check above stays honest
+    import re
+    import pandas as pd
+    import graph_store, cache_warmer
+    # Empty result with the query's RETURN aliases as columns, like a real empty result
+    graph_store.fetch_df = lambda cypher, *a, **k: pd.DataFrame(columns=list(dict.fromkeys(re.findall(r"\bAS\s+(\w+)", cypher))))
+    graph_store.run_query = lambda *a, **k: [{{"version": 0}}]
+    cache_warmer.start_cache_warmer = lambda: None
+page_s = home
+if page != "🏠 Home":
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(page).run()
+    page_s = time.perf_counter() - start
+print(json.dumps({{"home_s": home, "page_s": page_s, "errors": [str(e.value) for e in at.exception],
+                  "loaded_after_home": loaded_home}}))
+"""
+
+
+def import_ms(module):
+    # Cumulative -X importtime of the module on top of an already-imported streamlit
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import streamlit; import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    ).stderr
+    times = [int(m.group(1)) for m in re.finditer(rf"\|\s+(\d+)\s+\|\s+{re.escape(module)}\s*$", out, re.M)]
+    return times[-1] / 1000 if times else float("nan")
+
+
+def render(page, offline):
+    code = RENDER_SCRIPT.format(root=ROOT, page=page, offline=offline, heavy=HEAVY)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        return {"home_s": float("nan"), "page_s": float("nan"), "errors": [out.stderr[-500:]], "loaded_after_home": []}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offline", action="store_true", help="stub graph queries and skip the cache warmer")
+    parser.add_argument("--skip-imports", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_imports:
+        print("Import time (cold, after streamlit)")
+        for module in MODULES:
+            print(f"  {module:<16} {import_ms(module):>8.0f} ms")
+
+    print("\nTime to first render (fresh process each)")
+    for page in PAGES:
+        r = render(page, args.offline)
+        note = f"  errors: {r['errors'][0][:80]}" if r["errors"] else ""
+        label = "cold" if page == PAGES[0] else "after Home"
+        print(f"  {page:<45} {r['page_s'] * 1000:>8.0f} ms ({label}){note}")
+        if page == PAGES[0]:
+            print(f"  {'heavy modules loaded by Home':<45} {', '.join(r['loaded_after_home']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
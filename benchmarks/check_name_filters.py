@@ -0,0 +1,42 @@
+"""Check the toLower(x.name) -> x.name_key rewrite Cook-E applies to LLM-written Cypher.
+
+    python benchmarks/check_name_filters.py
+
+Exits 1 if any rewrite comes out different from what's expected below (e.g. a closing
+paren that belonged to the surrounding predicate getting swallowed).
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from chatbot_app import use_name_keys  # noqa: E402
+
+CASES = [
+    ("MATCH (c:Cuisine) WHERE toLower(c.name) = 'Italian' RETURN c",
+     "MATCH (c:Cuisine) WHERE c.name_key = 'italian' RETURN c"),
+    ("MATCH (c:Cuisine) WHERE toLower(c.name) = toLower('Italian') RETURN c",
+     "MATCH (c:Cuisine) WHERE c.name_key = 'italian' RETURN c"),
+    ("MATCH (c:Cuisine) WHERE (toLower(c.name) = 'italian') RETURN c",
+     "MATCH (c:Cuisine) WHERE (c.name_key = 'italian') RETURN c"),
+    ("MATCH (c:Cuisine) WHERE (toLower(c.name) = toLower( 'Thai' )) RETURN c",
+     "MATCH (c:Cuisine) WHERE (c.name_key = 'thai') RETURN c"),
+    ("MATCH (r:Region)-[:HAS_CUISINE]->(c) WHERE any(x IN [c] WHERE toLower(c.name) = 'italian') RETURN r",
+     "MATCH (r:Region)-[:HAS_CUISINE]->(c) WHERE any(x IN [c] WHERE c.name_key = 'italian') RETURN r"),
+    ("MATCH (c:Cuisine) WHERE toLower(c.name) = toLower($cuisine) RETURN c",
+     "MATCH (c:Cuisine) WHERE toLower(c.name) = toLower($cuisine) RETURN c"),
+]
+
+
+def main():
+    failed = 0
+    for cypher, expected in CASES:
+        got = use_name_keys(cypher)
+        if got != expected:
+            failed += 1
+            print(f"FAIL  {cypher}\n      got      {got}\n      expected {expected}")
+    print(f"{len(CASES) - failed}/{len(CASES)} rewrites as expected")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
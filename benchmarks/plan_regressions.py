@@ -0,0 +1,166 @@
+"""PROFILE every named dashboard query and Cook-E preset and fail on db-hit regressions.
+
+    docker run -d --name flavors-neo4j -p 7687:7687 -e NEO4J_AUTH=neo4j/plan-check neo4j:5
+    export NEO4J_URI=bolt://localhost:7687 NEO4J_USER=neo4j NEO4J_PASS=plan-check
+    python benchmarks/plan_regressions.py --seed --update-baseline   # once, then commit the baseline
+    python benchmarks/plan_regressions.py                            # exit 1 if a query regressed
+
+Queries come from flavor_queries.py (every Cypher string app.py, chatbot_app.py, the
+cache warmer and the offline jobs run) plus PRESET_QUERIES. --seed loads a fixed-size,
+fixed-seed synth_graph.py graph through ingest.load_rows, so db hits are comparable run to run.
+A query fails when its db hits exceed the baseline by more than --threshold, when it
+picks up a flagged operator (label scan, cartesian product) the baseline didn't have, or
+when it has no baseline entry at all. Without a baseline file (and no --update-baseline)
+the run exits 1 before profiling anything, so an unbaselined check never passes.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import flavor_queries as fq  # noqa: E402
+from graph_schema import apply_schema, bump_graph_version  # noqa: E402
+from graph_store import get_driver, get_secret  # noqa: E402
+from ingest import load_rows  # noqa: E402
+from profile_name_keys import plan_totals  # noqa: E402
+from synth_graph import cuisine_names, generate_rows, ingredient_names, make_config  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "plan_baseline.json")
+THRESHOLD = 0.20
+
+# Operators that mean "touched every node of a label" or "joined two unrelated patterns"
+FLAGGED_OPERATORS = {"AllNodesScan", "NodeByLabelScan", "CartesianProduct"}
+
+# Fixed synthetic graph for the seeded database (changing it means re-baselining)
+SEED = make_config(2, seed=43)
+
+# The most popular cuisine / ingredients in the seeded graph
+PARAMS = {
+    "cuisine": cuisine_names(1)[0][0].title(),
+    "ingredients": ingredient_names(3),
+}
+
+
+def named_queries():
+    # name -> Cypher for every query string in flavor_queries, then the Cook-E presets
+    queries = {
+        name: value for name, value in vars(fq).items()
+        if isinstance(value, str) and not name.startswith("_") and "RETURN" in value
+    }
+    for label, preset in fq.PRESET_QUERIES.items():
+        queries[f"preset {label}"] = preset["cypher"]
+    return queries
+
+
+def is_local(uri):
+    return urlparse(uri).hostname in ("localhost", "127.0.0.1", "::1", "neo4j")
+
+
+def wipe_graph(session):
+    session.run("MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS").consume()
+
+
+def seed_graph(driver, reset=False):
+    with driver.session() as session:
+        seeded = session.run("MATCH (m:Meta {key: 'plan_seed'}) RETURN m.config AS config").single()
+        if seeded and seeded["config"] == json.dumps(SEED, sort_keys=True):
+            print("Graph already seeded with this config")
+            return
+        if session.run("MATCH (n) WHERE NOT n:Meta RETURN count(n) AS n").single()["n"] and not reset:
+            sys.exit("Graph isn't empty — rerun with --reset to wipe it first")
+        if reset:
+            wipe_graph(session)
+
+    start = time.perf_counter()
+    apply_schema(driver)
+    stats = load_rows(driver, generate_rows(SEED))
+    with driver.session() as session:
+        session.run("MERGE (m:Meta {key: 'plan_seed'}) SET m.config = $config",
+                    config=json.dumps(SEED, sort_keys=True)).consume()
+    bump_graph_version(driver)
+    print(f"Seeded {stats['rows']:,} rows in {time.perf_counter() - start:.1f}s")
+
+
+def profile(session, cypher, params):
+    result = session.run("PROFILE " + cypher, params)
+    rows = len(list(result))
+    hits, ops = plan_totals(result.consume().profile)
+    return {"db_hits": hits, "rows": rows, "operators": sorted(set(ops))}
+
+
+def check(current, base, threshold):
+    # -> list of problems (empty = pass)
+    if base is None:
+        return ["not in baseline (rerun with --update-baseline)"]
+    problems = []
+    limit = base["db_hits"] * (1 + threshold)
+    if current["db_hits"] > limit:
+        problems.append(f"db hits {base['db_hits']:,} -> {current['db_hits']:,} (+{threshold:.0%} allowed)")
+    new_ops = FLAGGED_OPERATORS.intersection(current["operators"]) - set(base["operators"])
+    if new_ops:
+        problems.append("new " + ", ".join(sorted(new_ops)))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", action="store_true", help="load the fixed synthetic graph first")
+    parser.add_argument("--reset", action="store_true", help="with --seed: wipe a non-empty graph first")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed db-hit growth (0.2 = 20%%)")
+    parser.add_argument("--only", nargs="*", help="query names to run (default: all)")
+    args = parser.parse_args()
+
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        sys.exit(f"No baseline at {args.baseline}: record one with --seed --update-baseline and commit it")
+
+    uri = get_secret("NEO4J_URI")
+    if (args.seed or args.reset) and not is_local(uri):
+        sys.exit(f"Refusing to seed {uri}: point NEO4J_URI at a local Neo4j")
+
+    driver = get_driver()
+    if args.seed:
+        seed_graph(driver, reset=args.reset)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("seed") != SEED:
+            print("⚠️ Baseline was recorded on a different seed config; db hits won't be comparable")
+        baseline = saved["queries"]
+
+    queries = named_queries()
+    if args.only:
+        queries = {name: queries[name] for name in args.only}
+
+    results, failed = {}, 0
+    print(f"{'query':<34}{'db hits':>12}{'baseline':>12}{'rows':>7}  flags")
+    with driver.session() as session:
+        for name, cypher in queries.items():
+            current = results[name] = profile(session, cypher, PARAMS)
+            base = baseline.get(name)
+            flags = sorted(FLAGGED_OPERATORS.intersection(current["operators"]))
+            problems = check(current, base, args.threshold)
+            failed += bool(problems)
+            base_hits = f"{base['db_hits']:,}" if base else "-"
+            print(f"{name:<34}{current['db_hits']:>12,}{base_hits:>12}{current['rows']:>7}  "
+                  f"{', '.join(flags)}{'  ❌ ' + '; '.join(problems) if problems else ''}")
+        version = session.run("CALL dbms.components() YIELD versions RETURN versions[0] AS v").single()["v"]
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"seed": SEED, "neo4j": version, "params": PARAMS,
+                       "queries": {**baseline, **results}}, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+        print(f"Baseline -> {args.baseline}")
+    elif failed:
+        sys.exit(f"{failed} of {len(queries)} queries failed the plan check")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""PROFILE the cuisine queries before (toLower() filters) and after (indexed name_key).
+
+Run after `python graph_schema.py` has backfilled name_key:
+    python benchmarks/profile_name_keys.py --cuisine italian
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import flavor_queries as fq  # noqa: E402
+from graph_store import get_driver  # noqa: E402
+
+# The pre-migration lookups, kept verbatim for comparison
+BEFORE = {
+    "q_cui_kpi / q_cui_ing / q_cui_net": """
+        MATCH (c:Cuisine)
+        WHERE toLower(c.name) = toLower($cuisine)
+        RETURN c.name AS Cuisine
+    """,
+    "q_dishes": """
+        MATCH (c:Cuisine)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
+        WHERE i.study_food = true
+          AND toLower(c.name) = toLower($cuisine)
+        WITH d, COUNT(DISTINCT i) AS StudyFriendlyIngredients
+        RETURN d.name AS Dish, StudyFriendlyIngredients
+        ORDER BY StudyFriendlyIngredients DESC
+        LIMIT 10
+    """,
+    "q_reco (cuisine lookup)": """
+        WITH toLower($cuisine) AS cuisine
+        OPTIONAL MATCH (c:Cuisine)
+        WHERE toLower(c.name) = cuisine
+        RETURN c.name AS Cuisine
+    """,
+}
+
+AFTER = {
+    "q_cui_kpi / q_cui_ing / q_cui_net": """
+        MATCH (c:Cuisine {name_key: toLower(trim($cuisine))})
+        RETURN c.name AS Cuisine
+    """,
+    "q_dishes": fq.q_dishes,
+    "q_reco (cuisine lookup)": """
+        WITH toLower(trim($cuisine)) AS cuisine
+        OPTIONAL MATCH (c:Cuisine {name_key: cuisine})
+        RETURN c.name AS Cuisine
+    """,
+}
+
+
+def plan_totals(plan):
+    # Sum db hits over the whole operator tree and collect operator names
+    hits = plan.get("dbHits", 0)
+    ops = [plan["operatorType"].split("@")[0]]
+    for child in plan.get("children", []):
+        child_hits, child_ops = plan_totals(child)
+        hits += child_hits
+        ops += child_ops
+    return hits, ops
+
+
+def profile(session, cypher, params):
+    summary = session.run("PROFILE " + cypher, params).consume()
+    return plan_totals(summary.profile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cuisine", default="italian")
+    args = parser.parse_args()
+    params = {"cuisine": args.cuisine}
+
+    print(f"{'query':<36}{'before':>12}{'after':>12}  seek?")
+    with get_driver().session() as session:
+        for name in BEFORE:
+            before, _ = profile(session, BEFORE[name], params)
+            after, ops = profile(session, AFTER[name], params)
+            seek = "yes" if any("IndexSeek" in op for op in ops) else "NO"
+            print(f"{name:<36}{before:>12,}{after:>12,}  {seek}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Replay recorded Cook-E questions through the chatbot pipeline without OpenAI or Aura.
+
+    python benchmarks/replay_cook_e.py                                  # stub LLM + recorded graph rows
+    python benchmarks/replay_cook_e.py --graph neo4j                    # stub LLM + NEO4J_* (e.g. a local Neo4j)
+    python benchmarks/replay_cook_e.py --save runs/after.json --compare runs/before.json
+    python benchmarks/replay_cook_e.py --record                         # real OpenAI + graph -> refresh the corpus
+
+The corpus (benchmarks/replay/corpus.jsonl) holds one question per line with its session,
+the model reply, how long the model took (llm_ms) and optionally the graph rows / graph_ms.
+The shipped corpus is a hand-written fixture: its replies, rows and llm_ms / graph_ms were
+written by hand, not captured from OpenAI or Aura, so the LLM and Cypher p50/p95 it gives
+show the pipeline runs, not how fast it is. Run --record once to replace it with real
+replies and timings (recorded lines are marked "recorded": true). The LLM stub is a local
+OpenAI-compatible HTTP server, so the real openai client, single-flight and rate limiter
+code paths all run.
+
+Reports per-stage latency (routing, LLM, Cypher, chart build), cache / reuse counts and,
+with --compare, which answers changed since a saved run.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# Replays measure the LLM + limiter path, so answers left on disk by the app mustn't count
+os.environ["FLAVORS_CACHE_PATH"] = "off"
+import chatbot_app  # noqa: E402
+import graph_store  # noqa: E402
+from chart_render import build_figure  # noqa: E402
+from chat_memory import ChatMemory, compact_answer, normalize  # noqa: E402
+from insights import summarize  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "replay", "corpus.jsonl")
+STAGES = ["routing", "llm", "cypher", "chart"]
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class StubLLM(ThreadingHTTPServer):
+    # OpenAI-compatible /v1/chat/completions serving recorded replies with recorded latency
+    daemon_threads = True
+
+    def __init__(self, corpus, latency_scale=1.0):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.replies = {}
+        for rec in corpus:
+            if "response" in rec:
+                self.replies.setdefault(normalize(rec["question"]), (rec["response"], rec.get("llm_ms", 0)))
+        self.latency_scale = latency_scale
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        question = next(m["content"] for m in reversed(body["messages"]) if m["role"] == "user")
+        reply, latency_ms = self.server.replies.get(
+            normalize(question), (json.dumps({"text": "Eh, that one not in my pantry leh 😅"}), 500)
+        )
+        self.server.requests += 1
+        time.sleep(latency_ms * self.server.latency_scale / 1000)
+
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        payload = json.dumps({
+            "id": f"stub-{self.server.requests}", "object": "chat.completion", "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": reply}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(reply) // 4,
+                      "total_tokens": prompt_tokens + len(reply) // 4},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def use_recorded_graph(corpus, latency_scale=1.0):
+    # Graph rows replayed by (cleaned) Cypher text; anything else returns an empty result
+    recorded = {}
+    for rec in corpus:
+        if "rows" in rec and "response" in rec:
+            cypher = json.loads(rec["response"]).get("cypher", "")
+            recorded[" ".join(chatbot_app.clean_cypher(cypher).split())] = (rec["rows"], rec.get("graph_ms", 0))
+
+    def fetch_df(cypher, params=None, max_rows=None, **kwargs):
+        rows, latency_ms = recorded.get(" ".join(cypher.split()), (None, 0))
+        time.sleep(latency_ms * latency_scale / 1000)
+        if rows is None:
+            return pd.DataFrame(columns=list(dict.fromkeys(re.findall(r"\bAS\s+(\w+)", cypher))))
+        df = pd.DataFrame(rows["data"], columns=rows["columns"])
+        return df.head(max_rows) if max_rows else df
+
+    graph_store.fetch_df = fetch_df
+    graph_store.run_query = lambda cypher, params=None: [{"version": 0}]
+
+
+def fingerprint(route, ai_output, df, summary):
+    # What "the answer" is, for diffing runs
+    out = {"route": route}
+    if ai_output is not None and "text" in ai_output and df is None:
+        out["text"] = ai_output["text"]
+    if df is not None:
+        out["columns"] = [str(c) for c in df.columns]
+        out["rows"] = json.loads(df.head(5).to_json(orient="values"))
+        out["n"] = len(df)
+    if summary:
+        out["summary"] = summary
+    return out
+
+
+def replay(corpus, client, record=False):
+    sessions = {}
+    results, timings = [], {stage: [] for stage in STAGES}
+    routes = {"local": 0, "memory": 0, "llm": 0}
+
+    for i, rec in enumerate(corpus):
+        random.seed(i)  # insights pick a random opener/analogy
+        memory = sessions.setdefault(rec.get("session", "default"), ChatMemory())
+        question = rec["question"]
+        stage = {}
+        if record:
+            rec["recorded"] = True
+
+        start = time.perf_counter()
+        repeat = memory.find(question)
+        local = chatbot_app.local_answer(question) if repeat is None else None
+        stage["routing"] = time.perf_counter() - start
+
+        ai_output, df = None, None
+        if local:
+            route, (_, df, chart_type) = "local", local
+        else:
+            if repeat is not None:
+                route, raw = "memory", repeat["answer"]
+            else:
+                route = "llm"
+                start = time.perf_counter()
+                raw = chatbot_app.ask_cook_e(client, chatbot_app.SYSTEM_PROMPT, question, memory.messages())
+                stage["llm"] = time.perf_counter() - start
+                if record:
+                    rec["response"], rec["llm_ms"] = raw, round(stage["llm"] * 1000)
+            try:
+                ai_output = json.loads(raw)
+            except json.JSONDecodeError:
+                ai_output = {"text": raw}
+            chart_type = ai_output.get("chart", "table")
+
+            if "text" not in ai_output:
+                cypher = ai_output.get("cypher", "").strip()
+                df = memory.result(repeat["ref"] if repeat is not None else ai_output.get("ref"))
+                if df is None and cypher and "off-topic" not in cypher.lower():
+                    start = time.perf_counter()
+                    # Same fetch as the app (one row over the cap, then trimmed)
+                    df = graph_store.run_query_df(chatbot_app.clean_cypher(cypher),
+                                                  max_rows=chatbot_app.LLM_MAX_ROWS + 1).head(chatbot_app.LLM_MAX_ROWS)
+                    stage["cypher"] = time.perf_counter() - start
+                    if record:
+                        rec["rows"] = json.loads(df.to_json(orient="split", index=False))
+                        rec["graph_ms"] = round(stage["cypher"] * 1000)
+
+        summary = None
+        if df is not None and not df.empty:
+            start = time.perf_counter()
+            fig, _ = build_figure(df, chart_type, title=question.title())
+            if fig is not None:
+                fig.to_json()
+            summary = summarize(df)
+            stage["chart"] = time.perf_counter() - start
+
+        if route == "llm":
+            memory.add(question, compact_answer(ai_output), df)
+        elif route == "local":
+            memory.add(question, json.dumps({"text": local[0]}, ensure_ascii=False), df)
+        routes[route] += 1
+
+        for name, seconds in stage.items():
+            timings[name].append(seconds * 1000)
+        results.append({"session": rec.get("session", "default"), "question": question,
+                        "stages_ms": {k: round(v * 1000, 1) for k, v in stage.items()},
+                        "answer": fingerprint(route, ai_output, df, summary)})
+    return results, timings, routes
+
+
+def _pct(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else (values[0] if values else 0.0)
+
+
+def report(results, timings, routes, stub, corpus):
+    print(f"{'stage':<8} {'count':>5} {'p50 ms':>8} {'p95 ms':>8} {'total ms':>9}")
+    for name in STAGES:
+        values = timings[name]
+        if values:
+            print(f"{name:<8} {len(values):>5} {_pct(values, 50):>8.1f} {_pct(values, 95):>8.1f} {sum(values):>9.0f}")
+
+    cache = graph_store.result_cache.stats()
+    lookups = cache["hits"] + cache["misses"]
+    print(f"\nQuestions: {len(results)}  routed local: {routes['local']}  reused from chat memory: {routes['memory']}  "
+          f"sent to LLM: {routes['llm']}")
+    print(f"LLM stub requests: {stub.requests if stub else '-'}  single-flight coalesced: {chatbot_app.llm_flight.coalesced}")
+    print(f"Query cache: {cache['hits']}/{lookups} hits ({cache['hits'] * 100 / max(lookups, 1):.0f}%)")
+    hand_written = sum(not rec.get("recorded") for rec in corpus)
+    if stub and hand_written:
+        print(f"⚠️ {hand_written} of {len(corpus)} corpus lines are hand-written, not recorded: their llm/cypher "
+              f"latencies are made up — run --record for real ones")
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        # Keyed by position too: the same question can come up twice in one session
+        baseline = {(i, r["session"], r["question"]): r["answer"] for i, r in enumerate(json.load(f)["results"])}
+    changed = 0
+    for i, r in enumerate(results):
+        before = baseline.get((i, r["session"], r["question"]))
+        if before is None:
+            print(f"  new      {r['question']}")
+        elif before != r["answer"]:
+            changed += 1
+            fields = sorted(k for k in set(before) | set(r["answer"]) if before.get(k) != r["answer"].get(k))
+            print(f"  changed  {r['question']}  ({', '.join(fields)})")
+    print(f"{changed} of {len(results)} answers changed vs {baseline_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--graph", choices=["recorded", "neo4j"], default="recorded")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiply recorded LLM/graph latency")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="don't lift the app's OpenAI RPM/TPM limiter")
+    parser.add_argument("--record", action="store_true", help="call the real OpenAI API + graph and rewrite the corpus")
+    parser.add_argument("--save", help="write results JSON here (for a later --compare)")
+    parser.add_argument("--compare", help="results JSON from an earlier run")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    stub = None
+    if args.record:
+        from openai import OpenAI
+        client = OpenAI(api_key=graph_store.get_secret("OPENAI_API_KEY"))
+    else:
+        stub = StubLLM(corpus, args.latency_scale)
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+        from openai import OpenAI
+        client = OpenAI(api_key="replay", base_url=stub.base_url, max_retries=0)
+        if args.graph == "recorded":
+            use_recorded_graph(corpus, args.latency_scale)
+    if not args.keep_rate_limits:
+        chatbot_app.llm_limiter = RateLimiter(10 ** 6, 10 ** 9)
+
+    results, timings, routes = replay(corpus, client, record=args.record)
+    report(results, timings, routes, stub, corpus)
+
+    if args.record:
+        with open(args.corpus, "w", encoding="utf-8") as f:
+            for rec in corpus:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        print(f"Corpus refreshed -> {args.corpus}")
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"corpus": args.corpus, "graph": args.graph, "results": results}, f, indent=1, ensure_ascii=False)
+    if args.compare:
+        compare(results, args.compare)
+    if stub:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import re
+
+import pandas as pd
+
+import flavor_queries as fq
+from graph_store import cached, run_query_df
+
+# Precomputed Ingredient→Brand and Brand→Cuisine reach, so brand panels and brand
+# questions are dictionary/DataFrame lookups instead of multi-hop traversals on Aura
+
+# Whole word, and not "brand-new"
+BRAND_WORDS = re.compile(r"\bbrands?\b(?!-)")
+# "top brands", "most popular brand", "best brands for studying" -> the coverage ranking
+TOP_BRAND_WORDS = re.compile(r"\b(top|best|leading|biggest|most popular|popular)\b")
+
+
+def name_pattern(names):
+    # Whole-word match of any known name, longest first ("soy sauce" before "soy")
+    alternation = "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True) if n)
+    return re.compile(rf"\b({alternation})\b") if alternation else None
+
+
+class BrandIndex:
+    def __init__(self, edges, usage):
+        # edges: Ingredient, Brand, StudyFood  |  usage: Brand, Cuisine, Dishes
+        self.edges = edges.dropna(subset=["Ingredient", "Brand"]).drop_duplicates(["Ingredient", "Brand"])
+        self.ingredient_brands = self.edges.groupby("Ingredient")["Brand"].agg(sorted).to_dict()
+
+        # Brand reach per cuisine = dishes in that cuisine using any of the brand's ingredients
+        # (counted distinct in Cypher; summing per-ingredient counts would double-count dishes)
+        self.reach = (
+            usage.dropna(subset=["Brand", "Cuisine"])
+            .sort_values(["Dishes", "Brand"], ascending=[False, True], ignore_index=True)
+        )
+
+        study = self.edges[self.edges["StudyFood"].astype(bool)]
+        coverage = pd.DataFrame({
+            "StudyFoods": study.groupby("Brand")["Ingredient"].nunique(),
+            "Ingredients": self.edges.groupby("Brand")["Ingredient"].nunique(),
+            "Cuisines": self.reach.groupby("Brand")["Cuisine"].nunique(),
+        }).fillna(0).astype(int)
+        self.coverage = (
+            coverage.rename_axis("Brand").reset_index()
+            .sort_values(["StudyFoods", "Ingredients", "Brand"], ascending=[False, False, True], ignore_index=True)
+        )
+
+        self._names = {
+            "brand": {str(b).lower(): b for b in self.coverage["Brand"]},
+            "cuisine": {str(c).lower(): c for c in self.reach["Cuisine"].unique()},
+            "ingredient": {str(i).lower(): i for i in self.ingredient_brands},
+        }
+        self._patterns = {}
+
+    def top_brands(self, n=10):
+        return self.coverage.head(n)
+
+    def brand_share(self, cuisine, n=8):
+        rows = self.reach[self.reach["Cuisine"].astype(str).str.lower() == cuisine.lower()][["Brand", "Dishes"]]
+        if len(rows) > n:
+            other = pd.DataFrame([{"Brand": "Other", "Dishes": rows["Dishes"].iloc[n:].sum()}])
+            rows = pd.concat([rows.head(n), other], ignore_index=True)
+        rows = rows.reset_index(drop=True)
+        rows["Share"] = (rows["Dishes"] * 100.0 / max(rows["Dishes"].sum(), 1)).round(1)
+        return rows
+
+    def cuisines_for(self, brand, n=10):
+        rows = self.reach[self.reach["Brand"].astype(str).str.lower() == brand.lower()]
+        return rows[["Cuisine", "Dishes"]].head(n).reset_index(drop=True)
+
+    def brands_for(self, ingredients):
+        return pd.DataFrame([
+            {"Ingredient": i, "Brands": ", ".join(self.ingredient_brands[i])}
+            for i in ingredients if i in self.ingredient_brands
+        ], columns=["Ingredient", "Brands"])
+
+    def find(self, kind, text):
+        if kind not in self._patterns:
+            self._patterns[kind] = name_pattern(self._names[kind])
+        pattern = self._patterns[kind]
+        if pattern is None:
+            return []
+        found = (self._names[kind][m.group(1)] for m in pattern.finditer(text.lower()))
+        return list(dict.fromkeys(found))
+
+    def answer(self, question):
+        # Cook-E brand intent -> (title, DataFrame, chart) or None to let the LLM handle it
+        q = question.lower()
+        if not BRAND_WORDS.search(q):
+            return None
+
+        cuisines = self.find("cuisine", q)
+        if cuisines:
+            return f"🏷️ Brand share in {cuisines[0].title()} dishes", self.brand_share(cuisines[0]), "pie"
+
+        brands = self.find("brand", q)
+        if brands:
+            return f"🌍 Cuisines reached by {brands[0]}", self.cuisines_for(brands[0]), "bar"
+
+        ingredients = self.find("ingredient", q)
+        if ingredients:
+            return "🧂 Brands behind your ingredients", self.brands_for(ingredients), "table"
+
+        # Anything else about brands ("which brand is cheapest?") is the LLM's to answer
+        if TOP_BRAND_WORDS.search(q):
+            return "🧠 Top brands by study-food coverage", self.top_brands()[["Brand", "StudyFoods"]], "bar"
+        return None
+
+
+# Part of the cache key: bump when BrandIndex changes, so pickles left in the disk cache by
+# older code are never loaded into the new class
+BRAND_INDEX_VERSION = 2
+
+
+def get_brand_index(refresh=False):
+    return cached(
+        ("brand-index", BRAND_INDEX_VERSION),
+        lambda: BrandIndex(
+            run_query_df(fq.q_brand_edges, refresh=refresh),
+            run_query_df(fq.q_brand_cuisine_usage, refresh=refresh),
+        ),
+        refresh=refresh,
+    )
@@ -0,0 +1,120 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import flavor_queries as fq
+from brand_index import get_brand_index
+from dashboard_snapshot import ensure_snapshot
+from graph_store import RESULT_TTL, get_shared_cache, preload_cache, run_query_df
+
+# Background job that re-runs the dashboard / Cook-E preset queries so visitors hit a warm cache
+
+log = logging.getLogger(__name__)
+
+# Refresh comfortably inside the result TTL so entries never expire between runs
+WARM_INTERVAL = RESULT_TTL * 2 // 3
+# Random delay before each query (and ± on the schedule) so restarts don't stampede Aura
+WARM_JITTER = 3.0
+# At most this many warm queries in flight at once
+WARM_CONCURRENCY = 2
+
+FIXED_QUERIES = [
+    fq.kpi_query,
+    fq.q_ingredients,
+    fq.q_regions,
+    fq.q_cuisines,
+    fq.q_top_dishes,
+    fq.ing_list_q,
+] + [preset["cypher"] for preset in fq.PRESET_QUERIES.values()]
+
+PER_CUISINE_QUERIES = [fq.q_cui_kpi, fq.q_cui_ing, fq.q_dishes]
+
+_warmer = None
+_warmer_lock = threading.Lock()
+
+
+def warm_jobs():
+    jobs = [(cypher, None) for cypher in FIXED_QUERIES]
+
+    cuisines = run_query_df(fq.cuisine_list_q, refresh=True)
+    for cuisine in (cuisines["cuisine"].tolist() if not cuisines.empty else []):
+        jobs += [(cypher, {"cuisine": cuisine}) for cypher in PER_CUISINE_QUERIES]
+    return jobs
+
+
+def _warm_one(job):
+    cypher, params = job
+    time.sleep(random.uniform(0, WARM_JITTER))
+    run_query_df(cypher, params, refresh=True)
+
+
+def warm_once():
+    start = time.perf_counter()
+    jobs = warm_jobs()
+    failed = 0
+
+    with ThreadPoolExecutor(max_workers=WARM_CONCURRENCY, thread_name_prefix="cache-warm") as pool:
+        for future in [pool.submit(_warm_one, job) for job in jobs]:
+            try:
+                future.result()
+            except Exception:
+                failed += 1
+                log.exception("Cache warm query failed")
+
+    # Rebuild the derived brand index from fresh inputs
+    try:
+        get_brand_index(refresh=True)
+    except Exception:
+        failed += 1
+        log.exception("Brand index rebuild failed")
+
+    # Pre-render the dashboard's top panels once per graph version
+    try:
+        ensure_snapshot()
+    except Exception:
+        failed += 1
+        log.exception("Dashboard snapshot build failed")
+
+    stats = {"queries": len(jobs), "failed": failed, "seconds": round(time.perf_counter() - start, 1)}
+    log.info("Cache warm finished: %s", stats)
+    return stats
+
+
+class CacheWarmer(threading.Thread):
+    def __init__(self, interval=WARM_INTERVAL):
+        super().__init__(name="cache-warmer", daemon=True)
+        self.interval = interval
+        self.last_stats = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            # Pull last run's results off disk first, so a restart doesn't start cold
+            preload_cache()
+        except Exception:
+            log.exception("Cache preload failed")
+        while not self._stop_event.is_set():
+            try:
+                # Several workers share one cache: only the lease holder warms it this round
+                shared_cache = get_shared_cache()
+                if shared_cache is None or shared_cache.try_lease("cache-warmer", self.interval):
+                    self.last_stats = warm_once()
+            except Exception:
+                # e.g. Aura paused — try again on the next tick
+                log.exception("Cache warm run failed")
+            self._stop_event.wait(self.interval + random.uniform(-WARM_JITTER, WARM_JITTER) * 10)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def start_cache_warmer():
+    # Streamlit re-executes app.py on every interaction; only the first call starts the thread
+    global _warmer
+    with _warmer_lock:
+        if _warmer is None:
+            _warmer = CacheWarmer()
+            _warmer.start()
+    return _warmer
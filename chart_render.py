@@ -0,0 +1,84 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+# Size/cardinality-aware rendering for Cook-E results. px.bar(color=...) makes one trace
+# per category and st.table writes every row as static HTML, which both fall over on
+# big results, so large ones get a single trace, top-N + "Other", WebGL, or st.dataframe.
+
+# Past this many bars, keep the top N and fold the rest into "Other"
+MAX_BARS = 30
+# Pie slices shown before the rest become "Other"
+MAX_SLICES = 10
+# Up to this many categories the per-category coloured px figures are fine
+MAX_COLOR_TRACES = 20
+# Line charts with more points than this switch to WebGL
+WEBGL_POINTS = 1000
+# Bigger results go to the virtualised st.dataframe instead of a static st.table
+MAX_STATIC_ROWS = 50
+
+PALETTES = {"bar": px.colors.qualitative.Vivid, "pie": px.colors.qualitative.Bold}
+TITLE_ICONS = {"bar": "📊", "pie": "🥧", "line": "📈"}
+
+
+def top_n_other(df, label, value, n):
+    # Largest n rows by value plus one "Other" row with the rest summed
+    data = df[[label, value]].sort_values(value, ascending=False, kind="stable")
+    if len(data) <= n:
+        return data.reset_index(drop=True)
+    other = pd.DataFrame({label: ["Other"], value: [data[value].iloc[n:].sum()]})
+    return pd.concat([data.head(n), other], ignore_index=True)
+
+
+def _palette_cycle(palette, n):
+    return [palette[i % len(palette)] for i in range(n)]
+
+
+def build_figure(df, chart_type, title=None, palette=None):
+    # -> (plotly figure, None) or (None, DataFrame to show as a table)
+    palette = palette or PALETTES.get(chart_type, px.colors.qualitative.Plotly)
+    if title:
+        title = f"{TITLE_ICONS.get(chart_type, '')} {title}".strip()
+    if chart_type not in ("bar", "pie", "line") or len(df.columns) < 2:
+        return None, df
+
+    x, y = df.columns[0], df.columns[1]
+    if not pd.api.types.is_numeric_dtype(df[y]):
+        return None, df
+
+    if chart_type == "pie":
+        data = top_n_other(df, x, y, MAX_SLICES)
+        return px.pie(data, names=x, values=y, title=title, color_discrete_sequence=palette), None
+
+    if chart_type == "line":
+        if len(df) > WEBGL_POINTS:
+            fig = go.Figure(go.Scattergl(x=df[x], y=df[y], mode="lines"))
+            fig.update_layout(title=title, xaxis_title=str(x), yaxis_title=str(y))
+            return fig, None
+        return px.line(df, x=x, y=y, title=title, markers=True), None
+
+    data = top_n_other(df, x, y, MAX_BARS) if len(df) > MAX_BARS else df
+    if data[x].nunique() <= MAX_COLOR_TRACES:
+        return px.bar(data, x=x, y=y, color=x, title=title, color_discrete_sequence=palette), None
+
+    # One trace, per-bar colours (same look, no trace-per-category)
+    fig = go.Figure(go.Bar(x=data[x].astype(str), y=data[y], marker_color=_palette_cycle(palette, len(data))))
+    fig.update_layout(title=title, xaxis_title=str(x), yaxis_title=str(y))
+    return fig, None
+
+
+def show_table(df):
+    if len(df) > MAX_STATIC_ROWS:
+        st.caption(f"{len(df):,} rows — scroll to see them all")
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.table(df)
+
+
+def render_result(df, chart_type, title=None, palette=None):
+    fig, table = build_figure(df, chart_type, title, palette)
+    if fig is not None:
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        show_table(table)
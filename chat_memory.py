@@ -0,0 +1,99 @@
+import json
+
+# Per-session Cook-E conversation state: recent turns are sent verbatim, older turns are
+# folded into a one-line-per-turn summary, and query results stay here under short refs
+# (R1, R2, ...) so follow-ups can point at them instead of re-sending or re-running them
+
+# Prompt budget for everything between the system prompt and the new question
+HISTORY_TOKENS = 1200
+# Never send more than this many turns verbatim, even if they're short
+MAX_RECENT_TURNS = 6
+# Summary lines kept for turns that fell out of the window
+MAX_SUMMARY_LINES = 8
+# DataFrames kept per session for reuse by reference
+MAX_RESULTS = 5
+
+
+def count_tokens(text):
+    # ~4 characters per token is close enough for budgeting
+    return len(text) // 4
+
+
+def normalize(question):
+    return " ".join(question.lower().split())
+
+
+def describe_result(ref, df):
+    # What the model sees instead of the rows themselves
+    if df is None:
+        return ""
+    if df.empty:
+        return f"[{ref}: no rows]"
+    top = ", ".join(f"{v}" for v in df.iloc[0].tolist()[:3])
+    return f"[{ref}: {len(df)} rows of {', '.join(map(str, df.columns))}; top row: {top}]"
+
+
+class ChatMemory:
+    def __init__(self):
+        self.turns = []      # {"question", "answer", "ref"}
+        self.summary = []    # short lines for turns that left the window
+        self.results = {}    # ref -> DataFrame (oldest dropped first)
+        self._next_ref = 1
+
+    def add(self, question, answer, df=None):
+        ref = None
+        if df is not None:
+            ref = f"R{self._next_ref}"
+            self._next_ref += 1
+            self.results[ref] = df
+            while len(self.results) > MAX_RESULTS:
+                self.results.pop(next(iter(self.results)))
+        self.turns.append({"question": question, "answer": answer, "ref": ref,
+                           "note": describe_result(ref, df)})
+        self._compress()
+        return ref
+
+    def result(self, ref):
+        return self.results.get(str(ref).strip().upper()) if ref else None
+
+    def find(self, question):
+        # Same question already answered this session -> reuse that turn instead of asking again
+        q = normalize(question)
+        return next((t for t in reversed(self.turns) if normalize(t["question"]) == q), None)
+
+    def _summary_line(self, turn):
+        answer = turn["note"] or " ".join(str(turn["answer"]).split())[:120]
+        return f"- Asked \"{turn['question'][:100]}\" -> {answer}"
+
+    def _compress(self):
+        while len(self.turns) > MAX_RECENT_TURNS or (
+            len(self.turns) > 1 and self._turn_tokens() > HISTORY_TOKENS
+        ):
+            self.summary.append(self._summary_line(self.turns.pop(0)))
+        del self.summary[:-MAX_SUMMARY_LINES]
+
+    def _turn_tokens(self):
+        return sum(count_tokens(m["content"]) for m in self._turn_messages())
+
+    def _turn_messages(self):
+        messages = []
+        for t in self.turns:
+            messages.append({"role": "user", "content": t["question"]})
+            messages.append({"role": "assistant", "content": f"{t['answer']} {t['note']}".strip()})
+        return messages
+
+    def messages(self):
+        # Chat history to place between the system prompt and the new question
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": "Earlier in this chat:\n" + "\n".join(self.summary)})
+        return messages + self._turn_messages()
+
+    def clear(self):
+        self.__init__()
+
+
+def compact_answer(ai_output):
+    # Keep only what a follow-up needs from a parsed Cook-E reply
+    keep = {k: ai_output[k] for k in ("text", "cypher", "chart", "ref") if k in ai_output}
+    return json.dumps(keep, ensure_ascii=False)
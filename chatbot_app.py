@@ -1,29 +1,126 @@
 import streamlit as st
 import pandas as pd
 import json
+import os
+import re
 import plotly.express as px
-from neo4j import GraphDatabase
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 import random
-
-def main():
-    # Load all secrets safely
-    NEO4J_URI = st.secrets["NEO4J_URI"]
-    NEO4J_USER = st.secrets["NEO4J_USER"]
-    NEO4J_PASS = st.secrets["NEO4J_PASS"]
-
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
-
-    # OpenAI Setup
-    client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-
-    def run_query(cypher):
-        with driver.session() as session:
-            result = session.run(cypher)
-            return [record.data() for record in result]
-
-    # System Prompt
-    SYSTEM_PROMPT = """
+from graph_store import get_secret, get_shared_cache, run_query_df
+from brand_index import get_brand_index
+from chart_render import render_result
+from chat_memory import ChatMemory, compact_answer
+from dish_similarity import load_similarity
+from ingredient_pairs import load_pairs
+from flavor_queries import PRESET_QUERIES
+from insights import summarize, tp_flavour
+from rate_limiter import QueueFull, RateLimiter
+from result_cache import MISS, ResultCache, make_key
+from single_flight import SingleFlight
+from tp_locations import load_index as load_tp_index
+
+LLM_MODEL = "gpt-4.1"
+
+# LLM-written Cypher may forget LIMIT, so never pull more than this into a chart/table
+LLM_MAX_ROWS = 500
+
+# OpenAI quota for our key (override with OPENAI_RPM / OPENAI_TPM in secrets or env).
+# The limiter is per process, so under serve.py (FLAVORS_WORKERS set) each worker gets an equal share.
+LLM_WORKERS = max(1, int(os.environ.get("FLAVORS_WORKERS", 1)))
+LLM_RPM = max(1, int(get_secret("OPENAI_RPM", 60)) // LLM_WORKERS)
+LLM_TPM = max(1, int(get_secret("OPENAI_TPM", 30000)) // LLM_WORKERS)
+# Past this many queued callers (or this long in the queue) we answer from cache/presets instead
+LLM_MAX_QUEUE = 20
+LLM_QUEUE_TIMEOUT = 30
+# Rough reply size used for the TPM budget until the real usage comes back
+LLM_REPLY_TOKENS = 300
+
+# Identical questions arriving together share one OpenAI call
+llm_flight = SingleFlight()
+llm_limiter = RateLimiter(LLM_RPM, LLM_TPM, max_queue=LLM_MAX_QUEUE)
+# Last good answer per question, served when the kitchen is too busy
+answer_cache = ResultCache(max_entries=500, ttl=6 * 3600)
+
+# toLower(x.name) = 'Italian'  ->  x.name_key = 'italian'  (index seek instead of a label scan)
+# (a closing paren is only consumed when the value itself was wrapped in toLower(...))
+NAME_FILTER = re.compile(
+    r"toLower\(\s*(\w+)\.name\s*\)\s*=\s*(?:toLower\(\s*'([^']*)'\s*\)|'([^']*)')", re.IGNORECASE
+)
+
+def use_name_keys(cypher):
+    # Safety net for LLM-written Cypher that still filters with toLower()
+    return NAME_FILTER.sub(
+        lambda m: f"{m.group(1)}.name_key = '{(m.group(2) if m.group(2) is not None else m.group(3)).strip().lower()}'",
+        cypher,
+    )
+
+def estimate_tokens(system_prompt, question, history=()):
+    # ~4 characters per token is close enough for budgeting
+    chars = len(system_prompt) + len(question) + sum(len(m["content"]) for m in history)
+    return chars // 4 + LLM_REPLY_TOKENS
+
+def answer_key(system_prompt, question, history=()):
+    # Follow-ups only share answers when the conversation so far is the same too
+    return make_key("cook-e", LLM_MODEL, system_prompt, " ".join(question.lower().split()), list(history))
+
+def remember_answer(key, answer):
+    # In-process, plus the on-disk cache (kept across restarts, shared by every worker)
+    answer_cache.set(key, answer)
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.set(key, answer, ttl=answer_cache.ttl)
+
+def recall_answer(key):
+    answer = answer_cache.get(key)
+    shared_cache = get_shared_cache()
+    if answer is MISS and shared_cache is not None:
+        answer = shared_cache.get(key)
+    return answer
+
+def ask_cook_e(client, system_prompt, question, history=()):
+    key = answer_key(system_prompt, question, history)
+    # Asked before (maybe before a restart, or on another worker)? No LLM call needed.
+    answer = recall_answer(key)
+    if answer is not MISS:
+        return answer
+
+    def complete():
+        estimate = estimate_tokens(system_prompt, question, history)
+        llm_limiter.acquire(estimate, timeout=LLM_QUEUE_TIMEOUT)
+        response = client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                *history,
+                {"role": "user", "content": question},
+            ]
+        )
+        if response.usage is not None:
+            llm_limiter.settle(estimate, response.usage.total_tokens)
+        answer = response.choices[0].message.content.strip()
+        remember_answer(key, answer)
+        return answer
+
+    return llm_flight.do(key, complete)
+
+def busy_fallback(system_prompt, question, history=()):
+    # Same question answered recently (in this context, else standalone)? Reuse it. Otherwise the closest preset button.
+    for context in (history, ()):
+        cached = recall_answer(answer_key(system_prompt, question, context))
+        if cached is not MISS:
+            return cached
+
+    q = question.lower()
+    if "region" in q or "continent" in q:
+        label = "🌍 Study Regions"
+    elif "cuisine" in q:
+        label = "🍽️ Study Cuisines"
+    else:
+        label = "🧠 Top Study Foods"
+    return json.dumps(PRESET_QUERIES[label])
+
+# System Prompt (module level so the replay benchmark sends exactly what the app sends)
+SYSTEM_PROMPT = """
     You are Cook-E 🤖🍪 — Temasek Polytechnic’s friendly data-chef chatbot who turns FOOD DATA into tasty insights!  
 
     🎯 Core Mission:
@@ -99,8 +196,7 @@ def main():
     Example:
     User: “Which Asian cuisine uses the most brain-boosting ingredients?”
     Correct Cypher:
-    MATCH (r:Region)-[:HAS_CUISINE]->(c:Cuisine)
-    WHERE toLower(r.name) = 'asia'
+    MATCH (r:Region {name_key: 'asia'})-[:HAS_CUISINE]->(c:Cuisine)
     ...
 
     When the user asks about:
@@ -145,10 +241,18 @@ def main():
     "chart": "table"
     }
 
+    🔁 Follow-ups:
+    - Earlier turns of this chat come before the new question. Past results appear as
+      [R1: ...] summaries instead of their rows.
+    - For follow-ups like “and for Japanese?”, reuse your previous query and change only what the user changed.
+    - To show an earlier result again (e.g. “show that as a pie”), reply
+      {"ref": "R1", "chart": "pie"} instead of writing a new query.
+
     💡 Query Rule:
-    When filtering by names (like cuisine, ingredient, or brand), always compare **case-insensitively** using:
-    `WHERE toLower(c.name) = 'italian'`
-    This ensures results match even if the data is stored in lowercase.
+    When filtering by names (like region, cuisine, dish, ingredient, or brand), match on the indexed
+    lowercase `name_key` property with a lowercase value:
+    `MATCH (c:Cuisine {name_key: 'italian'})`
+    NEVER use toLower(x.name) in a filter — it forces a full scan. Still RETURN x.name for display.
 
     🎨 Chart Suggestion Rules:
     - "bar" → category counts (cuisines, ingredients, brands)
@@ -165,6 +269,44 @@ def main():
     Let visitors leave saying, “Wah, Cook-E quite steady sia — data also can make so fun one!”
     """
 
+def show_insight(df):
+    # Data-grounded narration for a chart/table result, written locally (no second LLM call)
+    summary = summarize(df)
+    if summary:
+        st.markdown(f"""
+        <div style="background:linear-gradient(135deg,#00b4d8,#0077b6);padding:18px;
+        border-radius:15px;color:white;font-size:18px;line-height:1.5;
+        font-weight:600;text-align:center;box-shadow:0 0 18px rgba(0,183,255,0.5);
+        margin-top:10px;">
+        🍪 <b>Cook-E says:</b> {summary}
+        </div>
+        """, unsafe_allow_html=True)
+
+def local_answer(question):
+    # Brand / similar-dish / pairing questions are answered from local indexes (no GPT, no traversal)
+    if question.strip().startswith("{"):
+        return None
+    try:
+        answer = get_brand_index().answer(question)
+        if answer is None:
+            similarity = load_similarity()
+            answer = similarity.answer(question) if similarity else None
+        if answer is None:
+            pairs = load_pairs()
+            answer = pairs.answer(question) if pairs else None
+        return answer
+    except Exception:
+        return None
+
+def clean_cypher(cypher_query):
+    # Lowercase quoted names and filter on name_key before running LLM-written Cypher
+    cypher_query = re.sub(r":'([A-Z][a-z]+)'", lambda m: f":'{m.group(1).lower()}'", cypher_query)
+    return use_name_keys(cypher_query)
+
+def main():
+    # OpenAI Setup
+    client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+
     # Streamlit Setup
     st.set_page_config(page_title="Cook-E's Map of Flavors 🍪", page_icon="🍪", layout="centered")
 
@@ -310,118 +452,37 @@ def main():
     """, unsafe_allow_html=True)
 
     st.subheader("Try these study-boosting ideas! 👇")
-    col1, col2, col3 = st.columns(3)
     question = None
-    if col1.button("🧠 Top Study Foods"):
-        question = json.dumps({
-            "cypher": """
-            MATCH (i:Ingredient)
-            WHERE i.study_food = true
-            WITH i
-            MATCH (:Dish)-[:USES]->(i)
-            RETURN i.name AS Ingredient, COUNT(*) AS Uses
-            ORDER BY Uses DESC
-            LIMIT 10
-            """,
-            "chart": "bar"
-        })
-    
-    if col2.button("🍽️ Study Cuisines"):
-        question = json.dumps({
-            "cypher": """
-            MATCH (i:Ingredient)
-            WHERE i.study_food = true
-            WITH i
-            MATCH (c:Cuisine)-[:HAS_DISH]->(:Dish)-[:USES]->(i)
-            RETURN c.name AS Cuisine, COUNT(DISTINCT i.name) AS StudyIngredientCount
-            ORDER BY StudyIngredientCount DESC
-            LIMIT 5
-            """,
-            "chart": "bar"
-        })
-    
-    if col3.button("🌍 Study Regions"):
-        question = json.dumps({
-            "cypher": """
-            MATCH (i:Ingredient)
-            WHERE i.study_food = true
-            WITH i
-            MATCH (c:Cuisine)-[:HAS_DISH]->(:Dish)-[:USES]->(i)
-            MATCH (r:Region)-[:HAS_CUISINE]->(c)
-            RETURN r.name AS Region, COUNT(DISTINCT i.name) AS StudyIngredientCount
-            ORDER BY StudyIngredientCount DESC
-            LIMIT 5
-            """,
-            "chart": "bar"
-        })
+    for col, (label, preset) in zip(st.columns(len(PRESET_QUERIES)), PRESET_QUERIES.items()):
+        if col.button(label):
+            question = json.dumps(preset)
 
     user_question = st.text_input("Ask a question here:")
+
+    # Conversation memory lives in this browser session only
+    memory = st.session_state.setdefault("cook_e_memory", ChatMemory())
+    if memory.turns or memory.summary:
+        with st.expander(f"🧾 This chat so far ({len(memory.summary) + len(memory.turns)} questions)"):
+            for line in memory.summary:
+                st.caption(line)
+            for turn in memory.turns:
+                st.caption(f"- {turn['question']} {turn['note']}")
+            if st.button("🧹 Start a new chat"):
+                memory.clear()
     hint_box = st.empty() 
     if question is None and user_question: question = user_question
 
-    # TP CUISINE LOCATION INTERCEPT
-    def find_tp_cuisine_hits(text):
-        text = text.lower()
-        cuisine_keywords = {
-            "chinese": ["chinese", "chicken rice", "ban mian", "mala", "bee hoon", "koka"],
-            "japanese": ["japanese", "donburi", "rice bowl"],
-            "italian": ["italian", "pasta"],
-            "thai": ["thai", "tom yum"],
-            "korean": ["korean"],
-            "indian": ["indian", "briyani", "biryani", "prata"],
-        }
-        hits = []
-        for cuisine, words in cuisine_keywords.items():
-            for w in words:
-                if w in text:
-                    hits.append(cuisine)
-                    break
-        return list(dict.fromkeys(hits))
-    
-    
-    TP_CUISINE_LOCATIONS = {
-        "chinese": [
-            "🍗 Chicken Rice — The Flavours (BLK 4, IIT, Level 2)",
-            "🍜 Ban Mian & Fish Soup — The Flavours (BLK 4, IIT, Level 2)",
-            "🍛 A Tangerine Wok — Sprout Canteen (BLK 1A, HSS, Level 2)",
-            "🍗 Chicken Rice — The Business Park (BLK 26, Business, Level 1)",
-            "🥘 Mini Wok — The Business Park (BLK 26, Business, Level 1)",
-            "🍜 Koka Noodles — The Business Park (BLK 26, Business, Level 1)",
-            "🍗 Roasted Delight — Short Circuit (BLK 17, Engineering, Level 1)",
-            "🍜 Ban Mian & Fish Soup — Short Circuit (BLK 17, Engineering, Level 1)",
-            "🍚 Mixed Veg Rice & Bee Hoon — Breadboard (BLK 25, Engineering, Level 1)",
-            "🍗 Chicken Rice — Breadboard (BLK 25, Engineering, Level 1)",
-        ],
-        "japanese": [
-            "🍱 Japanese Rice Bowl — The Flavours (BLK 4, IIT, Level 2)",
-            "🍣 Japanese — The Designer Pad (BLK 28, Design, Level 1)",
-        ],
-        "italian": [
-            "🍝 Italian Cuisine — The Flavours (BLK 4, IIT, Level 2)",
-        ],
-        "thai": [
-            "🍲 Thai — The Business Park (BLK 26, Business, Level 1)",
-            "🔥 Thai Cuisine — Breadboard (BLK 25, Engineering, Level 1)",
-        ],
-        "korean": [
-            "🍗 Fried Chicken — The Business Park (BLK 26, Business, Level 1)",
-            "🍱 Korean — Short Circuit (BLK 17, Engineering, Level 1)",
-            "🍱 Korean Cuisine — Breadboard (BLK 25, Engineering, Level 1)",
-        ],
-        "indian": [
-            "🍛 Indian Muslim — The Business Park (BLK 26, Business, Level 1)",
-            "🍛 Indian Cuisine — Breadboard (BLK 25, Engineering, Level 1)",
-        ],
-    }
-    
+    # TP CUISINE LOCATION INTERCEPT (one keyword pattern, loaded once per process)
+    tp_index = load_tp_index()
+
     tp_hint_text = ""
 
     if isinstance(question, str) and question.strip() and not question.strip().startswith("{"):
-        cuisine_hits = find_tp_cuisine_hits(question)
+        cuisine_hits = tp_index.find_cuisines(question)
         if cuisine_hits:
             c = cuisine_hits[0]
             locations = "<br>".join([
-                f" {loc}" for loc in TP_CUISINE_LOCATIONS.get(c, [])
+                f" {loc}" for loc in tp_index.locations_for(c)
             ])
             tp_hint_text = f"<br><br>💡 Did you know? We have {c.title()} cuisine at TP:<br>{locations}"
 
@@ -435,25 +496,35 @@ def main():
                 chart_type = preset.get("chart", "table")
 
                 st.code(cypher_query, language="cypher")
-                results = run_query(cypher_query)
-
-                if results:
-                    df = pd.DataFrame(results)
-                    if chart_type == "bar" and len(df.columns) >= 2:
-                        fig = px.bar(df, x=df.columns[0], y=df.columns[1], color=df.columns[0])
-                        st.plotly_chart(fig, use_container_width=True)
-                    elif chart_type == "pie":
-                        fig = px.pie(df, names=df.columns[0], values=df.columns[1])
-                        st.plotly_chart(fig, use_container_width=True)
-                    else:
-                        st.table(df)
+                df = run_query_df(cypher_query)
+
+                if not df.empty:
+                    render_result(df, chart_type, palette=px.colors.qualitative.Plotly)
+                    show_insight(df)
                 else:
                     st.warning("No matching data found.")
 
                 st.stop()
         except:
             pass 
+
+        # 2. Brand / similar-dish questions are answered from local indexes (no GPT, no traversal)
+        local = local_answer(question)
+        if local:
+            title, df, chart_type = local
+            st.subheader(title)
+            if df.empty:
+                st.warning("No matching data found.")
+            else:
+                render_result(df, chart_type)
+            if memory.find(question) is None:
+                memory.add(question, json.dumps({"text": title}, ensure_ascii=False), df)
+            st.stop()
             
+        # 3. Already answered in this chat (or Streamlit re-ran the same input)? Reuse it, no LLM call.
+        history = memory.messages()
+        repeat = memory.find(question)
+
         bot_name = "Cook-E 👨‍🍳🍪"
         messages = [
             f"{bot_name}: Stirring up some tasty insights just for you... 🍲",
@@ -463,78 +534,42 @@ def main():
             f"{bot_name}: Preheating the analytics oven... 🔥",
             f"{bot_name}: Mixing a fresh batch of data cookies... 🍪"
         ]
-        st.markdown(f"""
-        <div style="background:linear-gradient(135deg,#ff8c68,#ff4b2b);color:white;padding:22px;
-        border-radius:15px;font-size:22px;font-weight:600;text-align:center;
-        box-shadow:0 0 20px rgba(255,120,90,0.5);margin-top:10px;">{random.choice(messages)}</div>
-        """, unsafe_allow_html=True)
+        if repeat is None:
+            st.markdown(f"""
+            <div style="background:linear-gradient(135deg,#ff8c68,#ff4b2b);color:white;padding:22px;
+            border-radius:15px;font-size:22px;font-weight:600;text-align:center;
+            box-shadow:0 0 20px rgba(255,120,90,0.5);margin-top:10px;">{random.choice(messages)}</div>
+            """, unsafe_allow_html=True)
+
+            wait = llm_limiter.estimate_wait(estimate_tokens(SYSTEM_PROMPT, question, history))
+            if wait >= 2:
+                st.info(f"⏳ Lots of hungry visitors right now — Cook-E should reply in about {wait:.0f}s.")
 
         try:
-            response = client.chat.completions.create(
-                model="gpt-4.1",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": question},
-                ]
-            )
-
-            raw_output = response.choices[0].message.content.strip()
+            if repeat is not None:
+                raw_output = repeat["answer"]
+            else:
+                try:
+                    raw_output = ask_cook_e(client, SYSTEM_PROMPT, question, history)
+                except (QueueFull, RateLimitError):
+                    st.warning("🥵 Cook-E's kitchen is packed! Here's a ready-made answer while the queue clears.")
+                    raw_output = busy_fallback(SYSTEM_PROMPT, question, history)
+
             try:
                 ai_output = json.loads(raw_output)
             except json.JSONDecodeError:
                 ai_output = {"text": raw_output}
 
+            # Earlier result picked by reference (repeat question, or {"ref": "R2"} from the model)
+            reused_df = memory.result(repeat["ref"] if repeat is not None else ai_output.get("ref"))
+
             # === TEXT OUTPUT ===
             if "text" in ai_output:
                 insight = ai_output["text"]
 
-                # Context-aware TP analogies (multi-line)
-                tp_analogies = {
-                    "italian": [
-                        "🍝 Italian cuisine is full of creativity — like TP’s Design School sia!",
-                        "🎨 Italian food got flair and color — TP Design School confirm love this one!"
-                    ],
-                    "japanese": [
-                        "🍣 Japanese cuisine is precise and balanced — just like our Engineering School students!",
-                        "🔧 So meticulous sia — feels like something our Engineering students would master!"
-                    ],
-                    "indian": [
-                        "🌶️ Indian food packs strong flavours, just like the energy at TP’s Business School!",
-                        "💼 Wah, the spice level steady lah — Business School students sure can handle it!"
-                    ],
-                    "french": [
-                        "🥐 French cuisine is refined — like TP’s Applied Science students mastering precision!",
-                        "🧪 French dishes are elegant and scientific — TP Applied Science vibes confirmed!"
-                    ],
-                    "thai": [
-                        "🍲 Thai cuisine mixes sweet, sour, and spicy — like the lively mix of cultures around TP’s campus!",
-                        "🔥 Sweet, spicy, tangy — just like TP’s vibrant student life leh!"
-                    ],
-                    "korean": [
-                        "🍱 Korean cuisine is trendy and bold — just like the students at TP’s IT School leh!",
-                        "💻 Korean food got that modern touch — very IT School energy sia!"
-                    ],
-                    "chinese": [
-                        "🥢 Chinese cuisine blends tradition and innovation — just like TP’s multidisciplinary learning!",
-                        "📚 Traditional yet modern — same same like TP’s learning style!"
-                    ],
-                    "western": [
-                        "🍔 Western food has that easy-going energy — just like TP’s Engineering and IT students tackling projects with style!",
-                        "🍟 Western cuisine? Confirm a hit near Design School’s café — chill and satisfying vibes!"
-                    ]
-                }
-
-                lower_text = insight.lower()
-                matched_cuisine = next((c for c in tp_analogies if c in lower_text), None)
-
-                if matched_cuisine:
-                    insight += f"<br><br>{random.choice(tp_analogies[matched_cuisine])}"
-                elif random.random() < 0.2:
-                    generic_lines = [
-                        "🍜 TP’s campus got flavours from all over the world — just like this dataset!",
-                        "🍪 That’s one more tasty insight cooked up by TP’s own Cook-E!"
-                    ]
-                    insight += f"<br><br>{random.choice(generic_lines)}"
+                flavour = tp_flavour(insight)
+                if flavour:
+                    insight += f"<br><br>{flavour}"
 
                 st.markdown(f"""
                 <div style="background:linear-gradient(135deg,#00b4d8,#0077b6);padding:30px;
@@ -547,6 +582,9 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
 
+                if repeat is None:
+                    memory.add(question, compact_answer(ai_output))
+
             # CHART OUTPUT
             else:
                 cypher_query = ai_output.get("cypher", "").strip()
@@ -561,29 +599,26 @@ def main():
                     🍜 Ask me something about cuisines, ingredients, or dishes! 🌶️🍕🍣</div>
                     """, unsafe_allow_html=True)
                 else:
-                    import re
-                    cypher_query = re.sub(r":'([A-Z][a-z]+)'", lambda m: f":'{m.group(1).lower()}'", cypher_query)
-
-                    st.code(cypher_query, language="cypher")
-                    results = run_query(cypher_query)
-                    if results:
-                        df = pd.DataFrame(results)
-                        if chart_type == "bar" and len(df.columns) >= 2:
-                            fig = px.bar(df, x=df.columns[0], y=df.columns[1], color=df.columns[0],
-                                        title=f"📊 {question.title()}",
-                                        color_discrete_sequence=px.colors.qualitative.Vivid)
-                            st.plotly_chart(fig, use_container_width=True)
-                        elif chart_type == "pie" and len(df.columns) >= 2:
-                            fig = px.pie(df, names=df.columns[0], values=df.columns[1],
-                                        title=f"🥧 {question.title()}",
-                                        color_discrete_sequence=px.colors.qualitative.Bold)
-                            st.plotly_chart(fig, use_container_width=True)
-                        elif chart_type == "line" and len(df.columns) >= 2:
-                            fig = px.line(df, x=df.columns[0], y=df.columns[1],
-                                        title=f"📈 {question.title()}", markers=True)
-                            st.plotly_chart(fig, use_container_width=True)
-                        else:
-                            st.table(df)
+                    if reused_df is not None:
+                        df = reused_df
+                        st.caption("♻️ Reusing an earlier result from this chat")
+                    elif cypher_query:
+                        cypher_query = clean_cypher(cypher_query)
+
+                        st.code(cypher_query, language="cypher")
+                        # One extra row tells a capped result from one that's exactly LLM_MAX_ROWS long
+                        df = run_query_df(cypher_query, max_rows=LLM_MAX_ROWS + 1)
+                        if len(df) > LLM_MAX_ROWS:
+                            df = df.head(LLM_MAX_ROWS)
+                            st.caption(f"✂️ Showing the first {LLM_MAX_ROWS} rows — ask for a LIMIT or a narrower question to see the rest")
+                    else:
+                        df = pd.DataFrame()
+                    if repeat is None:
+                        memory.add(question, compact_answer(ai_output), df)
+                    if not df.empty:
+                        # Picks single-trace bars / top-N + Other / WebGL / st.dataframe by result size
+                        render_result(df, chart_type, title=question.title())
+                        show_insight(df)
                     else:
                         st.warning("No matching data found.")
 
@@ -0,0 +1,235 @@
+"""Pre-rendered top half of the mobile dashboard, built once per graph version.
+
+    python dashboard_snapshot.py
+
+The KPIs, top-10 ingredients, region pie, cuisine bars, top dishes and brand bars are
+the same for every visitor, so they're rendered once into
+artifacts/snapshots/dashboard_v<version>.json (figure JSON, what the app serves) and
+dashboard_v<version>.html (a standalone page any static file server can hand out).
+"""
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+import streamlit as st
+
+import flavor_queries as fq
+from brand_index import get_brand_index
+from graph_store import graph_version, run_query_df
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+SNAPSHOT_DIR = os.path.join(ARTIFACT_DIR, "snapshots")
+# Older versions kept on disk (workers still on the previous version can keep serving)
+KEEP_VERSIONS = 2
+
+BAR_COLORS = px.colors.qualitative.Vivid + px.colors.qualitative.Pastel + px.colors.qualitative.Bold
+# Match NeoDash dark theme
+DARK = dict(margin=dict(t=10, b=50, l=50, r=20), plot_bgcolor="#0e1117", paper_bgcolor="#0e1117",
+            font_color="white", title="")
+
+FIGURE_NAMES = ["ingredients", "regions", "cuisines", "brands"]
+
+_loaded = {"path": None, "mtime": None, "snapshot": None}
+_load_lock = threading.Lock()
+
+
+def fig_ingredients(df):
+    # Bar chart with unique colors per bar
+    fig = px.bar(df, x="Ingredient", y="Uses", title="Top 10 Brain-Boosting Ingredients",
+                 color="Ingredient", color_discrete_sequence=BAR_COLORS[:len(df)])
+    fig.update_layout(**DARK, xaxis_title="Ingredient", yaxis_title="Uses", showlegend=False)
+    return fig
+
+
+def fig_regions(df):
+    fig = px.pie(df, names="Region", values="TotalStudyFoods", title="Regions Full of Focus-Enhancing Foods",
+                 color_discrete_sequence=px.colors.qualitative.Vivid)
+    # Improve label sharpness + font clarity
+    fig.update_traces(textinfo="percent+label", textfont_size=18, textfont_color="white",
+                      pull=[0.03] * len(df))
+    fig.update_layout(**DARK, showlegend=True, legend_font_size=16, legend_title_text="", title_font_size=22)
+    return fig
+
+
+def fig_cuisines(df):
+    fig = px.bar(df, x="Cuisine", y="StudyFoods", title="Cuisines Packed with Focus-Boosting Ingredients",
+                 color="Cuisine", color_discrete_sequence=BAR_COLORS[:len(df)])
+    fig.update_layout(**DARK, xaxis_title="Cuisine", yaxis_title="Number of Study Ingredients", showlegend=False)
+    return fig
+
+
+def fig_brands(df):
+    fig = px.bar(df, x="Brand", y="StudyFoods", title="Top Brands by Study-Food Coverage",
+                 color="Brand", color_discrete_sequence=BAR_COLORS[:len(df)],
+                 hover_data=["Ingredients", "Cuisines"])
+    fig.update_layout(**DARK, xaxis_title="Brand", yaxis_title="Study-Food Ingredients", showlegend=False)
+    return fig
+
+
+def build_snapshot(refresh=False):
+    # Live build from the (cached) dashboard queries -> {"version", "kpi", "figures", "top_dishes"}
+    version = graph_version()
+    kpi = run_query_df(fq.kpi_query, refresh=refresh)
+    frames = {
+        "ingredients": run_query_df(fq.q_ingredients, refresh=refresh),
+        "regions": run_query_df(fq.q_regions, refresh=refresh),
+        "cuisines": run_query_df(fq.q_cuisines, refresh=refresh),
+        "brands": get_brand_index(refresh=refresh).top_brands(10),
+    }
+    builders = {"ingredients": fig_ingredients, "regions": fig_regions,
+                "cuisines": fig_cuisines, "brands": fig_brands}
+    return {
+        "version": version,
+        "built_at": time.time(),
+        "kpi": {k: int(v) for k, v in kpi.iloc[0].items()} if not kpi.empty else None,
+        "figures": {name: builders[name](df) if not df.empty else None for name, df in frames.items()},
+        "top_dishes": run_query_df(fq.q_top_dishes, refresh=refresh),
+    }
+
+
+def snapshot_path(version, ext="json"):
+    return os.path.join(SNAPSHOT_DIR, f"dashboard_v{version}.{ext}")
+
+
+def _html(snapshot):
+    parts = [
+        "<!doctype html><html><head><meta charset='utf-8'>",
+        "<meta name='viewport' content='width=device-width, initial-scale=1'>",
+        "<title>Map of Flavors</title>",
+        "<style>body{background:#0e1117;color:white;font-family:sans-serif;margin:1rem}"
+        "table{border-collapse:collapse;width:100%}td,th{border:1px solid #374151;padding:6px}"
+        ".kpi{display:inline-block;margin:0 2rem 1rem 0;font-size:1.4rem}</style></head><body>",
+        "<h2>🌍 Global Dataset Summary</h2>",
+    ]
+    kpi = snapshot["kpi"]
+    if kpi:
+        pct = round(kpi["study_ingredients"] * 100.0 / max(kpi["ingredients"], 1), 1)
+        for label, value in [("Total Cuisines", f"🌎 {kpi['cuisines']}"), ("Total Dishes", f"🍽️ {kpi['dishes']}"),
+                             ("Total Ingredients", f"🥦 {kpi['ingredients']}"),
+                             ("Study-Food Ingredients", f"🧠 {kpi['study_ingredients']} ({pct}%)")]:
+            parts.append(f"<div class='kpi'><small>{label}</small><br>{value}</div>")
+    plotlyjs = "cdn"
+    for name in FIGURE_NAMES:
+        fig = snapshot["figures"].get(name)
+        if fig is not None:
+            parts.append(fig.to_html(full_html=False, include_plotlyjs=plotlyjs))
+            plotlyjs = False
+    if not snapshot["top_dishes"].empty:
+        parts.append("<h3>🧠🥗 Top Dishes Packed With Study-Boosting Ingredients</h3>")
+        parts.append(snapshot["top_dishes"].to_html(index=False))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def save_snapshot(snapshot):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    version = snapshot["version"]
+    payload = {
+        "version": version,
+        "built_at": snapshot["built_at"],
+        "kpi": snapshot["kpi"],
+        "figures": {k: (pio.to_json(f) if f is not None else None) for k, f in snapshot["figures"].items()},
+        "top_dishes": snapshot["top_dishes"].to_dict("split", index=False),
+    }
+    # Write-then-rename so a worker never reads half a file
+    for ext, text in (("json", json.dumps(payload)), ("html", _html(snapshot))):
+        tmp = snapshot_path(version, ext) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, snapshot_path(version, ext))
+
+    versions = sorted({int(n.split("_v")[1].split(".")[0]) for n in os.listdir(SNAPSHOT_DIR)
+                       if n.startswith("dashboard_v") and not n.endswith(".tmp")})
+    for old in versions[:-KEEP_VERSIONS]:
+        for ext in ("json", "html"):
+            try:
+                os.remove(snapshot_path(old, ext))
+            except OSError:
+                pass
+    return snapshot_path(version, "json")
+
+
+def load_snapshot(version=None):
+    # Snapshot for the current graph version, or None (caller falls back to a live build)
+    path = snapshot_path(graph_version() if version is None else version)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _load_lock:
+        if (_loaded["path"], _loaded["mtime"]) != (path, mtime):
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+            split = payload["top_dishes"]
+            _loaded["snapshot"] = {
+                "version": payload["version"],
+                "built_at": payload["built_at"],
+                "kpi": payload["kpi"],
+                "figures": {k: (pio.from_json(v) if v else None) for k, v in payload["figures"].items()},
+                "top_dishes": pd.DataFrame(split["data"], columns=split["columns"]),
+            }
+            _loaded["path"], _loaded["mtime"] = path, mtime
+        return _loaded["snapshot"]
+
+
+def ensure_snapshot():
+    # Build + save if the current graph version has none yet; used by the cache warmer
+    if os.path.exists(snapshot_path(graph_version())):
+        return None
+    return save_snapshot(build_snapshot())
+
+
+def _chart(fig, empty_text):
+    if fig is not None:
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info(empty_text)
+
+
+def render_top_panels(snapshot):
+    # 🌍 Global Dataset Summary
+    st.subheader("🌍 Global Dataset Summary")
+    kpi = snapshot["kpi"]
+    if kpi:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Total Cuisines", f"🌎 {kpi['cuisines']}")
+        col2.metric("Total Dishes", f"🍽️ {kpi['dishes']}")
+        col3.metric("Total Ingredients", f"🥦 {kpi['ingredients']}")
+        percent_study = round(kpi["study_ingredients"] * 100.0 / max(kpi["ingredients"], 1), 1)
+        col4.metric("Study-Food Ingredients", f"🧠 {kpi['study_ingredients']} ({percent_study}%)")
+
+    st.markdown("---")
+
+    figures = snapshot["figures"]
+    st.subheader("🧠🍳Top 10 Ingredients That Help You Study Better")
+    _chart(figures.get("ingredients"), "No study ingredients found in the data.")
+
+    st.subheader("🗺️🥬 Regions Full of Focus-Enhancing Dishes!")
+    _chart(figures.get("regions"), "No region data found.")
+
+    st.subheader("🍱🌍 Cuisines Packed With Brain-Boosting Foods!")
+    _chart(figures.get("cuisines"), "No cuisine data found.")
+
+    st.subheader("🧠🥗 Top Dishes Packed With Study-Boosting Ingredients")
+    if not snapshot["top_dishes"].empty:
+        st.table(snapshot["top_dishes"])
+    else:
+        st.info("No dish data found.")
+
+    # Brands behind the study foods (precomputed brand index, no traversal per view)
+    st.subheader("🏷️🧠 Brands Behind the Brain Food")
+    _chart(figures.get("brands"), "No brand data found.")
+
+
+def main():
+    start = time.perf_counter()
+    path = save_snapshot(build_snapshot(refresh=True))
+    print(f"Dashboard snapshot -> {path} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Offline "dishes like this one" embeddings + a small ANN index over them.
+
+    python dish_similarity.py --dims 64
+
+Builds TF-IDF weighted dish × ingredient vectors, reduces them with a randomized
+truncated SVD (plain numpy) and saves float32 vectors to artifacts/dish_vectors.npz.
+The app loads that file once and answers top-k similar dishes across cuisines.
+"""
+import argparse
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import flavor_queries as fq
+from brand_index import name_pattern
+from graph_store import is_current_version
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+VECTORS_PATH = os.path.join(ARTIFACT_DIR, "dish_vectors.npz")
+
+DIMS = 64
+# Below this many dishes a full matrix-vector product is already a few ms, so skip LSH
+BRUTE_FORCE_MAX = 50_000
+# Random-hyperplane LSH: more tables = better recall, more bits = smaller buckets
+LSH_TABLES = 8
+LSH_BITS = 14
+
+# Phrases, not bare "like": "what's in a dish like laksa" is a question for the LLM
+SIMILAR_WORDS = re.compile(r"\b(similar to|similar dishes|dishes like|alternatives? to)\b")
+
+_loaded = {"mtime": None, "index": None}
+_load_lock = threading.Lock()
+
+
+def spmm(rows, cols, vals, dense, n_out):
+    # (sparse COO) @ dense without scipy: one bincount per output column
+    out = np.empty((n_out, dense.shape[1]))
+    for j in range(dense.shape[1]):
+        out[:, j] = np.bincount(rows, weights=vals * dense[cols, j], minlength=n_out)
+    return out
+
+
+def tfidf(rows, cols, n_rows, n_cols):
+    # Binary tf × smoothed idf, rows L2-normalised
+    df = np.bincount(cols, minlength=n_cols)
+    vals = (np.log((1 + n_rows) / (1 + df)) + 1)[cols]
+    norms = np.sqrt(np.bincount(rows, weights=vals ** 2, minlength=n_rows))
+    return vals / norms[rows]
+
+
+def truncated_svd(rows, cols, vals, shape, k, n_iter=4, seed=0):
+    # Randomized range finder (Halko et al.) using only sparse products
+    n, m = shape
+    k = max(1, min(k, n, m))
+    p = min(k + 10, n, m)
+    rng = np.random.default_rng(seed)
+
+    q = spmm(rows, cols, vals, rng.standard_normal((m, p)), n)
+    for _ in range(n_iter):
+        q, _ = np.linalg.qr(q)
+        q = spmm(rows, cols, vals, spmm(cols, rows, vals, q, m), n)
+    q, _ = np.linalg.qr(q)
+
+    b = spmm(cols, rows, vals, q, m).T
+    ub, s, _ = np.linalg.svd(b, full_matrices=False)
+    return (q @ ub)[:, :k], s[:k]
+
+
+def embed(pairs, dims=DIMS):
+    # pairs: Dish, Cuisine, Ingredient -> (float32 unit vectors, dish names, cuisines), one row per
+    # (Dish, Cuisine): same-named dishes in two cuisines are two dishes with their own ingredients
+    pairs = pairs.dropna(subset=["Dish", "Ingredient"])
+    pairs = pairs.assign(Cuisine=pairs["Cuisine"].fillna("").astype(str))
+    pairs = pairs.drop_duplicates(["Dish", "Cuisine", "Ingredient"])
+    dish_codes, keys = pd.factorize(pd.MultiIndex.from_frame(pairs[["Dish", "Cuisine"]]))
+    ing_codes, ingredients = pd.factorize(pairs["Ingredient"])
+    dishes, cuisines = list(keys.get_level_values(0)), list(keys.get_level_values(1))
+
+    vals = tfidf(dish_codes, ing_codes, len(dishes), len(ingredients))
+    u, s = truncated_svd(dish_codes, ing_codes, vals, (len(dishes), len(ingredients)), dims)
+    vectors = (u * s).astype(np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors, dishes, cuisines
+
+
+class DishSimilarity:
+    def __init__(self, vectors, dishes, cuisines, version=None, seed=0):
+        self.vectors = vectors
+        self.dishes = list(dishes)
+        self.cuisines = list(cuisines)
+        self.version = version
+        # (dish, cuisine) -> row, and dish name -> its rows (one per cuisine that has it)
+        self._pos = {(d.lower(), str(c).lower()): i for i, (d, c) in enumerate(zip(self.dishes, self.cuisines))}
+        self._rows = {}
+        for i, d in enumerate(self.dishes):
+            self._rows.setdefault(d.lower(), []).append(i)
+        self._pattern = None
+        self._tables = None
+        if len(self.dishes) > BRUTE_FORCE_MAX:
+            self._build_lsh(seed)
+
+    def _build_lsh(self, seed):
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((LSH_TABLES, LSH_BITS, self.vectors.shape[1])).astype(np.float32)
+        weights = 1 << np.arange(LSH_BITS, dtype=np.int64)
+        self._tables = []
+        for planes in self._planes:
+            codes = ((self.vectors @ planes.T) > 0).astype(np.int64) @ weights
+            order = np.argsort(codes, kind="stable")
+            keys, starts = np.unique(codes[order], return_index=True)
+            buckets = np.split(order, starts[1:])
+            self._tables.append(dict(zip(keys.tolist(), buckets)))
+        self._weights = weights
+
+    def _candidates(self, vec):
+        if self._tables is None:
+            return None
+        found = [
+            table.get(int(((planes @ vec) > 0).astype(np.int64) @ self._weights))
+            for planes, table in zip(self._planes, self._tables)
+        ]
+        found = [f for f in found if f is not None]
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def _row(self, dish, cuisine=None):
+        # Row for (dish, cuisine); without a cuisine, the dish name's first one
+        if cuisine is not None:
+            return self._pos.get((str(dish).lower(), str(cuisine).lower()))
+        rows = self._rows.get(str(dish).lower())
+        return rows[0] if rows else None
+
+    def similar(self, dish, k=10, cuisine=None):
+        i = self._row(dish, cuisine)
+        if i is None:
+            return pd.DataFrame(columns=["Dish", "Cuisine", "Similarity"])
+
+        vec = self.vectors[i]
+        cand = self._candidates(vec)
+        scores = self.vectors @ vec if cand is None else self.vectors[cand] @ vec
+        ids = np.arange(len(self.dishes)) if cand is None else cand
+
+        keep = ids != i
+        ids, scores = ids[keep], scores[keep]
+        k = min(k, len(scores))
+        if k == 0:
+            return pd.DataFrame(columns=["Dish", "Cuisine", "Similarity"])
+        part = np.argpartition(-scores, k - 1)[:k]
+        best = part[np.argsort(-scores[part])]
+        return pd.DataFrame({
+            "Dish": [self.dishes[j] for j in ids[best]],
+            "Cuisine": [self.cuisines[j] for j in ids[best]],
+            "Similarity": np.round(scores[best].astype(float), 3),
+        })
+
+    def dishes_in(self, cuisine):
+        c = str(cuisine).lower()
+        return sorted(d for d, dc in zip(self.dishes, self.cuisines) if str(dc).lower() == c)
+
+    def find_dish(self, text):
+        # -> (dish, cuisine) or None; a name several cuisines share takes the one the text mentions
+        if self._pattern is None:
+            self._pattern = name_pattern(self._rows)
+        text = text.lower()
+        m = self._pattern.search(text) if self._pattern else None
+        if m is None:
+            return None
+        rows = self._rows[m.group(1)]
+        mentioned = [i for i in rows
+                     if self.cuisines[i] and re.search(rf"\b{re.escape(str(self.cuisines[i]).lower())}\b", text)]
+        i = (mentioned or rows)[0]
+        return self.dishes[i], self.cuisines[i]
+
+    def answer(self, question):
+        # Cook-E intent: "dishes similar to X" / "alternatives to X" -> (title, DataFrame, chart)
+        if not SIMILAR_WORDS.search(question.lower()):
+            return None
+        found = self.find_dish(question)
+        if found is None:
+            return None
+        dish, cuisine = found
+        title = f"🔁 Dishes like {dish}"
+        if len(self._rows[dish.lower()]) > 1:
+            title += f" ({str(cuisine).title()})"
+        return title, self.similar(dish, k=8, cuisine=cuisine), "table"
+
+
+def save(path, vectors, dishes, cuisines, version):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, vectors=vectors, dishes=np.array(dishes, dtype=str),
+                        cuisines=np.array(cuisines, dtype=str), version=np.array(version))
+
+
+def load_similarity(path=VECTORS_PATH):
+    # Loaded once per process; reloaded when the offline job rewrites the file.
+    # None if there's no file, or it was built before the last ingest.
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _load_lock:
+        if _loaded["mtime"] != mtime:
+            data = np.load(path)
+            _loaded["index"] = DishSimilarity(
+                data["vectors"], data["dishes"].tolist(), data["cuisines"].tolist(), int(data["version"])
+            )
+            _loaded["mtime"] = mtime
+        index = _loaded["index"]
+    return index if is_current_version(index.version) else None
+
+
+def main():
+    from graph_store import fetch_df, graph_version
+
+    parser = argparse.ArgumentParser(description="Build artifacts/dish_vectors.npz for similar-dish lookups.")
+    parser.add_argument("--dims", type=int, default=DIMS)
+    parser.add_argument("--out", default=VECTORS_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pairs = fetch_df(fq.q_dish_ingredients)
+    vectors, dishes, cuisines = embed(pairs, args.dims)
+    save(args.out, vectors, dishes, cuisines, graph_version())
+    print(f"{len(dishes):,} dishes x {vectors.shape[1]} dims -> {args.out} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+# Named Cypher for the mobile dashboard and Cook-E's preset buttons.
+# Kept in one place so the app, the cache warmer and the offline scripts run the exact same text.
+
+# 🌍 Global dataset summary + top-10 panels
+# Label counts come straight from Neo4j's count store (each CALL is a NodeCountFromCountStore,
+# no scan), and the study-food total is the counter ingest keeps on the Meta node. Graphs
+# loaded before that counter existed fall back to counting through the study_food index.
+kpi_query = """
+CALL { MATCH (c:Cuisine) RETURN count(c) AS cuisines }
+CALL { MATCH (d:Dish) RETURN count(d) AS dishes }
+CALL { MATCH (i:Ingredient) RETURN count(i) AS ingredients }
+OPTIONAL MATCH (m:Meta {key: 'graph'})
+RETURN cuisines, dishes, ingredients,
+       CASE WHEN m.study_ingredients IS NULL
+            THEN COUNT { MATCH (i2:Ingredient) WHERE i2.study_food = true }
+            ELSE m.study_ingredients
+       END AS study_ingredients
+"""
+
+q_ingredients = """
+MATCH (i:Ingredient)
+WHERE i.study_food = true
+MATCH (:Dish)-[:USES]->(i)
+RETURN i.name AS Ingredient, COUNT(*) AS Uses
+ORDER BY Uses DESC
+LIMIT 10
+"""
+
+q_regions = """
+MATCH (r:Region)-[:HAS_CUISINE]->(c:Cuisine)-[:HAS_DISH]->(:Dish)-[:USES]->(i:Ingredient)
+WHERE i.study_food = true
+RETURN r.name AS Region, COUNT(DISTINCT i.name) AS TotalStudyFoods
+ORDER BY TotalStudyFoods DESC
+"""
+
+q_cuisines = """
+MATCH (c:Cuisine)-[:HAS_DISH]->(:Dish)-[:USES]->(i:Ingredient)
+WHERE i.study_food = true
+RETURN c.name AS Cuisine, COUNT(DISTINCT i.name) AS StudyFoods
+ORDER BY StudyFoods DESC
+LIMIT 10
+"""
+
+q_top_dishes = """
+MATCH (d:Dish)-[:USES]->(i:Ingredient {study_food: true})
+WITH d, COUNT(DISTINCT i) AS StudyFriendlyIngredients
+MATCH (d)<-[:HAS_DISH]-(c:Cuisine)
+RETURN d.name AS Dish, c.name AS Cuisine, StudyFriendlyIngredients
+ORDER BY StudyFriendlyIngredients DESC, Dish ASC
+LIMIT 10
+"""
+
+# 💥 Ingredient section ($ingredients = picked ingredient names)
+ing_list_q = """
+MATCH (i:Ingredient)
+RETURN DISTINCT i.name AS Ingredient
+ORDER BY Ingredient
+"""
+
+q_ing_summary = """
+WITH $ingredients AS selectedIngredients
+
+// Step 1: Get ingredient nodes
+MATCH (i:Ingredient)
+WHERE i.name IN selectedIngredients
+WITH collect(i) AS ing_list, selectedIngredients AS ing_names
+
+// Step 2: Count cuisines using these ingredients
+MATCH (c:Cuisine)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
+WHERE i IN ing_list
+WITH ing_list, ing_names, count(DISTINCT c) AS total_cuisines
+
+// Step 3: Count dishes using ingredients
+MATCH (d:Dish)-[:USES]->(i:Ingredient)
+WHERE i IN ing_list
+WITH ing_list, ing_names, total_cuisines,
+     count(DISTINCT d) AS total_dishes
+
+// Step 4: Percent study ingredients
+WITH ing_list, ing_names, total_cuisines, total_dishes,
+     size(ing_list) AS total_selected,
+     size([x IN ing_list WHERE x.study_food = true]) AS total_study_foods
+
+RETURN
+  ing_names AS Selected_Ingredients,
+  total_cuisines AS Total_Cuisines,
+  total_dishes AS Total_Dishes,
+  CASE WHEN total_selected = 0
+       THEN 0.0
+       ELSE ROUND((total_study_foods * 100.0 / total_selected), 1)
+  END AS Percent_Study_Ingredients
+"""
+
+q_ing_cui = """
+WITH $ingredients AS ingredients
+
+MATCH (i:Ingredient)
+WHERE i.name IN ingredients
+
+MATCH (c:Cuisine)-[:HAS_DISH]->(d:Dish)-[:USES]->(i)
+RETURN c.name AS Cuisine,
+       COUNT(*) AS ingredient_usage
+ORDER BY ingredient_usage DESC
+"""
+
+# ORDER BY rand(): q_net and q_cui_net return a new sample every run, so they are
+# fetched with ttl=0 and left out of the warmer and prefetcher
+q_net = """
+MATCH (i:Ingredient)<-[:USES]-(d:Dish)<-[:HAS_DISH]-(c:Cuisine)
+WHERE i.name IN $ingredients
+WITH i, d, c
+ORDER BY rand()
+LIMIT 80
+RETURN i.name AS Ingredient, d.name AS Dish, c.name AS Cuisine
+"""
+
+# 😋 Cuisine section ($cuisine = selected cuisine name, matched on the indexed name_key)
+cuisine_list_q = """
+MATCH (c:Cuisine)
+RETURN DISTINCT c.name AS cuisine
+ORDER BY cuisine
+"""
+
+q_cui_kpi = """
+MATCH (c:Cuisine {name_key: toLower(trim($cuisine))})
+
+// Get all ingredients in the cuisine
+OPTIONAL MATCH (c)-[:HAS_DISH]->(:Dish)-[:USES]->(i_all:Ingredient)
+WITH c, COLLECT(DISTINCT i_all) AS all_ingredients
+
+// Get all study ingredients
+OPTIONAL MATCH (c)-[:HAS_DISH]->(:Dish)-[:USES]->(i_study:Ingredient)
+WHERE i_study.study_food = true
+WITH c, all_ingredients, COLLECT(DISTINCT i_study) AS study_ingredients
+
+RETURN
+  c.name AS Cuisine,
+  SIZE(study_ingredients) AS Total_Study_Ingredients,
+  SIZE(all_ingredients) AS Total_Ingredients,
+  CASE WHEN SIZE(all_ingredients) = 0
+       THEN 0.0
+       ELSE ROUND((SIZE(study_ingredients) * 100.0 / SIZE(all_ingredients)), 1)
+  END AS Percent_Study_Ingredients
+"""
+
+q_cui_ing = """
+MATCH (c:Cuisine {name_key: toLower(trim($cuisine))})
+MATCH (c)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
+WHERE i.study_food = true
+RETURN i.name AS Ingredient, COUNT(DISTINCT d) AS Frequency
+ORDER BY Frequency DESC
+LIMIT 15
+"""
+
+q_cui_net = """
+MATCH (c:Cuisine {name_key: toLower(trim($cuisine))})
+
+OPTIONAL MATCH (c)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
+WHERE i.study_food = true
+WITH c, d, i
+WHERE d IS NOT NULL AND i IS NOT NULL
+WITH c, d, i
+ORDER BY rand()
+LIMIT 25
+
+RETURN c.name AS Cuisine, d.name AS Dish, i.name AS Ingredient
+"""
+
+q_dishes = """
+MATCH (c:Cuisine {name_key: toLower(trim($cuisine))})-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
+WHERE i.study_food = true
+WITH d, COUNT(DISTINCT i) AS StudyFriendlyIngredients
+RETURN d.name AS Dish, StudyFriendlyIngredients
+ORDER BY StudyFriendlyIngredients DESC
+LIMIT 10
+"""
+
+q_reco = """
+WITH toLower(trim($cuisine)) AS cuisine,
+     coalesce($ingredients, []) AS ingParam
+
+// Normalize picked ingredients
+WITH cuisine,
+     [x IN ingParam | toLower(trim(toString(x)))] AS picked,
+     size(ingParam) AS pickedCount
+
+// Get dishes for the selected cuisine
+OPTIONAL MATCH (c:Cuisine {name_key: cuisine})
+OPTIONAL MATCH (c)-[:HAS_DISH]->(d:Dish)
+
+// Collect dish ingredients
+OPTIONAL MATCH (d)-[:USES]->(i:Ingredient)
+WITH cuisine, picked, pickedCount, d,
+     collect(DISTINCT i.name_key) AS dishIngs
+
+// Compute ingredient match score
+WITH cuisine, picked, pickedCount, d,
+     [x IN picked WHERE x IN dishIngs] AS matched,
+     size([x IN picked WHERE x IN dishIngs]) AS matchScore
+
+// Study-boosting score
+OPTIONAL MATCH (d)-[:USES]->(sf:Ingredient {study_food:true})
+WITH cuisine, picked, pickedCount, d, matched, matchScore,
+     count(DISTINCT sf) AS studyBoost,
+     (matchScore * 10 + count(DISTINCT sf)) AS rankScore
+
+// Collect ALL rows first (important for fallback logic)
+WITH cuisine, picked, pickedCount,
+     collect({
+       dish: coalesce(d.name, "NO_DISH"),
+       matchScore: matchScore,
+       matched: matched,
+       studyBoost: studyBoost,
+       rankScore: rankScore
+     }) AS rows
+
+// Decide what to show
+UNWIND
+CASE
+  // 🟦 No ingredients picked
+  WHEN pickedCount = 0 THEN
+    [{
+      dish: "💡 Pick 1–3 ingredients to get a personalised recommendation",
+      matchScore: 0,
+      matched: ["Try: garlic, egg, ginger, chicken broth"],
+      studyBoost: 0,
+      rankScore: 0
+    }]
+
+  // ❌ Ingredients selected but NOTHING matches
+  WHEN pickedCount > 0
+   AND size([r IN rows WHERE r.matchScore > 0]) = 0
+  THEN
+    [{
+      dish: "⚠️ No matching dishes found",
+      matchScore: 0,
+      matched: ["Please change or add ingredients — none match " + cuisine + " dishes in our dataset."],
+      studyBoost: 0,
+      rankScore: 0
+    }]
+
+  // ✅ Normal case: matched dishes
+  ELSE
+    [r IN rows WHERE r.matchScore > 0]
+END AS r
+
+// Final output
+RETURN
+r.dish AS RecommendedDish,
+r.matchScore AS MatchedPickedIngredients,
+reduce(
+  s = "",
+  x IN r.matched |
+  s + CASE WHEN s = "" THEN "" ELSE ", " END + x
+) AS MatchedIngredients,
+r.studyBoost AS StudyFriendlyIngredientCount,
+CASE
+  WHEN r.dish STARTS WITH "⚠️" OR r.dish STARTS WITH "💡" THEN "ℹ️"
+  ELSE "✅"
+END AS Note
+ORDER BY r.rankScore DESC
+LIMIT 5
+"""
+
+# 🏷️ Brand index inputs (one pass each; brand_index.py aggregates them in memory)
+q_brand_edges = """
+MATCH (i:Ingredient)-[:ASSOCIATED_WITH]->(b:Brand)
+RETURN i.name AS Ingredient, b.name AS Brand, coalesce(i.study_food, false) AS StudyFood
+"""
+
+# Distinct per (brand, cuisine): a dish using three of a brand's ingredients still counts once
+q_brand_cuisine_usage = """
+MATCH (c:Cuisine)-[:HAS_DISH]->(d:Dish)-[:USES]->(:Ingredient)-[:ASSOCIATED_WITH]->(b:Brand)
+RETURN b.name AS Brand, c.name AS Cuisine, COUNT(DISTINCT d) AS Dishes
+"""
+
+# 🔁 Offline jobs (dish_similarity.py etc.): every dish/ingredient pair with the dish's cuisine
+q_dish_ingredients = """
+MATCH (c:Cuisine)-[:HAS_DISH]->(d:Dish)-[:USES]->(i:Ingredient)
+RETURN d.name AS Dish, c.name AS Cuisine, i.name AS Ingredient
+"""
+
+# 🍪 Cook-E preset buttons (label -> preset JSON the chatbot runs without GPT)
+PRESET_QUERIES = {
+    "🧠 Top Study Foods": {
+        "cypher": """
+        MATCH (i:Ingredient)
+        WHERE i.study_food = true
+        WITH i
+        MATCH (:Dish)-[:USES]->(i)
+        RETURN i.name AS Ingredient, COUNT(*) AS Uses
+        ORDER BY Uses DESC
+        LIMIT 10
+        """,
+        "chart": "bar"
+    },
+    "🍽️ Study Cuisines": {
+        "cypher": """
+        MATCH (i:Ingredient)
+        WHERE i.study_food = true
+        WITH i
+        MATCH (c:Cuisine)-[:HAS_DISH]->(:Dish)-[:USES]->(i)
+        RETURN c.name AS Cuisine, COUNT(DISTINCT i.name) AS StudyIngredientCount
+        ORDER BY StudyIngredientCount DESC
+        LIMIT 5
+        """,
+        "chart": "bar"
+    },
+    "🌍 Study Regions": {
+        "cypher": """
+        MATCH (i:Ingredient)
+        WHERE i.study_food = true
+        WITH i
+        MATCH (c:Cuisine)-[:HAS_DISH]->(:Dish)-[:USES]->(i)
+        MATCH (r:Region)-[:HAS_CUISINE]->(c)
+        RETURN r.name AS Region, COUNT(DISTINCT i.name) AS StudyIngredientCount
+        ORDER BY StudyIngredientCount DESC
+        LIMIT 5
+        """,
+        "chart": "bar"
+    },
+}
@@ -0,0 +1,162 @@
+# Constraints / indexes the dashboard and Cook-E queries rely on, plus the Meta node holding
+# the graph version (part of every result cache key) and the study-food counter. All
+# statements are idempotent.
+
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT region_name IF NOT EXISTS FOR (n:Region) REQUIRE n.name IS UNIQUE",
+    "CREATE CONSTRAINT cuisine_name IF NOT EXISTS FOR (n:Cuisine) REQUIRE n.name IS UNIQUE",
+    "CREATE CONSTRAINT ingredient_name IF NOT EXISTS FOR (n:Ingredient) REQUIRE n.name IS UNIQUE",
+    "CREATE CONSTRAINT brand_name IF NOT EXISTS FOR (n:Brand) REQUIRE n.name IS UNIQUE",
+    # Dish names repeat across cuisines, so index rather than constrain; ingest keys dishes on
+    # (cuisine_key, name_key). Older schema runs made Dish.name_key unique, which merged them.
+    "CREATE INDEX dish_name IF NOT EXISTS FOR (n:Dish) ON (n.name)",
+    "DROP CONSTRAINT dish_name_key IF EXISTS",
+    "CREATE INDEX dish_key IF NOT EXISTS FOR (n:Dish) ON (n.cuisine_key, n.name_key)",
+    "CREATE INDEX ingredient_study_food IF NOT EXISTS FOR (n:Ingredient) ON (n.study_food)",
+    "CREATE CONSTRAINT meta_key IF NOT EXISTS FOR (n:Meta) REQUIRE n.key IS UNIQUE",
+]
+
+# Every node type gets a normalised, indexed name_key = toLower(trim(name)), so
+# case-insensitive lookups are index seeks instead of toLower() label scans
+NAME_KEY_LABELS = ["Region", "Cuisine", "Dish", "Ingredient", "Brand"]
+# Names that may legitimately repeat: name_key is indexed, never unique
+SHARED_NAME_LABELS = {"Dish"}
+
+BACKFILL_NAME_KEY = """
+MATCH (n:{label})
+WHERE n.name IS NOT NULL AND (n.name_key IS NULL OR n.name_key <> toLower(trim(n.name)))
+CALL {{
+  WITH n
+  SET n.name_key = toLower(trim(n.name))
+}} IN TRANSACTIONS OF 10000 ROWS
+"""
+
+# Dishes loaded before cuisine_key existed take it from their (single) cuisine. A dish node
+# already shared by several cuisines can't be split here: those are reported for a re-ingest.
+BACKFILL_DISH_CUISINE_KEY = """
+MATCH (d:Dish)
+WHERE d.cuisine_key IS NULL
+CALL {
+  WITH d
+  MATCH (c:Cuisine)-[:HAS_DISH]->(d)
+  WITH d, collect(c.name_key) AS cuisines
+  WHERE size(cuisines) = 1
+  SET d.cuisine_key = cuisines[0]
+} IN TRANSACTIONS OF 10000 ROWS
+"""
+
+SHARED_DISHES = """
+MATCH (d:Dish)
+WHERE COUNT { (:Cuisine)-[:HAS_DISH]->(d) } > 1
+RETURN count(d) AS shared
+"""
+
+DUPLICATE_NAME_KEYS = """
+MATCH (n:{label})
+WHERE n.name_key IS NOT NULL
+WITH n.name_key AS key, count(*) AS copies
+WHERE copies > 1
+RETURN key, copies
+LIMIT 5
+"""
+
+# Study-food ingredient total for the dashboard KPIs. Recounted (one index seek) with the
+# schema, then kept current by ingest's ingredient statement
+RECOUNT_STUDY_FOODS = """
+OPTIONAL MATCH (i:Ingredient)
+WHERE i.study_food = true
+WITH count(i) AS study
+MERGE (m:Meta {key: 'graph'})
+SET m.study_ingredients = study
+RETURN study
+"""
+
+# Cuisines without name_key: this graph hasn't been through migrate_name_keys, so every
+# dashboard / Cook-E query that matches on name_key would come back empty
+MISSING_NAME_KEYS = """
+MATCH (c:Cuisine)
+WHERE c.name_key IS NULL
+RETURN count(c) AS missing
+"""
+
+BUMP_VERSION = """
+MERGE (m:Meta {key: 'graph'})
+SET m.version = coalesce(m.version, 0) + 1,
+    m.updated_at = datetime()
+RETURN m.version AS version
+"""
+
+
+def apply_schema(driver):
+    with driver.session() as session:
+        for statement in SCHEMA_STATEMENTS:
+            session.run(statement).consume()
+    report = migrate_name_keys(driver)
+    with driver.session() as session:
+        # Wait for new indexes to come online before loading against them
+        session.run("CALL db.awaitIndexes(300)").consume()
+    report["Meta"] = f"{recount_study_foods(driver):,} study-food ingredients"
+    return report
+
+
+def migrate_name_keys(driver):
+    # Backfill name_key, then make it unique — or just indexed if the data has
+    # case-only duplicates ("Pad Thai" / "pad thai") that need cleaning up first
+    report = {}
+    with driver.session() as session:
+        for label in NAME_KEY_LABELS:
+            session.run(BACKFILL_NAME_KEY.format(label=label)).consume()
+            if label in SHARED_NAME_LABELS:
+                session.run(
+                    f"CREATE INDEX {label.lower()}_name_key_idx IF NOT EXISTS FOR (n:{label}) ON (n.name_key)"
+                ).consume()
+                report[label] = "indexed (keyed per cuisine)"
+                continue
+            dupes = session.run(DUPLICATE_NAME_KEYS.format(label=label)).data()
+            if dupes:
+                session.run(
+                    f"CREATE INDEX {label.lower()}_name_key_idx IF NOT EXISTS FOR (n:{label}) ON (n.name_key)"
+                ).consume()
+                report[label] = "indexed (duplicates: " + ", ".join(f"{d['key']} x{d['copies']}" for d in dupes) + ")"
+            else:
+                # A fallback index from an earlier run (before the duplicates were cleaned up)
+                # would make Neo4j reject the constraint on the same property
+                session.run(f"DROP INDEX {label.lower()}_name_key_idx IF EXISTS").consume()
+                session.run(
+                    f"CREATE CONSTRAINT {label.lower()}_name_key IF NOT EXISTS FOR (n:{label}) REQUIRE n.name_key IS UNIQUE"
+                ).consume()
+                report[label] = "unique"
+
+        session.run(BACKFILL_DISH_CUISINE_KEY).consume()
+        shared = session.run(SHARED_DISHES).single()["shared"]
+        if shared:
+            report["Dish"] += f" — {shared:,} dishes shared by several cuisines, detach-delete and re-ingest them to split"
+    return report
+
+
+def recount_study_foods(driver):
+    # Resets the counter after edits made outside ingest.py
+    with driver.session() as session:
+        return session.run(RECOUNT_STUDY_FOODS).single()["study"]
+
+
+def missing_name_keys():
+    # Startup check for the app, once per graph version (migrating bumps it)
+    from graph_store import cached, run_query
+
+    return cached(("missing-name-keys",), lambda: run_query(MISSING_NAME_KEYS)[0]["missing"])
+
+
+def bump_graph_version(driver):
+    with driver.session() as session:
+        return session.run(BUMP_VERSION).single()["version"]
+
+
+if __name__ == "__main__":
+    # python graph_schema.py  ->  create constraints/indexes, backfill name_key, recount study foods, bump the graph version
+    from graph_store import get_driver
+
+    driver = get_driver()
+    for label, status in apply_schema(driver).items():
+        print(f"{label:<11} {status}" if label == "Meta" else f"{label:<11} name_key {status}")
+    print(f"graph version -> {bump_graph_version(driver)}")
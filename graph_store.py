@@ -0,0 +1,258 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from neo4j import GraphDatabase
+from neo4j.graph import Node, Path, Relationship
+
+from result_cache import MISS, ResultCache, make_key
+from shared_cache import SharedCache
+from single_flight import SingleFlight
+
+# Shared Neo4j access for the dashboard, Cook-E and the offline scripts
+
+load_dotenv()
+
+# Records pulled from Aura per round trip when streaming into a DataFrame
+FETCH_BATCH_SIZE = 1000
+
+# How long a query result stays fresh (the cache warmer refreshes well before this)
+RESULT_TTL = 30 * 60
+# How often we re-read the graph version that ingest bumps (new version = every cache key changes)
+GRAPH_VERSION_TTL = 60
+
+GRAPH_VERSION_QUERY = """
+OPTIONAL MATCH (m:Meta {key: 'graph'})
+RETURN coalesce(m.version, 0) AS version
+"""
+
+result_cache = ResultCache(max_entries=1024, ttl=RESULT_TTL)
+# Second tier on disk: survives restarts, and under serve.py every worker on the host shares it.
+# FLAVORS_CACHE_PATH moves the file ("off" = in-process cache only), FLAVORS_CACHE_MB caps it.
+CACHE_PATH = os.environ.get("FLAVORS_CACHE_PATH",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts", "query_cache.sqlite"))
+CACHE_MAX_MB = int(os.environ.get("FLAVORS_CACHE_MB", 256))
+# Most recently used entries copied from disk into memory on the first lookup after a (re)start
+PRELOAD_ENTRIES = 256
+# Identical (query, params) from many sessions at once -> one trip to Aura
+query_flight = SingleFlight()
+
+_driver = None
+_driver_lock = threading.Lock()
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+_version = {"value": None, "checked": 0.0}
+_version_lock = threading.Lock()
+_preloaded = {"version": None}
+_preload_lock = threading.Lock()
+
+
+def get_secret(name, default=None):
+    # Streamlit secrets first, then .env / environment (for CLIs and background jobs)
+    try:
+        import streamlit as st
+        return st.secrets[name]
+    except Exception:
+        value = os.environ.get(name, default)
+        if value is None:
+            raise KeyError(f"Missing secret {name!r} (set it in .streamlit/secrets.toml or the environment)")
+        return value
+
+
+def get_driver():
+    global _driver
+    if _driver is None:
+        with _driver_lock:
+            if _driver is None:
+                _driver = GraphDatabase.driver(
+                    get_secret("NEO4J_URI"),
+                    auth=(get_secret("NEO4J_USER"), get_secret("NEO4J_PASS")),
+                )
+    return _driver
+
+
+def get_shared_cache(create=True):
+    # Opened on first use like the driver, so importing graph_store never writes the file.
+    # None when FLAVORS_CACHE_PATH is "off" (or, with create=False, when nothing opened it yet)
+    global _shared_cache
+    if _shared_cache is None and create and CACHE_PATH and CACHE_PATH != "off":
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedCache(CACHE_PATH, ttl=RESULT_TTL, max_bytes=CACHE_MAX_MB * 1024 * 1024)
+    return _shared_cache
+
+
+def run_query(cypher, params=None):
+    with get_driver().session() as session:
+        result = session.run(cypher, params or {})
+        return [r.data() for r in result]
+
+
+def run_query_df(cypher, params=None, max_rows=None, ttl=None, refresh=False):
+    # Cached columnar fetch; ttl=0 skips the cache, refresh=True re-runs and overwrites it
+    if ttl == 0:
+        return fetch_df(cypher, params, max_rows=max_rows)
+
+    df = cached(
+        ("query", cypher, params or {}, max_rows),
+        lambda: fetch_df(cypher, params, max_rows=max_rows),
+        ttl=ttl,
+        refresh=refresh,
+    )
+    # Shallow copy so callers can add/drop columns without touching the cached frame
+    return df.copy(deep=False)
+
+
+def graph_version():
+    # Cheap single-node lookup, re-checked at most once per GRAPH_VERSION_TTL.
+    # Only talks to a disk cache something already opened (cached() opens it first).
+    shared_cache = get_shared_cache(create=False)
+    with _version_lock:
+        if _version["value"] is None or time.monotonic() - _version["checked"] > GRAPH_VERSION_TTL:
+            try:
+                _version["value"] = run_query(GRAPH_VERSION_QUERY)[0]["version"]
+                if shared_cache is not None:
+                    shared_cache.publish_version(_version["value"])
+            except Exception:
+                # Keep serving the last known version if Aura hiccups
+                if _version["value"] is None:
+                    raise
+            _version["checked"] = time.monotonic()
+        elif shared_cache is not None:
+            # Another worker saw a newer version: switch now instead of after our own TTL
+            latest = shared_cache.latest_version()
+            if latest is not None and latest > _version["value"]:
+                _version["value"] = latest
+        return _version["value"]
+
+
+def publish_graph_version(version):
+    # After an ingest: this process and (in multi-worker mode) every worker move to `version` now
+    with _version_lock:
+        _version["value"], _version["checked"] = version, time.monotonic()
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.publish_version(version)
+
+
+def is_current_version(version):
+    # Offline artifacts record the graph version they were built from; an ingest since makes them stale
+    try:
+        return version is not None and version >= graph_version()
+    except Exception:
+        # Can't reach the graph to compare: a possibly stale index beats none
+        return True
+
+
+def preload_cache(version=None):
+    # Startup load: the disk tier's hottest entries for this graph version go straight into memory
+    shared_cache = get_shared_cache()
+    if shared_cache is None:
+        return 0
+    version = graph_version() if version is None else version
+    with _preload_lock:
+        if _preloaded["version"] == version:
+            return 0
+        _preloaded["version"] = version
+        entries = shared_cache.recent(version, PRELOAD_ENTRIES)
+        # Oldest first, so the in-process LRU ends up with the hottest entries newest
+        for key, value, seconds_left in reversed(entries):
+            result_cache.set(key, value, ttl=seconds_left)
+    return len(entries)
+
+
+def cached(key_parts, build, ttl=None, refresh=False):
+    # Read-through cache for query results and anything derived from them (indexes etc.).
+    # Keys include the graph version, so an ingest invalidates everything at once.
+    shared_cache = get_shared_cache()
+    version = graph_version()
+    if shared_cache is not None and _preloaded["version"] != version:
+        preload_cache(version)
+    key = make_key(version, *key_parts)
+    if not refresh:
+        value = result_cache.get(key)
+        if value is not MISS:
+            return value
+        if shared_cache is not None:
+            value = shared_cache.get(key)
+            if value is not MISS:
+                result_cache.set(key, value, ttl=ttl)
+                return value
+
+    def load():
+        value = build()
+        result_cache.set(key, value, ttl=ttl)
+        if shared_cache is not None:
+            shared_cache.set(key, value, ttl=ttl, version=version)
+        return value
+
+    return query_flight.do(key, load)
+
+
+def fetch_df(cypher, params=None, max_rows=None, batch_size=FETCH_BATCH_SIZE):
+    # Columnar fetch: records go straight into per-column arrays, no dict per row
+    with get_driver().session(fetch_size=batch_size) as session:
+        result = session.run(cypher, params or {})
+        return result_to_df(result, max_rows=max_rows, batch_size=batch_size)
+
+
+def result_to_df(result, max_rows=None, batch_size=FETCH_BATCH_SIZE):
+    keys = list(result.keys())
+    chunks = [[] for _ in keys]
+    fetched = 0
+
+    while max_rows is None or fetched < max_rows:
+        want = batch_size if max_rows is None else min(batch_size, max_rows - fetched)
+        batch = result.fetch(want)
+        if not batch:
+            break
+        # Records are tuples, so zip(*batch) transposes the batch into columns
+        for chunk, values in zip(chunks, zip(*batch)):
+            chunk.append(_to_array(values))
+        fetched += len(batch)
+
+    if max_rows is not None and fetched >= max_rows:
+        # Row cap hit: tell the server to drop whatever is left instead of streaming it
+        result.consume()
+
+    columns = {
+        key: np.concatenate(chunk) if chunk else np.empty(0, dtype=object)
+        for key, chunk in zip(keys, chunks)
+    }
+    return pd.DataFrame(columns, columns=keys)
+
+
+def _to_array(values):
+    if all(type(v) is bool for v in values):
+        return np.array(values, dtype=bool)
+    if all(type(v) is int for v in values):
+        return np.array(values, dtype=np.int64)
+    if all(type(v) in (int, float) for v in values):
+        return np.array(values, dtype=np.float64)
+
+    # Filled one by one so list/dict values are kept as single cells
+    arr = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        arr[i] = _plain(v)
+    return arr
+
+
+def _plain(value):
+    # Same shapes as Record.data(), so charts/tables look identical to the old path
+    if isinstance(value, Node):
+        return dict(value)
+    if isinstance(value, Relationship):
+        return (dict(value.start_node), value.type, dict(value.end_node))
+    if isinstance(value, Path):
+        out = [dict(value.start_node)]
+        for rel in value.relationships:
+            out += [rel.type, dict(rel.end_node)]
+        return out
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
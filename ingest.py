@@ -0,0 +1,234 @@
+"""Bulk-load recipe datasets into the flavor graph.
+
+    python ingest.py recipes.csv more_recipes.jsonl --batch-size 5000
+
+Each input row is one dish/ingredient pair with the columns
+    region, cuisine, dish, ingredient, study_food (optional), brand (optional)
+JSON / JSONL records may instead carry an "ingredients" list (names, or objects with
+name / study_food / brand), and CSV rows may give "ingredients" as a ;-separated string.
+study_food is sticky: once any row marks an ingredient as a study food it stays one (unset
+it in the graph directly, then rerun graph_schema.py to recount).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from graph_schema import apply_schema, bump_graph_version
+from graph_store import get_driver, publish_graph_version
+
+# Input rows per write transaction
+BATCH_SIZE = 5000
+
+# One UNWIND per node/relationship type per chunk, each on a de-duplicated list,
+# so every MERGE hits a name_key index instead of running row-at-a-time.
+# Dish names repeat across cuisines ("Fried Rice"), so a dish is keyed on (cuisine_key, name_key).
+LOAD_STATEMENTS = [
+    ("regions", """
+        UNWIND $rows AS row
+        MERGE (r:Region {name_key: toLower(trim(row.name))})
+        ON CREATE SET r.name = row.name
+    """),
+    ("cuisines", """
+        UNWIND $rows AS row
+        MERGE (c:Cuisine {name_key: toLower(trim(row.cuisine))})
+        ON CREATE SET c.name = row.cuisine
+        WITH c, row
+        WHERE row.region IS NOT NULL
+        MATCH (r:Region {name_key: toLower(trim(row.region))})
+        MERGE (r)-[:HAS_CUISINE]->(c)
+    """),
+    # study_food only ever turns on (any row marking it wins, across chunks as within one),
+    # so results don't depend on batch boundaries. Also moves the Meta study-food counter.
+    ("ingredients", """
+        UNWIND $rows AS row
+        MERGE (i:Ingredient {name_key: toLower(trim(row.name))})
+        ON CREATE SET i.name = row.name
+        WITH i, row, coalesce(i.study_food, false) AS was
+        SET i.study_food = coalesce(row.study_food, false) OR was
+        WITH sum(CASE WHEN i.study_food AND NOT was THEN 1 ELSE 0 END) AS delta
+        MATCH (m:Meta {key: 'graph'})
+        WHERE m.study_ingredients IS NOT NULL
+        SET m.study_ingredients = m.study_ingredients + delta
+    """),
+    ("dishes", """
+        UNWIND $rows AS row
+        MATCH (c:Cuisine {name_key: toLower(trim(row.cuisine))})
+        MERGE (d:Dish {cuisine_key: c.name_key, name_key: toLower(trim(row.dish))})
+        ON CREATE SET d.name = row.dish
+        MERGE (c)-[:HAS_DISH]->(d)
+    """),
+    ("uses", """
+        UNWIND $rows AS row
+        MATCH (d:Dish {cuisine_key: toLower(trim(row.cuisine)), name_key: toLower(trim(row.dish))})
+        MATCH (i:Ingredient {name_key: toLower(trim(row.ingredient))})
+        MERGE (d)-[:USES]->(i)
+    """),
+    ("brands", """
+        UNWIND $rows AS row
+        MERGE (b:Brand {name_key: toLower(trim(row.brand))})
+        ON CREATE SET b.name = row.brand
+        WITH b, row
+        MATCH (i:Ingredient {name_key: toLower(trim(row.ingredient))})
+        MERGE (i)-[:ASSOCIATED_WITH]->(b)
+    """),
+]
+
+TRUE_WORDS = {"true", "1", "yes", "y", "t"}
+
+
+def _text(value):
+    return " ".join(str(value).split()) if value not in (None, "") else None
+
+
+def _flag(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_WORDS
+
+
+def clean_row(rec):
+    # Regions / cuisines / ingredients are stored lowercase in the graph (the queries rely on it)
+    row = {
+        "region": (_text(rec.get("region")) or "").lower() or None,
+        "cuisine": (_text(rec.get("cuisine")) or "").lower() or None,
+        "dish": _text(rec.get("dish")),
+        "ingredient": (_text(rec.get("ingredient")) or "").lower() or None,
+        "study_food": _flag(rec.get("study_food")),
+        "brand": _text(rec.get("brand")),
+    }
+    if not (row["cuisine"] and row["dish"] and row["ingredient"]):
+        return None
+    return row
+
+
+def _explode(rec):
+    ingredients = rec.get("ingredients")
+    if ingredients is None:
+        yield rec
+        return
+    if isinstance(ingredients, str):
+        ingredients = [x for x in ingredients.split(";") if x.strip()]
+    for ing in ingredients:
+        extra = ing if isinstance(ing, dict) else {"name": ing}
+        yield {**rec, "ingredient": extra.get("name"),
+               "study_food": extra.get("study_food", rec.get("study_food")),
+               "brand": extra.get("brand", rec.get("brand"))}
+
+
+def read_records(path):
+    # Streams CSV / JSONL; plain JSON arrays have to be parsed whole
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if ext == ".csv":
+            records = csv.DictReader(f)
+        elif ext in (".jsonl", ".ndjson"):
+            records = (json.loads(line) for line in f if line.strip())
+        elif ext == ".json":
+            data = json.load(f)
+            records = data.get("recipes", []) if isinstance(data, dict) else data
+        else:
+            raise ValueError(f"Unsupported file type: {path} (use .csv, .json or .jsonl)")
+
+        for rec in records:
+            yield from _explode(rec)
+
+
+def chunk_payload(rows):
+    # De-duplicate within the chunk; any row marking an ingredient as study food wins
+    regions, cuisines, ingredients = set(), {}, {}
+    dishes, uses, brands = set(), set(), set()
+    for row in rows:
+        if row["region"]:
+            regions.add(row["region"])
+            cuisines[row["cuisine"]] = row["region"]
+        else:
+            cuisines.setdefault(row["cuisine"], None)
+
+        ing, flag = row["ingredient"], row["study_food"]
+        if flag:
+            ingredients[ing] = True
+        elif ingredients.get(ing) is None:
+            ingredients[ing] = flag
+
+        dishes.add((row["dish"], row["cuisine"]))
+        uses.add((row["dish"], row["cuisine"], row["ingredient"]))
+        if row["brand"]:
+            brands.add((row["brand"], row["ingredient"]))
+
+    return {
+        "regions": [{"name": r} for r in regions],
+        "cuisines": [{"cuisine": c, "region": r} for c, r in cuisines.items()],
+        "ingredients": [{"name": i, "study_food": s} for i, s in ingredients.items()],
+        "dishes": [{"dish": d, "cuisine": c} for d, c in dishes],
+        "uses": [{"dish": d, "cuisine": c, "ingredient": i} for d, c, i in uses],
+        "brands": [{"brand": b, "ingredient": i} for b, i in brands],
+    }
+
+
+def _write_chunk(tx, payload):
+    for name, statement in LOAD_STATEMENTS:
+        if payload[name]:
+            tx.run(statement, rows=payload[name]).consume()
+
+
+def load_rows(driver, rows, batch_size=BATCH_SIZE, progress=None):
+    # rows: iterable of clean_row() dicts. One write transaction per batch.
+    stats = {"rows": 0, "batches": 0}
+    rows = iter(rows)
+    with driver.session() as session:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            session.execute_write(_write_chunk, chunk_payload(batch))
+            stats["rows"] += len(batch)
+            stats["batches"] += 1
+            if progress:
+                progress(stats)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load recipe CSV/JSON into the Map of Flavors graph.")
+    parser.add_argument("files", nargs="+", help=".csv, .json or .jsonl recipe files")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per write transaction")
+    parser.add_argument("--skip-schema", action="store_true", help="don't create constraints/indexes first")
+    args = parser.parse_args(argv)
+
+    driver = get_driver()
+    if not args.skip_schema:
+        apply_schema(driver)
+
+    skipped = 0
+
+    def clean_all():
+        nonlocal skipped
+        for path in args.files:
+            for rec in read_records(path):
+                row = clean_row(rec)
+                if row is None:
+                    skipped += 1
+                    continue
+                yield row
+
+    start = time.perf_counter()
+    stats = load_rows(
+        driver, clean_all(), batch_size=args.batch_size,
+        progress=lambda s: print(f"  {s['rows']:,} rows in {s['batches']} batches "
+                                 f"({s['rows'] / (time.perf_counter() - start):,.0f} rows/s)", file=sys.stderr),
+    )
+
+    version = bump_graph_version(driver)
+    publish_graph_version(version)
+    print(f"Loaded {stats['rows']:,} rows ({skipped:,} skipped) in {time.perf_counter() - start:.1f}s "
+          f"-> graph version {version}")
+
+
+if __name__ == "__main__":
+    main()
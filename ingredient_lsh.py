@@ -0,0 +1,170 @@
+"""MinHash + LSH index over each dish's ingredient set.
+
+    python ingredient_lsh.py
+
+Answers "which dishes overlap most with these ingredients?" by looking up LSH buckets
+for candidate dishes and re-scoring only those with exact Jaccard, instead of comparing
+the picked set with every dish. Saved to artifacts/ingredient_lsh.npz.
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import flavor_queries as fq
+from graph_store import is_current_version
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+LSH_PATH = os.path.join(ARTIFACT_DIR, "ingredient_lsh.npz")
+
+# 32 bands x 2 rows: catches pairs down to Jaccard ~0.18, which matters because a
+# 1–3 ingredient pick against a 10-ingredient dish never scores high
+NUM_PERM = 64
+BAND_ROWS = 2
+PRIME = (1 << 31) - 1
+# Dishes hashed per step (bounds the nnz x NUM_PERM temporary)
+CHUNK_DISHES = 50_000
+
+_loaded = {"mtime": None, "index": None}
+_load_lock = threading.Lock()
+
+
+def _hash_params(seed=7):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, PRIME, NUM_PERM, dtype=np.uint64)
+    b = rng.integers(0, PRIME, NUM_PERM, dtype=np.uint64)
+    mult = rng.integers(1, 1 << 62, BAND_ROWS, dtype=np.uint64) | np.uint64(1)
+    return a, b, mult
+
+
+def minhash(indptr, indices, a, b):
+    # Signature per CSR row: min over the row's items of (a*x + b) mod p, for every permutation
+    n = len(indptr) - 1
+    sigs = np.full((n, NUM_PERM), PRIME, dtype=np.uint32)
+    for lo in range(0, n, CHUNK_DISHES):
+        hi = min(lo + CHUNK_DISHES, n)
+        starts, stop = indptr[lo:hi], indptr[hi]
+        items = indices[starts[0]:stop].astype(np.uint64)
+        if len(items) == 0:
+            continue
+        hashed = (items[:, None] * a[None, :] + b[None, :]) % np.uint64(PRIME)
+        nonempty = np.diff(indptr[lo:hi + 1]) > 0
+        sigs[lo:hi][nonempty] = np.minimum.reduceat(hashed, (starts - starts[0])[nonempty], axis=0)
+    return sigs
+
+
+def band_keys(sigs, mult):
+    bands = sigs.reshape(len(sigs), -1, BAND_ROWS).astype(np.uint64)
+    return (bands * mult).sum(axis=2)  # wraps mod 2^64, which is fine for a bucket key
+
+
+class IngredientLSH:
+    def __init__(self, indptr, indices, dishes, cuisines, vocab, seed=7, version=None):
+        self.indptr, self.indices = indptr, indices
+        self.version = version
+        self.dishes, self.cuisines = list(dishes), list(cuisines)
+        self.vocab = {name: i for i, name in enumerate(vocab)}
+        self.a, self.b, self.mult = _hash_params(seed)
+
+        keys = band_keys(minhash(indptr, indices, self.a, self.b), self.mult)
+        # Per band: sorted unique keys + start offsets into a dish-id order array (no dicts)
+        self.buckets = []
+        for band in keys.T:
+            order = np.argsort(band, kind="stable")
+            uniq, starts = np.unique(band[order], return_index=True)
+            self.buckets.append((uniq, np.append(starts, len(order)), order))
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        # One set per (Dish, Cuisine): same-named dishes in two cuisines keep their own ingredients
+        pairs = pairs.dropna(subset=["Dish", "Ingredient"])
+        pairs = pairs.assign(Ingredient=pairs["Ingredient"].astype(str).str.lower(),
+                             Cuisine=pairs["Cuisine"].fillna("").astype(str))
+        pairs = pairs.drop_duplicates(["Dish", "Cuisine", "Ingredient"])
+        dish_codes, keys = pd.factorize(pd.MultiIndex.from_frame(pairs[["Dish", "Cuisine"]]))
+        ing_codes, vocab = pd.factorize(pairs["Ingredient"])
+        order = np.lexsort((ing_codes, dish_codes))
+        indices = ing_codes[order].astype(np.int64)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(dish_codes, minlength=len(keys)))])
+        return cls(indptr, indices, list(keys.get_level_values(0)), list(keys.get_level_values(1)), list(vocab))
+
+    def candidates(self, codes):
+        sig = minhash(np.array([0, len(codes)]), np.asarray(codes, dtype=np.int64), self.a, self.b)
+        found = []
+        for (uniq, starts, order), key in zip(self.buckets, band_keys(sig, self.mult)[0]):
+            pos = np.searchsorted(uniq, key)
+            if pos < len(uniq) and uniq[pos] == key:
+                found.append(order[starts[pos]:starts[pos + 1]])
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def query(self, ingredients, k=10, cuisine=None):
+        # Exact Jaccard on the LSH candidates only; optionally kept to one cuisine
+        codes = sorted({self.vocab[i.lower()] for i in ingredients if i.lower() in self.vocab})
+        if not codes:
+            return pd.DataFrame(columns=["Dish", "Cuisine", "Matched", "Jaccard"])
+
+        cand = self.candidates(codes)
+        if cuisine:
+            want = str(cuisine).lower()
+            cand = cand[[str(self.cuisines[d]).lower() == want for d in cand]] if len(cand) else cand
+        # Gather the candidates' CSR rows into one flat array and count hits per dish
+        sizes = self.indptr[cand + 1] - self.indptr[cand]
+        cand, sizes = cand[sizes > 0], sizes[sizes > 0]
+        starts = np.cumsum(sizes) - sizes
+        flat = self.indices[np.repeat(self.indptr[cand] - starts, sizes) + np.arange(sizes.sum())]
+        matched = np.add.reduceat(np.isin(flat, codes).astype(np.int64), starts)
+        jaccard = matched / (sizes + len(codes) - matched)
+
+        best = np.lexsort((-matched, -jaccard))[:k]
+        best = best[matched[best] > 0]
+        return pd.DataFrame({
+            "Dish": [self.dishes[d] for d in cand[best]],
+            "Cuisine": [self.cuisines[d] for d in cand[best]],
+            "Matched": matched[best],
+            "Jaccard": np.round(jaccard[best], 3),
+        })
+
+    def save(self, path, version):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(path, indptr=self.indptr, indices=self.indices,
+                            dishes=np.array(self.dishes, dtype=str), cuisines=np.array(self.cuisines, dtype=str),
+                            vocab=np.array(list(self.vocab), dtype=str), version=np.array(version))
+
+
+def load_lsh(path=LSH_PATH):
+    # Signatures/buckets are rebuilt from the saved CSR sets on load (seconds even at 1M dishes).
+    # None if there's no file, or it was built before the last ingest.
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _load_lock:
+        if _loaded["mtime"] != mtime:
+            data = np.load(path)
+            _loaded["index"] = IngredientLSH(data["indptr"], data["indices"], data["dishes"].tolist(),
+                                             data["cuisines"].tolist(), data["vocab"].tolist(),
+                                             version=int(data["version"]))
+            _loaded["mtime"] = mtime
+        index = _loaded["index"]
+    return index if is_current_version(index.version) else None
+
+
+def main():
+    from graph_store import fetch_df, graph_version
+
+    parser = argparse.ArgumentParser(description="Build artifacts/ingredient_lsh.npz for ingredient-overlap lookups.")
+    parser.add_argument("--out", default=LSH_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = IngredientLSH.from_pairs(fetch_df(fq.q_dish_ingredients))
+    index.save(args.out, graph_version())
+    print(f"{len(index.dishes):,} dishes, {len(index.vocab):,} ingredients -> {args.out} "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
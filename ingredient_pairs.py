@@ -0,0 +1,193 @@
+"""Offline ingredient × ingredient co-occurrence matrix, weighted by PMI.
+
+    python ingredient_pairs.py --min-dishes 3
+
+Counts how many dishes use each pair of ingredients (one pass over each dish's
+ingredient set, so never a pairwise pattern match in Cypher), keeps the pairs that
+appear together more often than chance (positive PMI, lift > 1) and stores each
+ingredient's best partners as a sorted sparse row in artifacts/ingredient_pairs.npz.
+"Pairs well with" is then a slice of the picked ingredients' rows.
+"""
+import argparse
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import flavor_queries as fq
+from brand_index import name_pattern
+from graph_store import is_current_version
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+PAIRS_PATH = os.path.join(ARTIFACT_DIR, "ingredient_pairs.npz")
+
+# Pairs seen in fewer dishes than this are noise (PMI overrates rare ingredients)
+MIN_DISHES = 3
+# Partners kept per ingredient, best PMI first
+TOP_PER_ROW = 50
+# Dishes expanded into pairs per step (bounds the pair-code temporaries)
+CHUNK_DISHES = 50_000
+
+PAIR_WORDS = re.compile(r"\b(pairs?|pairing|pairings|goes with|go with|goes well|go well|combine)\b")
+
+_loaded = {"mtime": None, "index": None}
+_load_lock = threading.Lock()
+
+
+def dish_sets(pairs):
+    # Dish, Cuisine, Ingredient rows -> CSR (indptr, sorted ingredient ids per dish) + lowercase vocab.
+    # A dish is (Dish, Cuisine): same-named dishes in two cuisines are two ingredient sets.
+    pairs = pairs.dropna(subset=["Dish", "Ingredient"])
+    ing = pairs["Ingredient"].astype(str).str.lower()
+    pairs = pairs.assign(Ingredient=ing, Cuisine=pairs["Cuisine"].fillna("").astype(str).str.lower())
+    pairs = pairs.drop_duplicates(["Dish", "Cuisine", "Ingredient"])
+    dish_codes, dishes = pd.factorize(pd.MultiIndex.from_frame(pairs[["Dish", "Cuisine"]]))
+    ing_codes, vocab = pd.factorize(pairs["Ingredient"])
+    order = np.lexsort((ing_codes, dish_codes))
+    indices = ing_codes[order].astype(np.int64)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(dish_codes, minlength=len(dishes)))])
+    return indptr, indices, list(vocab)
+
+
+def _merge(codes, counts, new_codes, new_counts):
+    codes, inverse = np.unique(np.concatenate([codes, new_codes]), return_inverse=True)
+    return codes, np.bincount(inverse, weights=np.concatenate([counts, new_counts])).astype(np.int64)
+
+
+def cooccurrence(indptr, indices, n_items):
+    # -> (pair codes a * n_items + b with a < b, dishes per pair), dishes grouped by size
+    # so each group's pairs come from one fancy-index instead of a Python loop per dish
+    codes, counts = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    sizes = np.diff(indptr)
+    for lo in range(0, len(sizes), CHUNK_DISHES):
+        hi = min(lo + CHUNK_DISHES, len(sizes))
+        chunk = []
+        for size in np.unique(sizes[lo:hi]):
+            if size < 2:
+                continue
+            starts = indptr[lo:hi][sizes[lo:hi] == size]
+            sets = indices[starts[:, None] + np.arange(size)]
+            a, b = np.triu_indices(size, 1)
+            chunk.append((sets[:, a] * n_items + sets[:, b]).ravel())
+        if chunk:
+            new_codes, new_counts = np.unique(np.concatenate(chunk), return_counts=True)
+            codes, counts = _merge(codes, counts, new_codes, new_counts)
+    return codes, counts
+
+
+class IngredientPairs:
+    def __init__(self, indptr, partners, together, pmi, dishes_with, n_dishes, vocab, version=None):
+        self.indptr, self.partners, self.together, self.pmi = indptr, partners, together, pmi
+        self.dishes_with = dishes_with
+        self.n_dishes = int(n_dishes)
+        self.vocab = list(vocab)
+        self.version = version
+        self._pos = {name: i for i, name in enumerate(self.vocab)}
+        self._pattern = None
+
+    @classmethod
+    def from_pairs(cls, pairs, min_dishes=MIN_DISHES, top=TOP_PER_ROW):
+        indptr, indices, vocab = dish_sets(pairs)
+        n, n_dishes = len(vocab), len(indptr) - 1
+        dishes_with = np.bincount(indices, minlength=n)
+        codes, counts = cooccurrence(indptr, indices, n)
+
+        keep = counts >= min_dishes
+        a, b, counts = codes[keep] // n, codes[keep] % n, counts[keep]
+        # PMI = log P(a, b) / (P(a) P(b)); lift is exp(PMI)
+        pmi = np.log(counts * n_dishes / (dishes_with[a] * dishes_with[b].astype(np.float64)))
+        keep = pmi > 0
+        rows = np.concatenate([a[keep], b[keep]])
+        cols = np.concatenate([b[keep], a[keep]])
+        counts, pmi = np.tile(counts[keep], 2), np.tile(pmi[keep], 2)
+
+        # Each row sorted best-first, cut to the top partners
+        order = np.lexsort((-pmi, rows))
+        rows, cols, counts, pmi = rows[order], cols[order], counts[order], pmi[order]
+        row_start = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+        keep = np.arange(len(rows)) - row_start[rows] < top
+        rows, cols, counts, pmi = rows[keep], cols[keep], counts[keep], pmi[keep]
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+        return cls(indptr, cols.astype(np.int32), counts.astype(np.int32), pmi.astype(np.float32),
+                   dishes_with.astype(np.int32), n_dishes, vocab)
+
+    def pairings(self, ingredients, k=5):
+        # Top k partners for each picked ingredient: k entries off the front of its row
+        out = []
+        for name in ingredients:
+            i = self._pos.get(str(name).lower())
+            if i is None:
+                continue
+            lo = self.indptr[i]
+            hi = min(self.indptr[i + 1], lo + k)
+            for j in range(lo, hi):
+                out.append((self.vocab[i], self.vocab[self.partners[j]], round(float(np.exp(self.pmi[j])), 2),
+                            round(float(self.pmi[j]), 3), int(self.together[j])))
+        return pd.DataFrame(out, columns=["Ingredient", "Pairs With", "Lift", "PMI", "Dishes"])
+
+    def find_ingredients(self, text):
+        if self._pattern is None:
+            self._pattern = name_pattern(self._pos)
+        if self._pattern is None:
+            return []
+        return list(dict.fromkeys(m.group(1) for m in self._pattern.finditer(text.lower())))
+
+    def answer(self, question):
+        # Cook-E intent: "what pairs well with ginger?" -> (title, DataFrame, chart)
+        if not PAIR_WORDS.search(question.lower()):
+            return None
+        names = self.find_ingredients(question)
+        if not names:
+            return None
+        if len(names) == 1:
+            df = self.pairings(names, k=8)[["Pairs With", "Lift", "Dishes"]]
+            return f"🤝 What pairs well with {names[0]}", df, "bar"
+        return f"🤝 What pairs well with {', '.join(names)}", self.pairings(names, k=5), "table"
+
+    def save(self, path, version):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(path, indptr=self.indptr, partners=self.partners, together=self.together,
+                            pmi=self.pmi, dishes_with=self.dishes_with, n_dishes=np.array(self.n_dishes),
+                            vocab=np.array(self.vocab, dtype=str), version=np.array(version))
+
+
+def load_pairs(path=PAIRS_PATH):
+    # Loaded once per process; reloaded when the offline job rewrites the file.
+    # None if there's no file, or it was built before the last ingest.
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _load_lock:
+        if _loaded["mtime"] != mtime:
+            data = np.load(path)
+            _loaded["index"] = IngredientPairs(
+                data["indptr"], data["partners"], data["together"], data["pmi"], data["dishes_with"],
+                data["n_dishes"], data["vocab"].tolist(), int(data["version"])
+            )
+            _loaded["mtime"] = mtime
+        index = _loaded["index"]
+    return index if is_current_version(index.version) else None
+
+
+def main():
+    from graph_store import fetch_df, graph_version
+
+    parser = argparse.ArgumentParser(description="Build artifacts/ingredient_pairs.npz for \"pairs well with\" lookups.")
+    parser.add_argument("--min-dishes", type=int, default=MIN_DISHES, help="dishes a pair needs to be kept")
+    parser.add_argument("--top", type=int, default=TOP_PER_ROW, help="partners kept per ingredient")
+    parser.add_argument("--out", default=PAIRS_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = IngredientPairs.from_pairs(fetch_df(fq.q_dish_ingredients), args.min_dishes, args.top)
+    index.save(args.out, graph_version())
+    print(f"{len(index.vocab):,} ingredients, {len(index.partners):,} pairings over {index.n_dishes:,} dishes "
+          f"-> {args.out} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
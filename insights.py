@@ -0,0 +1,138 @@
+import random
+import re
+
+import pandas as pd
+
+# Local, templated Cook-E narration for a query result: top item, gap to the runner-up,
+# share of the total, plus a TP analogy. No second LLM round trip.
+
+# Context-aware TP analogies (multi-line)
+TP_ANALOGIES = {
+    "italian": [
+        "🍝 Italian cuisine is full of creativity — like TP’s Design School sia!",
+        "🎨 Italian food got flair and color — TP Design School confirm love this one!"
+    ],
+    "japanese": [
+        "🍣 Japanese cuisine is precise and balanced — just like our Engineering School students!",
+        "🔧 So meticulous sia — feels like something our Engineering students would master!"
+    ],
+    "indian": [
+        "🌶️ Indian food packs strong flavours, just like the energy at TP’s Business School!",
+        "💼 Wah, the spice level steady lah — Business School students sure can handle it!"
+    ],
+    "french": [
+        "🥐 French cuisine is refined — like TP’s Applied Science students mastering precision!",
+        "🧪 French dishes are elegant and scientific — TP Applied Science vibes confirmed!"
+    ],
+    "thai": [
+        "🍲 Thai cuisine mixes sweet, sour, and spicy — like the lively mix of cultures around TP’s campus!",
+        "🔥 Sweet, spicy, tangy — just like TP’s vibrant student life leh!"
+    ],
+    "korean": [
+        "🍱 Korean cuisine is trendy and bold — just like the students at TP’s IT School leh!",
+        "💻 Korean food got that modern touch — very IT School energy sia!"
+    ],
+    "chinese": [
+        "🥢 Chinese cuisine blends tradition and innovation — just like TP’s multidisciplinary learning!",
+        "📚 Traditional yet modern — same same like TP’s learning style!"
+    ],
+    "western": [
+        "🍔 Western food has that easy-going energy — just like TP’s Engineering and IT students tackling projects with style!",
+        "🍟 Western cuisine? Confirm a hit near Design School’s café — chill and satisfying vibes!"
+    ]
+}
+
+GENERIC_LINES = [
+    "🍜 TP’s campus got flavours from all over the world — just like this dataset!",
+    "🍪 That’s one more tasty insight cooked up by TP’s own Cook-E!"
+]
+
+OPENERS = ["Wah,", "Eh,", "Okay,", "Steady lah —"]
+
+
+def tp_flavour(text, generic_chance=0.2):
+    # Analogy for the first cuisine mentioned, else sometimes a generic TP line
+    lower_text = text.lower()
+    matched_cuisine = next((c for c in TP_ANALOGIES if c in lower_text), None)
+    if matched_cuisine:
+        return random.choice(TP_ANALOGIES[matched_cuisine])
+    if random.random() < generic_chance:
+        return random.choice(GENERIC_LINES)
+    return None
+
+
+def _words(column):
+    # "StudyIngredientCount" / "study_ingredients" -> "study ingredient count" / "study ingredients"
+    return re.sub(r"(?<=[a-z])(?=[A-Z])", " ", str(column)).replace("_", " ").lower()
+
+
+def _plural(words):
+    return words if not words or words.endswith("s") else words + "s"
+
+
+def _unit(column):
+    # "StudyIngredientCount" -> "study ingredients", "usesCount" -> "uses", "n" -> ""
+    words = re.sub(r"^(number of|num|total|count of) ", "", _words(column))
+    if words in ("n", "count", "cnt", "value", "total"):
+        return ""
+    if words.endswith(" count"):
+        return _plural(words[:-len(" count")])
+    return words
+
+
+def _num(value):
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.1f}"
+
+
+def _name(value):
+    text = str(value)
+    return text.title() if text.islower() else text
+
+
+def summarize(df):
+    # 2–4 sentence summary of a label/number result, or None when there's nothing to say
+    if df is None or df.empty:
+        return None
+    numeric = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+    labels = [c for c in df.columns if c not in numeric]
+    if not numeric:
+        return None
+    if not labels:
+        return f"The answer is {_num(df[numeric[0]].iloc[0])} ({_words(numeric[0])})." if len(df) == 1 else None
+
+    label, value = labels[0], numeric[0]
+    data = df[[label, value]].dropna().sort_values(value, ascending=False, kind="stable")
+    if data.empty:
+        return None
+    top_name, top = _name(data[label].iloc[0]), data[value].iloc[0]
+    unit = _unit(value)
+
+    def amount(v):
+        return f"{_num(v)} {unit}".rstrip()
+
+    if len(data) == 1:
+        return f"{random.choice(OPENERS)} {top_name} comes out on top with {amount(top)}."
+
+    sentences = [f"{random.choice(OPENERS)} {top_name} leads with {amount(top)}."]
+
+    second_name, second = _name(data[label].iloc[1]), data[value].iloc[1]
+    gap = top - second
+    if gap == 0:
+        sentences.append(f"It's tied with {second_name} sia — neck and neck!")
+    elif second > 0:
+        sentences.append(f"That's {_num(gap)} more than {second_name} ({gap * 100 / second:.0f}% ahead).")
+    else:
+        sentences.append(f"{second_name} comes next with {_num(second)}.")
+
+    total = data[value].sum()
+    if total > 0 and (data[value] >= 0).all() and len(data) >= 3:
+        share = top * 100 / total
+        sentence = f"{top_name} alone is {share:.0f}% of the {amount(total)} across these {len(data)} {_plural(_words(label))}"
+        if len(data) > 3:
+            sentence += f", and the top 3 make up {data[value].head(3).sum() * 100 / total:.0f}%"
+        sentences.append(sentence + ".")
+
+    flavour = tp_flavour(" ".join(map(str, data[label].head(3))), generic_chance=0.5)
+    if flavour:
+        sentences.append(flavour)
+    return " ".join(sentences)
@@ -0,0 +1,192 @@
+import html
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+# Pyvis network pages (Ingredient Spider-Web, cuisine Flavor Network) built in a small
+# process pool, so the layout + HTML templating never holds the Streamlit script thread or
+# the GIL. When the pool is busy or slow the page gets a light static SVG instead.
+
+log = logging.getLogger(__name__)
+
+NETWORK_WORKERS = 2
+# Builds allowed in flight (running + queued); past this we draw the static version
+MAX_PENDING = NETWORK_WORKERS * 2
+# Seconds a page waits for its build before falling back
+BUILD_TIMEOUT = 8.0
+# Part of the cache key: bump when the page template changes, so old pages on disk aren't served
+NETWORK_HTML_VERSION = 1
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = 0
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class NoBuild(Exception):
+    # Pool saturated, slow or broken: raised so the static fallback never gets cached
+    pass
+
+
+def build_network_html(rows, colors):
+    # rows: [(a, b, c), ...] -> pyvis page with a-b and b-c edges. Runs in a pool process.
+    from pyvis.network import Network
+
+    start = time.perf_counter()
+    net = Network(height="600px", width="100%", bgcolor="#0e1117", font_color="white")
+    net.force_atlas_2based()
+    for a, b, c in rows:
+        for node, color in zip((a, b, c), colors):
+            net.add_node(node, label=node, color=color, shape="dot")
+        net.add_edge(a, b)
+        net.add_edge(b, c)
+    page = net.generate_html()
+    return page, (time.perf_counter() - start) * 1000
+
+
+def static_network_html(rows, colors, height=600):
+    # Fallback: three rings (first column inside), straight-line edges, no JS
+    rings = [list(dict.fromkeys(r[i] for r in rows)) for i in range(3)]
+    size = height - 20
+    center = size / 2
+    pos = {}
+    for depth, nodes in enumerate(rings):
+        radius = size * (0.12 + 0.17 * depth) if len(nodes) > 1 else 0
+        for k, node in enumerate(nodes):
+            angle = 2 * math.pi * k / max(len(nodes), 1)
+            pos.setdefault((depth, node), (center + radius * math.cos(angle), center + radius * math.sin(angle)))
+
+    lines = []
+    for a, b, c in rows:
+        for (d1, n1), (d2, n2) in (((0, a), (1, b)), ((1, b), (2, c))):
+            (x1, y1), (x2, y2) = pos[(d1, n1)], pos[(d2, n2)]
+            lines.append(f'<line x1="{x1:.0f}" y1="{y1:.0f}" x2="{x2:.0f}" y2="{y2:.0f}"/>')
+    dots = []
+    for (depth, node), (x, y) in pos.items():
+        label = html.escape(str(node))
+        dots.append(f'<circle cx="{x:.0f}" cy="{y:.0f}" r="6" fill="{colors[depth]}"><title>{label}</title></circle>')
+        if depth != 1:
+            dots.append(f'<text x="{x + 8:.0f}" y="{y + 4:.0f}">{label}</text>')
+    return (
+        f'<div style="background:#0e1117;text-align:center">'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'style="font:11px sans-serif;fill:white">'
+        f'<g stroke="#4b5563" stroke-width="1">{"".join(lines)}</g>{"".join(dots)}</svg></div>'
+    )
+
+
+def _preload():
+    import pyvis.network  # noqa: F401
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the app process has Streamlit/Neo4j/cache threads running
+            _pool = ProcessPoolExecutor(max_workers=NETWORK_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            # Start the workers and import pyvis now, not on the first visitor's build
+            for _ in range(NETWORK_WORKERS):
+                _pool.submit(_preload)
+        return _pool
+
+
+def start_network_pool():
+    # Called when the dashboard page loads; only the first call per process does anything
+    _get_pool()
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def _record(name, outcome, build_ms=None, wait_ms=None):
+    with _stats_lock:
+        s = _stats.setdefault(name, {"builds": 0, "static": 0, "timeouts": 0, "build_ms": 0.0,
+                                     "max_build_ms": 0.0, "wait_ms": 0.0})
+        if outcome == "built":
+            s["builds"] += 1
+            s["build_ms"] += build_ms
+            s["max_build_ms"] = max(s["max_build_ms"], build_ms)
+            s["wait_ms"] += wait_ms
+        else:
+            s["static"] += 1
+            s["timeouts"] += outcome == "timeout"
+
+
+def _build_in_pool(name, rows, colors):
+    global _pending
+    with _pool_lock:
+        if _pending >= MAX_PENDING:
+            _record(name, "saturated")
+            raise NoBuild(name)
+        _pending += 1
+
+    def done(_):
+        global _pending
+        with _pool_lock:
+            _pending -= 1
+
+    start = time.perf_counter()
+    try:
+        future = _get_pool().submit(build_network_html, rows, colors)
+    except (BrokenProcessPool, RuntimeError):
+        done(None)
+        _reset_pool()
+        log.exception("Network pool unavailable")
+        _record(name, "error")
+        raise NoBuild(name)
+    future.add_done_callback(done)
+
+    try:
+        page, build_ms = future.result(timeout=BUILD_TIMEOUT)
+    except FutureTimeout:
+        # Keeps running in the pool (and counting against MAX_PENDING) until it finishes
+        _record(name, "timeout")
+        raise NoBuild(name)
+    except BrokenProcessPool:
+        _reset_pool()
+        log.exception("Network pool crashed")
+        _record(name, "error")
+        raise NoBuild(name)
+    _record(name, "built", build_ms, (time.perf_counter() - start) * 1000)
+    return page
+
+
+def render_network(name, df, columns, colors):
+    # -> (html, is_static). df rows become column[0]-column[1]-column[2] paths.
+    # Imported here so pool processes (which load this module) don't pull in neo4j/pandas
+    from graph_store import cached
+
+    # Sorted: the networks come from ORDER BY rand() samples, so the same rows arrive in a
+    # new order each run. A result under the LIMIT is then the same page every time and is
+    # cached (per graph version, shared across workers); a true sample just misses
+    rows = sorted({tuple(str(v) for v in row) for row in df[columns].itertuples(index=False)})
+    try:
+        page = cached(("network-html", NETWORK_HTML_VERSION, name, rows, list(colors)),
+                      lambda: _build_in_pool(name, rows, colors))
+    except NoBuild:
+        return static_network_html(rows, colors), True
+    return page, False
+
+
+def network_stats():
+    # name -> builds, static fallbacks, timeouts, avg / max build ms, avg wait ms
+    with _stats_lock:
+        return {
+            name: {
+                "builds": s["builds"], "static": s["static"], "timeouts": s["timeouts"],
+                "avg_build_ms": round(s["build_ms"] / s["builds"], 1) if s["builds"] else None,
+                "max_build_ms": round(s["max_build_ms"], 1),
+                "avg_wait_ms": round(s["wait_ms"] / s["builds"], 1) if s["builds"] else None,
+            }
+            for name, s in _stats.items()
+        }
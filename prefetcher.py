@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import flavor_queries as fq
+from graph_store import run_query_df
+
+# Speculative prefetch: once "Which Cuisines Love Your Ingredients?" comes back, the visitor
+# usually picks one of its top bars next, so those cuisines' panels are loaded into the
+# result cache in the background and the cuisine section renders from cache when picked
+
+log = logging.getLogger(__name__)
+
+# Cuisines prefetched per ingredient pick (the top bars of the chart)
+PREFETCH_TOP_K = 3
+PREFETCH_CONCURRENCY = 2
+# Jobs allowed to wait for a worker; past this new predictions are dropped so Aura serves visitors first
+MAX_QUEUED = 40
+
+# Cuisine section panels in page order; the recommender also gets the picked ingredients.
+# Not q_cui_net: it's a random sample the page fetches uncached
+CUISINE_PANEL_QUERIES = [fq.q_cui_kpi, fq.q_cui_ing, fq.q_dishes]
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+class Prediction:
+    # One visitor's guess: the top cuisines for one ingredient pick
+    def __init__(self, ingredients, cuisines, current=None):
+        self.ingredients = list(ingredients)
+        self.cuisines = cuisines
+        # Cuisine already on screen when we guessed (picking it again isn't a "next" pick)
+        self.current = current
+        self.jobs = {}             # cuisine -> [Future]
+        self.resolved = False
+
+
+class Prefetcher:
+    def __init__(self, top_k=PREFETCH_TOP_K, workers=PREFETCH_CONCURRENCY):
+        self.top_k = top_k
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self.counts = {"predictions": 0, "dropped": 0, "jobs": 0, "cancelled": 0,
+                       "hits": 0, "late": 0, "misses": 0, "wasted_jobs": 0}
+        self.work_seconds = 0.0
+        self.wasted_seconds = 0.0
+
+    def _run(self, cypher, params):
+        with self._lock:
+            self._queued -= 1
+        start = time.perf_counter()
+        try:
+            run_query_df(cypher, params)
+        except Exception:
+            log.exception("Prefetch query failed")
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.work_seconds += seconds
+        return seconds
+
+    def predict(self, ingredients, cuisines, current=None):
+        # cuisines: q_ing_cui's Cuisine column, best first -> Prediction (None if we're too busy)
+        picks = [c for c in cuisines if c != current][:self.top_k]
+        prediction = Prediction(ingredients, picks, current)
+        jobs_per_cuisine = len(CUISINE_PANEL_QUERIES) + 1
+        with self._lock:
+            if self._queued + len(picks) * jobs_per_cuisine > MAX_QUEUED:
+                self.counts["dropped"] += 1
+                return None
+            self._queued += len(picks) * jobs_per_cuisine
+            self.counts["predictions"] += 1
+            self.counts["jobs"] += len(picks) * jobs_per_cuisine
+
+        for cuisine in picks:
+            jobs = [(cypher, {"cuisine": cuisine}) for cypher in CUISINE_PANEL_QUERIES]
+            # Same params dict shape as app.py's q_reco call, so the cache key matches
+            jobs.append((fq.q_reco, {"cuisine": cuisine, "ingredients": prediction.ingredients}))
+            prediction.jobs[cuisine] = [self._pool.submit(self._run, cypher, params) for cypher, params in jobs]
+        return prediction
+
+    def resolve(self, prediction, cuisine=None):
+        # cuisine: what the visitor picked next (None = prediction replaced before any pick).
+        # -> "hits" (all panels ready), "late" (still loading), "misses" (not predicted) or None
+        if prediction is None or prediction.resolved:
+            return None
+        prediction.resolved = True
+
+        outcome = None
+        if cuisine is not None:
+            futures = prediction.jobs.get(cuisine)
+            if futures is None:
+                outcome = "misses"
+            else:
+                outcome = "hits" if all(f.done() for f in futures) else "late"
+            with self._lock:
+                self.counts[outcome] += 1
+
+        # Everything else was a wrong guess: drop what hasn't started, count what ran as waste
+        for other, futures in prediction.jobs.items():
+            if other == cuisine:
+                continue
+            for future in futures:
+                if future.cancel():
+                    with self._lock:
+                        self._queued -= 1
+                        self.counts["cancelled"] += 1
+                else:
+                    future.add_done_callback(self._count_wasted)
+        return outcome
+
+    def _count_wasted(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            self.counts["wasted_jobs"] += 1
+            self.wasted_seconds += future.result()
+
+    def stats(self):
+        with self._lock:
+            picks = self.counts["hits"] + self.counts["late"] + self.counts["misses"]
+            return {
+                **self.counts,
+                "queued": self._queued,
+                "hit_rate": round(self.counts["hits"] / picks, 2) if picks else None,
+                "work_seconds": round(self.work_seconds, 1),
+                "wasted_seconds": round(self.wasted_seconds, 1),
+            }
+
+
+def get_prefetcher():
+    # One worker pool per process, shared by every session
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher()
+    return _prefetcher
+
+
+def prefetch_stats():
+    # None until some session has used the prefetcher (the sidebar shouldn't start one)
+    return _prefetcher.stats() if _prefetcher is not None else None
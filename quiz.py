@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+# Native "What Cuisine Are You?" quiz: scored locally, every response appended to a
+# JSONL log, and running totals kept up to date by reading only the log's new bytes
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QUIZ_PATH = os.path.join(BASE_DIR, "data", "quiz.json")
+LOG_PATH = os.environ.get("QUIZ_LOG_PATH", os.path.join(BASE_DIR, "artifacts", "quiz_responses.jsonl"))
+
+
+class Quiz:
+    def __init__(self, data):
+        self.questions = data["questions"]
+        self.results = data["results"]
+        # Ties go to the cuisine listed first in the results
+        self.cuisines = list(self.results)
+
+    def score(self, answers):
+        # answers: {question id: option index} -> (cuisine, {cuisine: points})
+        points = Counter({c: 0 for c in self.cuisines})
+        for q in self.questions:
+            choice = answers.get(q["id"])
+            if choice is not None:
+                points.update(q["options"][choice]["scores"])
+        best = max(self.cuisines, key=lambda c: points[c])
+        return best, dict(points)
+
+
+@lru_cache(maxsize=None)
+def load_quiz(path=QUIZ_PATH):
+    with open(path, encoding="utf-8") as f:
+        return Quiz(json.load(f))
+
+
+class QuizLog:
+    # Append-only response log + incrementally maintained aggregates
+    def __init__(self, path=LOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.cuisines = Counter()
+        self.answers = {}          # question id -> Counter(option index)
+        self.responses = 0
+        self._offset = 0           # bytes of the log already folded into the counters
+
+    def append(self, answers, cuisine):
+        record = {"ts": round(time.time(), 3), "answers": answers, "cuisine": cuisine}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            # One write per line in append mode, so lines from other workers never interleave
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        self.refresh()
+
+    def _fold(self, record):
+        self.responses += 1
+        self.cuisines[record["cuisine"]] += 1
+        for qid, choice in record["answers"].items():
+            self.answers.setdefault(qid, Counter())[choice] += 1
+
+    def refresh(self):
+        # Fold in whatever was appended since last time (by us or another process)
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return self
+            if size < self._offset:
+                # Log was rotated/truncated: start over
+                self._reset()
+            if size == self._offset:
+                return self
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read(size - self._offset)
+            # Leave a half-written last line for the next refresh
+            end = chunk.rfind(b"\n") + 1
+            for raw in chunk[:end].splitlines():
+                try:
+                    self._fold(json.loads(raw))
+                except (ValueError, KeyError, TypeError):
+                    continue
+            self._offset += end
+        return self
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "cuisines": dict(self.cuisines),
+                "answers": {qid: dict(c) for qid, c in self.answers.items()},
+            }
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_quiz_log():
+    # One log per process; Streamlit re-runs the page on every interaction
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = QuizLog()
+    return _log.refresh()
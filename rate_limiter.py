@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import deque
+
+# Process-wide admission control for OpenAI: token buckets for RPM/TPM plus a bounded FIFO queue
+
+
+class QueueFull(Exception):
+    def __init__(self, wait):
+        super().__init__(f"OpenAI queue is full (estimated wait {wait:.0f}s)")
+        self.wait = wait
+
+
+class TokenBucket:
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.level = float(self.capacity)
+        self.stamp = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def time_until(self, amount, now):
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def take(self, amount):
+        # May go negative: a debt that later callers wait out
+        self.level -= amount
+
+
+class RateLimiter:
+    def __init__(self, rpm, tpm, max_queue=20):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_queue = max_queue
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self.admitted = 0
+        self.rejected = 0
+
+    def _head_wait(self, tokens, now):
+        return max(self.requests.time_until(1, now), self.tokens.time_until(tokens, now))
+
+    def estimate_wait(self, tokens):
+        # Wait for the bucket to allow this call, plus one request slot per caller already queued
+        with self._cond:
+            now = time.monotonic()
+            queued = len(self._queue)
+            return self._head_wait(tokens, now) + queued / self.requests.rate
+
+    def acquire(self, tokens, timeout=None):
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self.rejected += 1
+                raise QueueFull(self._head_wait(tokens, time.monotonic()) + len(self._queue) / self.requests.rate)
+
+            ticket = object()
+            self._queue.append(ticket)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._head_wait(tokens, now) if self._queue[0] is ticket else None
+                    if wait == 0.0:
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        self.admitted += 1
+                        return
+                    if deadline is not None and now >= deadline:
+                        self.rejected += 1
+                        raise QueueFull(wait or 0.0)
+                    # Not at the head yet: sleep until notified (or re-check periodically)
+                    pause = wait if wait is not None else 1.0
+                    if deadline is not None:
+                        pause = min(pause, deadline - now)
+                    self._cond.wait(pause)
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+
+    def settle(self, estimated, actual):
+        # Correct the token bucket once the real usage is known
+        with self._cond:
+            self.tokens.take(actual - estimated)
+
+    def stats(self):
+        with self._cond:
+            return {"queued": len(self._queue), "admitted": self.admitted, "rejected": self.rejected}
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# In-process result cache shared by every Streamlit session in this process
+
+MISS = object()
+
+
+def make_key(*parts):
+    # Stable key for (cypher, params, ...) — whitespace in the Cypher text doesn't matter
+    normalized = [" ".join(p.split()) if isinstance(p, str) else p for p in parts]
+    raw = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries=512, ttl=1800):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return MISS
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
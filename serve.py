@@ -0,0 +1,157 @@
+"""Run several app workers behind nginx with sticky sessions and a shared cache.
+
+    python serve.py --workers 4                    # workers on 8601-8604, nginx on :8501
+    python serve.py --workers 4 --no-nginx         # workers only; point an existing nginx at
+                                                   # the config written to artifacts/nginx/
+
+Every worker is a normal `streamlit run app.py` with FLAVORS_CACHE_PATH pointing at one
+on-disk SQLite cache, so query results, derived indexes and Cook-E answers built by one worker are
+reused by the rest. FLAVORS_WORKERS tells each worker how many there are, so its OpenAI
+limiter only takes its share of the key's RPM/TPM. Keys carry the graph version, and the first worker to notice a bump
+publishes it to the others. Streamlit keeps a visitor's session in the worker that holds
+their websocket, so nginx pins each browser to one worker. It also serves the pre-rendered
+dashboard snapshots (artifacts/snapshots) directly. Crashed workers are restarted.
+"""
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACT_DIR = os.path.join(BASE_DIR, "artifacts")
+NGINX_DIR = os.path.join(ARTIFACT_DIR, "nginx")
+SHARED_CACHE = os.path.join(ARTIFACT_DIR, "query_cache.sqlite")
+
+NGINX_CONF = """\
+worker_processes auto;
+pid {prefix}/nginx.pid;
+error_log {prefix}/error.log warn;
+
+events {{ worker_connections 1024; }}
+
+http {{
+    access_log {prefix}/access.log;
+    client_body_temp_path {prefix}/tmp/body;
+    proxy_temp_path {prefix}/tmp/proxy;
+    fastcgi_temp_path {prefix}/tmp/fastcgi;
+    uwsgi_temp_path {prefix}/tmp/uwsgi;
+    scgi_temp_path {prefix}/tmp/scgi;
+
+    types {{ text/html html; application/json json; }}
+    default_type application/octet-stream;
+
+    map $http_upgrade $connection_upgrade {{ default upgrade; '' close; }}
+
+    upstream flavors {{
+        # Sticky: a browser keeps landing on the worker that holds its Streamlit session.
+        # Address + user agent rather than plain ip_hash, so a classroom behind one NAT
+        # still spreads across workers.
+        hash $binary_remote_addr$http_user_agent consistent;
+{servers}
+    }}
+
+    server {{
+        listen {port};
+
+        # Pre-rendered dashboard panels, straight from disk
+        location /snapshots/ {{
+            alias {snapshots}/;
+            expires 5m;
+        }}
+
+        location / {{
+            proxy_pass http://flavors;
+            proxy_http_version 1.1;
+            proxy_set_header Upgrade $http_upgrade;
+            proxy_set_header Connection $connection_upgrade;
+            proxy_set_header Host $host;
+            proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+            proxy_read_timeout 1d;
+        }}
+    }}
+}}
+"""
+
+
+def write_nginx_conf(ports, listen):
+    for sub in ("body", "proxy", "fastcgi", "uwsgi", "scgi"):
+        os.makedirs(os.path.join(NGINX_DIR, "tmp", sub), exist_ok=True)
+    conf = NGINX_CONF.format(
+        prefix=NGINX_DIR, port=listen,
+        servers="\n".join(f"        server 127.0.0.1:{p} max_fails=3 fail_timeout=10s;" for p in ports),
+        snapshots=os.path.join(ARTIFACT_DIR, "snapshots"),
+    )
+    path = os.path.join(NGINX_DIR, "nginx.conf")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(conf)
+    return path
+
+
+def start_worker(port, cache_path, workers):
+    env = {**os.environ, "FLAVORS_CACHE_PATH": cache_path, "FLAVORS_WORKERS": str(workers)}
+    return subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(BASE_DIR, "app.py"),
+         "--server.port", str(port), "--server.address", "127.0.0.1", "--server.headless", "true"],
+        cwd=BASE_DIR, env=env,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--port", type=int, default=8501, help="where nginx listens")
+    parser.add_argument("--base-port", type=int, default=8601, help="first worker port")
+    parser.add_argument("--cache", default=SHARED_CACHE, help="shared SQLite cache file")
+    parser.add_argument("--no-nginx", action="store_true", help="only start the workers")
+    args = parser.parse_args()
+
+    ports = [args.base_port + i for i in range(args.workers)]
+    conf = write_nginx_conf(ports, args.port)
+    print(f"nginx config -> {conf}")
+
+    nginx = None
+    if not args.no_nginx:
+        if shutil.which("nginx") is None:
+            sys.exit("nginx not found: install it or rerun with --no-nginx")
+        nginx = subprocess.Popen(["nginx", "-p", NGINX_DIR, "-c", conf, "-g", "daemon off;"])
+
+    workers = {port: start_worker(port, args.cache, args.workers) for port in ports}
+    print(f"{len(workers)} workers on {ports[0]}-{ports[-1]}, shared cache {args.cache}"
+          + ("" if nginx is None else f", serving http://localhost:{args.port}"))
+
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while not stopping:
+        time.sleep(1)
+        for port in ports:
+            code = workers[port].poll()
+            if code is not None and not stopping:
+                print(f"worker :{port} exited ({code}), restarting", file=sys.stderr)
+                workers[port] = start_worker(port, args.cache, args.workers)
+        if nginx is not None and nginx.poll() is not None:
+            print("nginx exited, shutting down", file=sys.stderr)
+            break
+
+    for proc in [*workers.values(), nginx]:
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+    for proc in [*workers.values(), nginx]:
+        if proc is not None:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+if __name__ == "__main__":
+    main()
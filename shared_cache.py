@@ -0,0 +1,209 @@
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+
+import pandas as pd
+
+from result_cache import MISS
+
+log = logging.getLogger(__name__)
+
+# On-disk second tier behind each process's in-process ResultCache: query results, derived
+# indexes and Cook-E answers survive restarts, and with serve.py every worker on the host
+# shares the same file. Query keys already include the graph version; the file also records
+# the newest version any process has seen, so a bump noticed by one worker switches all of
+# them over at once and drops older entries.
+
+# Bump when the entries table changes; older files just lose their cached entries.
+# Derived objects (brand index, network pages) carry their own version in their cache key.
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    value    BLOB NOT NULL,
+    size     INTEGER NOT NULL,
+    expires  REAL NOT NULL,
+    accessed REAL NOT NULL,
+    version  INTEGER
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL);
+"""
+
+# Payloads above this many bytes are zlib-compressed
+COMPRESS_OVER = 512
+# Reads only bump `accessed` (for LRU eviction) when it's older than this, to keep reads read-only
+TOUCH_EVERY = 60
+# Re-total the file's size after this many writes
+SIZE_CHECK_EVERY = 50
+
+
+def encode(value):
+    # DataFrames go in as plain columns (numeric ones as numpy arrays): a fraction of a pickled frame
+    if isinstance(value, pd.DataFrame) and value.columns.is_unique:
+        value = ("df", list(value.columns),
+                 [col.to_numpy() if col.dtype.kind in "biufcmM" else col.tolist() for _, col in value.items()])
+    raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return b"z" + zlib.compress(raw, 6) if len(raw) > COMPRESS_OVER else b"p" + raw
+
+
+def decode(blob):
+    raw = zlib.decompress(blob[1:]) if blob[:1] == b"z" else blob[1:]
+    value = pickle.loads(raw)
+    if isinstance(value, tuple) and len(value) == 3 and value[0] == "df":
+        _, columns, data = value
+        return pd.DataFrame(dict(zip(columns, data)), columns=columns)
+    return value
+
+
+class SharedCache:
+    def __init__(self, path, ttl=1800, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        # One connection per thread; WAL lets readers carry on while another worker writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._conn()
+        try:
+            row = conn.execute("SELECT value, expires, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            # A locked or broken cache file is just a miss
+            log.warning("Shared cache read failed", exc_info=True)
+            row = None
+        now = time.time()
+        value = self._decode(key, row[0]) if row is not None and row[1] >= now else MISS
+        with self._lock:
+            if value is MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is not MISS and now - row[2] > TOUCH_EVERY:
+            try:
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            except sqlite3.Error:
+                pass
+        return value
+
+    def _decode(self, key, blob):
+        # A truncated blob, or an object pickled by older code, is a miss: drop it so it's rebuilt
+        try:
+            return decode(blob)
+        except Exception:
+            log.warning("Dropping unreadable shared cache entry %s", key, exc_info=True)
+            try:
+                self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+            except sqlite3.Error:
+                pass
+            return MISS
+
+    def set(self, key, value, ttl=None, version=None):
+        blob = encode(value)
+        now = time.time()
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed, version) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + (self.ttl if ttl is None else ttl), now, version),
+            )
+        except sqlite3.Error:
+            log.warning("Shared cache write failed", exc_info=True)
+            return
+        with self._lock:
+            self._writes += 1
+            check = self._writes % SIZE_CHECK_EVERY == 0
+        if check:
+            self.enforce_size()
+
+    def enforce_size(self):
+        # Drop expired entries, then least recently used ones until we're back under 90% of the cap
+        conn = self._conn()
+        conn.execute("DELETE FROM entries WHERE expires < ?", (time.time(),))
+        total = conn.execute("SELECT coalesce(sum(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        target, dropped = total - int(self.max_bytes * 0.9), 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if target <= 0:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            target -= size
+            dropped += 1
+        with self._lock:
+            self.evicted += dropped
+        return dropped
+
+    def recent(self, version, limit):
+        # Live entries built on `version`, most recently used first -> [(key, value, seconds left)]
+        now = time.time()
+        rows = self._conn().execute(
+            "SELECT key, value, expires FROM entries WHERE expires > ? AND version = ? "
+            "ORDER BY accessed DESC LIMIT ?",
+            (now, version, limit),
+        ).fetchall()
+        entries = [(key, self._decode(key, blob), expires - now) for key, blob, expires in rows]
+        return [entry for entry in entries if entry[1] is not MISS]
+
+    def latest_version(self):
+        row = self._conn().execute("SELECT value FROM meta WHERE name = 'graph_version'").fetchone()
+        return row[0] if row else None
+
+    def publish_version(self, version):
+        # Only ever moves forward; entries built on older versions are dropped the first time
+        conn = self._conn()
+        changed = conn.execute(
+            "INSERT INTO meta (name, value) VALUES ('graph_version', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = excluded.value WHERE excluded.value > meta.value",
+            (version,),
+        ).rowcount
+        if changed:
+            conn.execute("DELETE FROM entries WHERE (version IS NOT NULL AND version < ?) OR expires < ?",
+                         (version, time.time()))
+
+    def try_lease(self, name, seconds):
+        # True if this process holds `name` for the next `seconds` (e.g. only one worker runs the cache warmer)
+        now = time.time()
+        changed = self._conn().execute(
+            "INSERT INTO leases (name, owner, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+            "WHERE leases.expires < ? OR leases.owner = excluded.owner",
+            (name, self.owner, now + seconds, now),
+        ).rowcount
+        return changed == 1
+
+    def clear(self):
+        self._conn().execute("DELETE FROM entries")
+
+    def stats(self):
+        entries, size = self._conn().execute("SELECT count(*), coalesce(sum(size), 0) FROM entries").fetchone()
+        with self._lock:
+            return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses,
+                    "evicted": self.evicted}
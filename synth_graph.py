@@ -0,0 +1,183 @@
+"""Generate a synthetic Region/Cuisine/Dish/Ingredient/Brand graph for scale testing.
+
+    python synth_graph.py --scale 10                       # ~10x the dishes, straight into NEO4J_*
+    python synth_graph.py --dishes 500000 --out synth.jsonl   # ingest.py input instead
+    python synth_graph.py --scale 100 --alpha 1.1 --study-ratio 0.1 --seed 7
+
+Ingredient, cuisine and brand popularity are power-law (Zipf, exponent --alpha), so a
+handful of ingredients end up in most dishes like garlic and onion do in the real data.
+The vocabulary grows sub-linearly with the dish count (Heaps' law): 10x the dishes is
+~3x the ingredients. Rows go through ingest.load_rows, the same batched UNWIND/MERGE path
+as real datasets. Point NEO4J_URI at a scratch database, not the live one.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from graph_schema import apply_schema, bump_graph_version
+from graph_store import get_driver, publish_graph_version
+from ingest import BATCH_SIZE, clean_row, load_rows
+
+# Roughly the size of the real dataset at --scale 1
+BASE = {"dishes": 2000, "cuisines": 30, "ingredients": 800, "brands": 120}
+
+DEFAULTS = {"alpha": 1.0, "study_ratio": 0.15, "per_dish": 9, "brand_ratio": 0.3, "seed": 42}
+
+REGIONS = ["asia", "europe", "africa", "north america", "south america"]
+
+# Real names first (region by index), numbered ones once they run out
+CUISINES = [
+    ("chinese", 0), ("italian", 1), ("indian", 0), ("mexican", 3), ("japanese", 0), ("french", 1),
+    ("thai", 0), ("spanish", 1), ("greek", 1), ("korean", 0), ("vietnamese", 0), ("american", 3),
+    ("moroccan", 2), ("brazilian", 4), ("peruvian", 4), ("ethiopian", 2), ("turkish", 1),
+    ("malaysian", 0), ("indonesian", 0), ("german", 1), ("british", 1), ("nigerian", 2),
+    ("argentinian", 4), ("filipino", 0), ("cajun", 3), ("irish", 1), ("south african", 2),
+    ("colombian", 4), ("canadian", 3), ("portuguese", 1),
+]
+
+INGREDIENTS = [
+    "garlic", "onion", "salt", "olive oil", "egg", "butter", "black pepper", "ginger", "soy sauce",
+    "tomato", "sugar", "chicken", "rice", "flour", "lemon", "milk", "chili", "carrot", "coriander",
+    "cumin", "potato", "spring onion", "chicken broth", "honey", "spinach", "salmon", "yogurt",
+    "beef", "basil", "lime", "mushroom", "cheese", "bell pepper", "sesame oil", "coconut milk",
+    "broccoli", "avocado", "turmeric", "walnut", "oats", "pork", "tofu", "shrimp", "paprika",
+    "blueberry", "almond", "cinnamon", "dark chocolate", "green tea", "chickpea", "lentil",
+    "quinoa", "kale", "sweet potato", "pumpkin seed", "sardine", "banana", "orange", "apple",
+]
+
+# Foods the real data tags as study-boosting; kept true so the names read sensibly
+STUDY_FOODS = {"egg", "salmon", "spinach", "yogurt", "broccoli", "avocado", "turmeric", "walnut", "oats",
+               "blueberry", "almond", "dark chocolate", "green tea", "kale", "pumpkin seed", "sardine"}
+
+# Dishes generated per chunk (keeps memory flat at 100x)
+CHUNK_DISHES = 20_000
+
+
+def make_config(scale=1.0, **overrides):
+    cfg = {
+        "dishes": int(BASE["dishes"] * scale),
+        "cuisines": max(len(REGIONS), int(BASE["cuisines"] * scale ** 0.25)),
+        "ingredients": int(BASE["ingredients"] * scale ** 0.5),
+        "brands": int(BASE["brands"] * scale ** 0.5),
+        **DEFAULTS,
+    }
+    cfg.update({k: v for k, v in overrides.items() if v is not None})
+    return cfg
+
+
+def cuisine_names(n):
+    names = [(name, REGIONS[r]) for name, r in CUISINES[:n]]
+    names += [(f"fusion {i:03d}", REGIONS[i % len(REGIONS)]) for i in range(len(names), n)]
+    return names
+
+
+def ingredient_names(n):
+    return INGREDIENTS[:n] + [f"ingredient {i:05d}" for i in range(len(INGREDIENTS), n)]
+
+
+def zipf_weights(n, alpha):
+    w = 1.0 / np.arange(1, n + 1) ** alpha
+    return w / w.sum()
+
+
+def generate_rows(cfg):
+    # -> clean_row() dicts, one per dish/ingredient pair, most popular names first in each list
+    rng = np.random.default_rng(cfg["seed"])
+    cuisines = cuisine_names(cfg["cuisines"])
+    ingredients = ingredient_names(cfg["ingredients"])
+    n_ing = len(ingredients)
+
+    study = rng.random(n_ing) < cfg["study_ratio"]
+    for i, name in enumerate(ingredients):
+        if name in STUDY_FOODS:
+            study[i] = True
+    brand_of = np.where(rng.random(n_ing) < cfg["brand_ratio"],
+                        rng.choice(cfg["brands"], n_ing, p=zipf_weights(cfg["brands"], cfg["alpha"])), -1)
+
+    cuisine_p = zipf_weights(len(cuisines), cfg["alpha"] * 0.6)
+    ing_p = zipf_weights(n_ing, cfg["alpha"])
+
+    for start in range(0, cfg["dishes"], CHUNK_DISHES):
+        count = min(CHUNK_DISHES, cfg["dishes"] - start)
+        dish_cuisine = rng.choice(len(cuisines), count, p=cuisine_p)
+        sizes = 1 + rng.poisson(cfg["per_dish"] - 1, count)
+        dish_of = np.repeat(np.arange(count), sizes)
+        picks = rng.choice(n_ing, len(dish_of), p=ing_p)
+        # One row per distinct (dish, ingredient): drop repeat draws within a dish
+        pairs = np.unique(dish_of.astype(np.int64) * n_ing + picks)
+        for dish, ing in zip((pairs // n_ing).tolist(), (pairs % n_ing).tolist()):
+            cuisine, region = cuisines[dish_cuisine[dish]]
+            brand = brand_of[ing]
+            yield clean_row({
+                "region": region, "cuisine": cuisine,
+                "dish": f"{cuisine.title()} Dish {start + dish:07d}",
+                "ingredient": ingredients[ing], "study_food": bool(study[ing]),
+                "brand": f"Brand {brand:04d}" if brand >= 0 else None,
+            })
+
+
+def write_jsonl(rows, path):
+    # One record per dish with an "ingredients" list, the compact form ingest.py reads
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        current, record = None, None
+        for row in rows:
+            if row["dish"] != current:
+                if record:
+                    f.write(json.dumps(record) + "\n")
+                    written += 1
+                current = row["dish"]
+                record = {k: row[k] for k in ("region", "cuisine", "dish")} | {"ingredients": []}
+            record["ingredients"].append({"name": row["ingredient"], "study_food": row["study_food"],
+                                          "brand": row["brand"]})
+        if record:
+            f.write(json.dumps(record) + "\n")
+            written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of the real dataset's dish count")
+    parser.add_argument("--dishes", type=int)
+    parser.add_argument("--cuisines", type=int)
+    parser.add_argument("--ingredients", type=int)
+    parser.add_argument("--brands", type=int)
+    parser.add_argument("--alpha", type=float, help="power-law exponent for popularity (default 1.0)")
+    parser.add_argument("--study-ratio", type=float, help="share of ingredients that are study foods")
+    parser.add_argument("--per-dish", type=float, help="mean ingredients per dish")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--out", help="write .jsonl for ingest.py instead of loading")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per write transaction")
+    parser.add_argument("--skip-schema", action="store_true", help="don't create constraints/indexes first")
+    args = parser.parse_args(argv)
+
+    cfg = make_config(args.scale, dishes=args.dishes, cuisines=args.cuisines, ingredients=args.ingredients,
+                      brands=args.brands, alpha=args.alpha, study_ratio=args.study_ratio,
+                      per_dish=args.per_dish, seed=args.seed)
+    print("Config: " + ", ".join(f"{k}={v}" for k, v in cfg.items()), file=sys.stderr)
+
+    start = time.perf_counter()
+    if args.out:
+        written = write_jsonl(generate_rows(cfg), args.out)
+        print(f"Wrote {written:,} dishes -> {args.out} in {time.perf_counter() - start:.1f}s")
+        return
+
+    driver = get_driver()
+    if not args.skip_schema:
+        apply_schema(driver)
+    stats = load_rows(
+        driver, generate_rows(cfg), batch_size=args.batch_size,
+        progress=lambda s: print(f"  {s['rows']:,} rows in {s['batches']} batches "
+                                 f"({s['rows'] / (time.perf_counter() - start):,.0f} rows/s)", file=sys.stderr),
+    )
+    version = bump_graph_version(driver)
+    publish_graph_version(version)
+    print(f"Loaded {stats['rows']:,} rows in {time.perf_counter() - start:.1f}s -> graph version {version}")
+
+
+if __name__ == "__main__":
+    main()
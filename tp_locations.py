@@ -0,0 +1,36 @@
+import json
+import os
+import re
+from functools import lru_cache
+
+# TP canteen stalls per cuisine, shared by the dashboard and Cook-E (edit data/tp_locations.json)
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tp_locations.json")
+
+
+class TPLocationIndex:
+    def __init__(self, data):
+        self.locations = {cuisine: entry["locations"] for cuisine, entry in data.items()}
+        self.keyword_cuisine = {
+            kw.lower(): cuisine for cuisine, entry in data.items() for kw in entry["keywords"]
+        }
+        # One combined pattern, longest keyword first. The lookahead lets matches overlap,
+        # so "chicken rice bowl" finds both "chicken rice" and "rice bowl" in a single pass.
+        alternation = "|".join(re.escape(kw) for kw in sorted(self.keyword_cuisine, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternation}))") if alternation else None
+
+    def find_cuisines(self, text):
+        # Cuisines mentioned in the text, in order of first mention
+        if self._pattern is None:
+            return []
+        hits = (self.keyword_cuisine[m.group(1)] for m in self._pattern.finditer(text.lower()))
+        return list(dict.fromkeys(hits))
+
+    def locations_for(self, cuisine):
+        return self.locations.get(cuisine.lower(), [])
+
+
+@lru_cache(maxsize=None)
+def load_index(path=DATA_PATH):
+    with open(path, encoding="utf-8") as f:
+        return TPLocationIndex(json.load(f))